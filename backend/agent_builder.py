@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.agent_builder as baagbu
+
+Interview question generation. One parsed resume plus a job description fan
+out into one LLM prompt per question topic; prompts run concurrently under a
+semaphore, identical in-flight prompts are coalesced into one call, and
+responses are cached under a hash of (provider, resume, JD, prompt).
+
+Providers implement `LLMProvider.complete`. FakeProvider answers
+deterministically from the prompt hash after a configurable delay, for tests
+and offline benchmarks.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+import weakref
+import urllib.request
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# (topic, focus) pairs; the focus is filled from the resume and JD
+QUESTION_TOPICS = (
+    ('skills', "technical depth in {skills}"),
+    ('experience', "their recent roles ({roles})"),
+    ('projects', "their projects ({projects})"),
+    ('role_fit', "the requirements of the job description"),
+    ('behavioral', "teamwork, ownership and handling setbacks"),
+)
+QUESTIONS_PER_TOPIC = 3
+PROMPT_TEMPLATE = """You are preparing an interview. Write {count} interview questions, one per line, numbered.
+Focus: {focus}
+
+Job description:
+{job_description}
+
+Candidate: {name}
+Skills: {skills}
+Experience: {roles}
+Education: {education}
+{instructions}"""
+QUESTION_LINE = re.compile(r'^\s*(?:\d+[.)]|[-*•])\s*(.+?)\s*$')
+
+
+@dataclass
+class Question:
+    topic: str
+    text: str
+
+
+# --- Providers -------------------------------------------------------------
+
+class LLMProvider:
+    """Backend for prompt completion; `name` must identify model and settings for caching"""
+
+    name: str = 'provider'
+
+    async def complete(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class FakeProvider(LLMProvider):
+    """Deterministic local backend: same prompt, same answer, after `latency` seconds"""
+
+    TEMPLATES = (
+        "Walk me through how you have used {focus} in production.",
+        "What trade-offs did you weigh when working on {focus}?",
+        "Describe a problem involving {focus} that you could not solve at first.",
+        "How would you explain {focus} to a new team member?",
+        "What would you change about your approach to {focus} today?",
+        "How do you measure success when working on {focus}?",
+    )
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.name = 'fake'
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        focus_match = re.search(r'^Focus: (.+)$', prompt, re.MULTILINE)
+        focus = focus_match.group(1).rstrip('.') if focus_match else 'this role'
+        count_match = re.search(r'Write (\d+) interview questions', prompt)
+        count = int(count_match.group(1)) if count_match else QUESTIONS_PER_TOPIC
+        return '\n'.join(
+            f"{number}. {self.TEMPLATES[digest[number] % len(self.TEMPLATES)].format(focus=focus)}"
+            for number in range(1, count + 1)
+        )
+
+
+class OpenAIChatProvider(LLMProvider):
+    """OpenAI-compatible chat completions over HTTPS; blocking I/O runs in a thread"""
+
+    def __init__(self, api_key: str, model: str = 'gpt-4o-mini', temperature: float = 0.0,
+                 base_url: str = 'https://api.openai.com/v1', timeout: float = 60.0):
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.name = f"openai:{model}:{temperature}"
+
+    def _post(self, prompt: str) -> str:
+        body = json.dumps({
+            'model': self.model, 'temperature': self.temperature,
+            'messages': [{'role': 'user', 'content': prompt}],
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions", data=body, method='POST',
+            headers={'Authorization': f"Bearer {self.api_key}", 'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())['choices'][0]['message']['content']
+
+    async def complete(self, prompt: str) -> str:
+        return await asyncio.to_thread(self._post, prompt)
+
+
+def default_provider() -> LLMProvider:
+    """OpenAI when OPENAI_API_KEY is set, otherwise the local fake backend"""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if api_key:
+        return OpenAIChatProvider(api_key, model=os.getenv('OPENAI_MODEL', 'gpt-4o-mini'))
+    logger.warning("OPENAI_API_KEY is not set; using the local fake question provider")
+    return FakeProvider(latency=0)
+
+
+# --- Cache -----------------------------------------------------------------
+
+def hash_resume(resume_data: barepa.ResumeData) -> str:
+    """Content hash of a parse result, ignoring per-page timing stats and duplicate links"""
+    data = asdict(resume_data)
+    for key in ('page_stats', 'duplicate_of', 'duplicate_similarity'):
+        data.pop(key, None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def cache_key(provider_name: str, resume_hash: str, job_description: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (provider_name, resume_hash, job_description, prompt):
+        digest.update(part.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """LRU of prompt responses, optionally backed by a SQLite file"""
+
+    def __init__(self, db_path: Optional[str] = None, max_items: int = 4096):
+        self.max_items = max_items
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL)'
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if self._db is None:
+                return None
+            row = self._db.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, key: str, response: str):
+        with self._lock:
+            self._remember(key, response)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)',
+                    (key, response, time.time()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, response: str):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# --- Pipeline --------------------------------------------------------------
+
+def build_prompts(resume_data: barepa.ResumeData, job_description: str,
+                  instructions: str = '') -> List[Tuple[str, str]]:
+    """(topic, prompt) for every topic the resume has material for"""
+    skills = ', '.join(resume_data.skills[:15]) or 'not listed'
+    roles = '; '.join(
+        ' at '.join(part for part in (entry.get('title'), entry.get('company')) if part)
+        for entry in resume_data.experience[:3]
+    ) or 'not listed'
+    projects = '; '.join(project.get('name', '') for project in resume_data.projects[:3])
+    education = '; '.join(entry.get('degree', '') for entry in resume_data.education[:2]) or 'not listed'
+    fields = {'skills': skills, 'roles': roles, 'projects': projects}
+
+    prompts = []
+    for topic, focus in QUESTION_TOPICS:
+        if topic in fields and fields[topic] in ('', 'not listed'):
+            continue
+        prompts.append((topic, PROMPT_TEMPLATE.format(
+            count=QUESTIONS_PER_TOPIC, focus=focus.format(**fields), job_description=job_description.strip(),
+            name=resume_data.name or 'unknown', skills=skills, roles=roles, education=education,
+            instructions=f"Additional instructions: {instructions.strip()}" if instructions.strip() else '',
+        )))
+    return prompts
+
+
+def parse_questions(topic: str, response: str) -> List[Question]:
+    """One Question per numbered or bulleted line; unnumbered lines count if nothing is numbered"""
+    lines = [line.strip() for line in response.splitlines() if line.strip()]
+    numbered = [match.group(1) for match in map(QUESTION_LINE.match, lines) if match]
+    return [Question(topic=topic, text=text) for text in (numbered or lines)]
+
+
+class _LoopState:
+    """Concurrency limit and in-flight calls of one event loop"""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight: Dict[str, asyncio.Future] = {}
+
+
+class QuestionGenerator:
+    """
+    Async question pipeline over a provider. At most `max_concurrency`
+    provider calls run at once per event loop; concurrent requests for the
+    same cache key on that loop share one call. `run` gives blocking callers
+    in any thread one shared loop, so a generator can serve many sessions.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: Optional[ResponseCache] = None, max_concurrency: int = 8):
+        self.provider = provider
+        self.cache = cache if cache is not None else ResponseCache()
+        self.max_concurrency = max_concurrency
+        # Semaphores and futures belong to one event loop, so each loop gets its own
+        self._loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'provider_calls': 0, 'errors': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loop_states.get(loop)
+            if state is None:
+                state = self._loop_states[loop] = _LoopState(self.max_concurrency)
+            return state
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine to completion on the generator's own event loop, from
+        any thread. Blocking callers should use this rather than asyncio.run,
+        so they share one concurrency limit and coalesce with each other.
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='question-generator', daemon=True)
+                self._thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def close(self):
+        """Stop the loop started by `run`, if any"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    async def complete(self, key: str, prompt: str) -> str:
+        """Cached, coalesced, concurrency-limited completion of one prompt"""
+        self._count('requests')
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count('cache_hits')
+            return cached
+        state = self._state()
+        pending = state.in_flight.get(key)
+        if pending is not None:
+            self._count('coalesced')
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        state.in_flight[key] = future
+        try:
+            async with state.semaphore:
+                self._count('provider_calls')
+                response = await self.provider.complete(prompt)
+            self.cache.put(key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._count('errors')
+            future.set_exception(e)
+            # Mark retrieved so an error with no coalesced waiters is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del state.in_flight[key]
+
+    async def generate(self, resume_data: barepa.ResumeData, job_description: str,
+                       instructions: str = '') -> List[Question]:
+        """Questions for one resume and JD; topics whose call fails are skipped and logged"""
+        resume_hash = hash_resume(resume_data)
+        prompts = build_prompts(resume_data, job_description, instructions)
+        responses = await asyncio.gather(*(
+            self.complete(cache_key(self.provider.name, resume_hash, job_description, prompt), prompt)
+            for _, prompt in prompts
+        ), return_exceptions=True)
+
+        questions = []
+        for (topic, _), response in zip(prompts, responses):
+            if isinstance(response, BaseException):
+                logger.error(f"Question generation failed for topic '{topic}': {response}")
+                continue
+            questions.extend(parse_questions(topic, response))
+        return questions
+
+    async def generate_many(self, requests: Sequence[Tuple[barepa.ResumeData, str]],
+                            instructions: str = '') -> List[List[Question]]:
+        """Questions for many (resume, JD) pairs, all sharing the concurrency limit"""
+        return list(await asyncio.gather(*(
+            self.generate(resume_data, job_description, instructions) for resume_data, job_description in requests
+        )))
+
+
+def generate_questions(resume_data: barepa.ResumeData, job_description: str, instructions: str = '',
+                       generator: Optional[QuestionGenerator] = None) -> List[Question]:
+    """Blocking entry point for callers without an event loop (e.g. Streamlit); thread-safe"""
+    if generator is not None:
+        return generator.run(generator.generate(resume_data, job_description, instructions))
+    return asyncio.run(QuestionGenerator(default_provider()).generate(resume_data, job_description, instructions))
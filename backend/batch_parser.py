@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.batch_parser as babapa
+"""
+
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+# Files per task when the entity pass is on; each task runs it as one nlp.pipe batch
+ENTITY_CHUNK_SIZE = 16
+
+
+@dataclass
+class ParseResult:
+    """Outcome of parsing one file in a batch"""
+    index: int
+    path: str
+    data: Optional[barepa.ResumeData] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# One parser per worker process, built once by the pool initializer `init_worker`
+_worker_parser: Optional[barepa.ResumeParser] = None
+
+
+def init_worker(parser_kwargs: Optional[Dict[str, Any]] = None):
+    """
+    Create the parser that this worker reuses for every file. Pools outside
+    this module pass it as their initializer and read it with `worker_parser`.
+    """
+    global _worker_parser
+    _worker_parser = barepa.ResumeParser(**(parser_kwargs or {}))
+    if _worker_parser.entities is not None:
+        # Load the spaCy pipeline now rather than on the first document
+        _worker_parser.entities.nlp
+
+
+def worker_parser() -> barepa.ResumeParser:
+    """The parser built by `init_worker` in this process"""
+    if _worker_parser is None:
+        raise RuntimeError("init_worker has not run in this process")
+    return _worker_parser
+
+
+def _parse_one(index: int, path: str, entities: bool = True) -> ParseResult:
+    """Parse a single file, capturing any error instead of raising"""
+    try:
+        return ParseResult(index=index, path=path, data=_worker_parser.parse_resume(path, entities))
+    except Exception as e:
+        logger.error(f"Error parsing resume {path}: {e}")
+        return ParseResult(index=index, path=path, error=f"{type(e).__name__}: {e}")
+
+
+def _add_entities(results: List[ParseResult]):
+    """Run the entity pass over the parsed results, failing only the documents it fails on"""
+    parsed = [result for result in results if result.ok]
+    try:
+        for _ in _worker_parser.add_entities(result.data for result in parsed):
+            pass
+        return
+    except Exception as e:
+        logger.warning(f"Batched entity pass failed, retrying file by file: {e}")
+    for result in parsed:
+        try:
+            for _ in _worker_parser.add_entities([result.data]):
+                pass
+        except Exception as e:
+            logger.error(f"Error extracting entities from {result.path}: {e}")
+            result.data, result.error = None, f"{type(e).__name__}: {e}"
+
+
+def _parse_chunk(chunk: List[Tuple[int, str]]) -> List[ParseResult]:
+    """Parse a chunk of files; the entity pass, if any, runs over the whole chunk at once"""
+    entities = _worker_parser.entities is not None
+    results = [_parse_one(index, path, entities=not entities) for index, path in chunk]
+    if entities:
+        _add_entities(results)
+    return results
+
+
+def _chunks(paths: Iterable[str], size: int) -> Iterator[List[Tuple[int, str]]]:
+    items = enumerate(paths)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    max_in_flight: Optional[int] = None,
+    parser_kwargs: Optional[Dict[str, Any]] = None,
+) -> Iterator[ParseResult]:
+    """
+    Parse many resume files across a process pool.
+
+    Results are yielded as they finish, or in input order when `ordered` is
+    set. A failing file produces a `ParseResult` with `error` filled in and
+    does not stop the batch. `paths` may be a lazy iterable; at most
+    `max_in_flight` files are queued at any time. With an `nlp_model` in
+    `parser_kwargs`, files go to workers in chunks of ENTITY_CHUNK_SIZE so
+    the entity pass is batched through `nlp.pipe`.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = ENTITY_CHUNK_SIZE if (parser_kwargs or {}).get('nlp_model') else 1
+
+    if workers == 1:
+        # Run in-process, which keeps tracebacks and profilers simple
+        init_worker(parser_kwargs)
+        for chunk in _chunks(paths, chunk_size):
+            yield from _parse_chunk(chunk)
+        return
+
+    max_in_flight = max(max_in_flight or workers * 4, chunk_size)
+    chunk_iter = _chunks(paths, chunk_size)
+    in_flight = 0
+    pending = set()
+    buffered: Dict[int, ParseResult] = {}
+    next_index = 0
+    exhausted = False
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(parser_kwargs,)
+    ) as executor:
+        while True:
+            # Keep the pool fed without materialising the whole input
+            while not exhausted and in_flight + len(buffered) + chunk_size <= max_in_flight:
+                try:
+                    chunk = next(chunk_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(_parse_chunk, chunk))
+                in_flight += len(chunk)
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    in_flight -= 1
+                    if not ordered:
+                        yield result
+                        continue
+                    buffered[result.index] = result
+
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+
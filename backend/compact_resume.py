@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.compact_resume as bacore
+"""
+
+import os
+import sys
+import zlib
+import threading
+from array import array
+from dataclasses import asdict, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import backend.resume_parser as barepa
+
+# Plain fields copied as-is
+SCALAR_FIELDS = ('name', 'email', 'phone', 'address', 'linkedin', 'github', 'portfolio', 'file_type',
+                 'duplicate_of', 'duplicate_similarity')
+# List-of-dict fields stored as layout-tagged tuples
+RECORD_FIELDS = ('education', 'experience', 'projects', 'page_stats')
+# List-of-string fields stored as tuples
+TUPLE_FIELDS = ('certifications', 'languages')
+
+# Strings this short repeat across candidates (companies, degrees, engines)
+MAX_INTERNED_LENGTH = 64
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str) and len(value) <= MAX_INTERNED_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class Interner:
+    """Bidirectional value <-> small integer ID table"""
+
+    def __init__(self):
+        self._ids: Dict[Any, int] = {}
+        self._values: List[Any] = []
+        self._lock = threading.Lock()
+
+    def id(self, value: Any) -> int:
+        found = self._ids.get(value)
+        if found is not None:
+            return found
+        with self._lock:
+            found = self._ids.get(value)
+            if found is None:
+                found = self._ids[value] = len(self._values)
+                self._values.append(value)
+            return found
+
+    def value(self, value_id: int) -> Any:
+        return self._values[value_id]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class MemoryTextStore:
+    """Side store keeping raw text zlib-compressed in memory"""
+
+    def __init__(self):
+        self._blobs: List[bytes] = []
+
+    def put(self, text: str) -> int:
+        self._blobs.append(zlib.compress(text.encode('utf-8')))
+        return len(self._blobs) - 1
+
+    def get(self, key: int) -> str:
+        return zlib.decompress(self._blobs[key]).decode('utf-8')
+
+
+class FileTextStore:
+    """
+    Append-only side store on disk. A key packs the blob's offset and length,
+    and reads use pread, so lookups are thread-safe and need no index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'ab+', buffering=0)
+        self._end = os.fstat(self._file.fileno()).st_size
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> int:
+        blob = zlib.compress(text.encode('utf-8'))
+        with self._lock:
+            offset = self._end
+            self._file.write(blob)
+            self._end += len(blob)
+        return (offset << 32) | len(blob)
+
+    def get(self, key: int) -> str:
+        offset, length = key >> 32, key & 0xFFFFFFFF
+        return zlib.decompress(os.pread(self._file.fileno(), length, offset)).decode('utf-8')
+
+    def close(self):
+        self._file.close()
+
+
+class CompactResume:
+    """
+    Slotted, compact form of ResumeData for large in-memory candidate pools.
+
+    Skills are interned IDs in an array, dict records are tuples tagged with
+    an interned key layout, and raw text lives in the pool's side store and is
+    loaded only when `raw_text` is read.
+    """
+
+    __slots__ = SCALAR_FIELDS + RECORD_FIELDS + TUPLE_FIELDS + ('skill_ids', '_text_key', '_pool')
+
+    @property
+    def skills(self) -> List[str]:
+        return [self._pool.skills.value(skill_id) for skill_id in self.skill_ids]
+
+    @property
+    def raw_text(self) -> str:
+        if self._text_key is None:
+            return ""
+        return self._pool.texts.get(self._text_key)
+
+    def to_resume(self) -> barepa.ResumeData:
+        """Expand back to an equal ResumeData"""
+        pool = self._pool
+        values = {name: getattr(self, name) for name in SCALAR_FIELDS}
+        for name in RECORD_FIELDS:
+            values[name] = [pool.expand_record(record) for record in getattr(self, name)]
+        for name in TUPLE_FIELDS:
+            values[name] = list(getattr(self, name))
+        values['skills'] = self.skills
+        values['raw_text'] = self.raw_text
+        return barepa.ResumeData(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same as `asdict(self.to_resume())`"""
+        return asdict(self.to_resume())
+
+    def __repr__(self) -> str:
+        return f"CompactResume(name={self.name!r}, email={self.email!r}, skills={len(self.skill_ids)})"
+
+
+class CandidatePool:
+    """
+    Collection of CompactResume objects sharing skill IDs, record layouts and
+    a raw-text side store (in memory by default, or a FileTextStore).
+    """
+
+    def __init__(self, texts=None):
+        self.skills = Interner()
+        self.layouts = Interner()
+        self.texts = texts if texts is not None else MemoryTextStore()
+        self._items: List[CompactResume] = []
+
+    def compact_record(self, record: Dict[str, Any]) -> Tuple:
+        """Dict -> (layout ID, *values); the layout keeps key order, so it round-trips exactly"""
+        return (self.layouts.id(tuple(record)),) + tuple(_intern(value) for value in record.values())
+
+    def expand_record(self, record: Tuple) -> Dict[str, Any]:
+        return dict(zip(self.layouts.value(record[0]), record[1:]))
+
+    def compact(self, resume_data: barepa.ResumeData) -> CompactResume:
+        """Build a CompactResume without adding it to the pool"""
+        item = CompactResume()
+        for name in SCALAR_FIELDS:
+            setattr(item, name, _intern(getattr(resume_data, name)))
+        for name in RECORD_FIELDS:
+            setattr(item, name, tuple(self.compact_record(record) for record in getattr(resume_data, name)))
+        for name in TUPLE_FIELDS:
+            setattr(item, name, tuple(_intern(value) for value in getattr(resume_data, name)))
+        item.skill_ids = array('I', (self.skills.id(skill) for skill in resume_data.skills))
+        item._text_key = self.texts.put(resume_data.raw_text) if resume_data.raw_text else None
+        item._pool = self
+        return item
+
+    def add(self, resume_data: barepa.ResumeData) -> CompactResume:
+        item = self.compact(resume_data)
+        self._items.append(item)
+        return item
+
+    def add_dict(self, data: Dict[str, Any]) -> CompactResume:
+        """Add from the `asdict` form of a ResumeData"""
+        known = {field.name for field in fields(barepa.ResumeData)}
+        return self.add(barepa.ResumeData(**{key: value for key, value in data.items() if key in known}))
+
+    def __getitem__(self, index: int) -> CompactResume:
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[CompactResume]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        """ID of a skill already seen in the pool, or None"""
+        return self.skills._ids.get(skill)
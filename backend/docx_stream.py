@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.docx_stream as badost
+
+Streaming DOCX text extraction. The main document part is decompressed and
+parsed incrementally with `xml.etree.ElementTree.iterparse`; each paragraph
+and table cell is turned into text when its closing tag is read and then
+discarded, so memory stays bounded by the largest top-level block rather
+than the document.
+
+Paragraphs and table cells come out in document order. A cell is emitted
+once however many grid columns it spans, and vertically merged
+continuation cells are skipped. Text boxes are read from their DrawingML
+content only; the VML fallback copy is ignored.
+"""
+
+import posixpath
+from typing import Any, Iterator, List, Union
+
+import backend.file_source as bafiso
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT_REL = '/officeDocument'
+DEFAULT_DOCUMENT_PART = 'word/document.xml'
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+LEGACY_DOC_ERROR = "Legacy .doc (Word 97-2003) files are not supported; save the file as .docx or PDF"
+
+W_BODY = W_NS + 'body'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TBL = W_NS + 'tbl'
+W_TR = W_NS + 'tr'
+W_TC = W_NS + 'tc'
+W_V_MERGE = W_NS + 'vMerge'
+W_VAL = W_NS + 'val'
+# Run content that stands for whitespace
+W_BREAKS = {W_NS + 'tab': '\t', W_NS + 'br': '\n', W_NS + 'cr': '\n'}
+
+
+class _Cell:
+    __slots__ = ('lines', 'merged')
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.merged = False
+
+
+def _main_part(archive) -> str:
+    """Name of the main document part, from the package relationships"""
+    import xml.etree.ElementTree as ET
+
+    try:
+        with archive.open('_rels/.rels') as rels:
+            for relationship in ET.parse(rels).getroot().iter(RELS_NS + 'Relationship'):
+                if relationship.get('Type', '').endswith(OFFICE_DOCUMENT_REL):
+                    return posixpath.normpath(relationship.get('Target', '').lstrip('/'))
+    except KeyError:
+        pass
+    return DEFAULT_DOCUMENT_PART
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == W_T:
+            parts.append(node.text or '')
+        elif node.tag in W_BREAKS:
+            parts.append(W_BREAKS[node.tag])
+    return ''.join(parts)
+
+
+def iter_blocks(stream) -> Iterator[str]:
+    """
+    Yield the text of each non-empty body paragraph and table cell of a
+    main document part, in document order.
+    """
+    import xml.etree.ElementTree as ET
+
+    stack: List[Any] = []
+    cells: List[_Cell] = []
+    fallback_depth = 0
+    for event, node in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(node)
+            if node.tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif node.tag == W_TC:
+                cells.append(_Cell())
+            elif node.tag == W_TBL and cells and not fallback_depth:
+                # A nested table: what the enclosing cell has so far comes first
+                text = '\n'.join(cells[-1].lines)
+                cells[-1].lines = []
+                if text.strip():
+                    yield text
+            continue
+
+        stack.pop()
+        tag = node.tag
+        if tag == W_P:
+            # Nested paragraphs (text boxes) were emitted and cleared when they closed
+            text = _paragraph_text(node)
+            node.clear()
+            if fallback_depth:
+                continue
+            if cells:
+                cells[-1].lines.append(text)
+            elif text.strip():
+                yield text
+        elif tag == W_V_MERGE:
+            # No val, or val="continue", marks a cell merged into the one above
+            if cells and node.get(W_VAL, 'continue') == 'continue':
+                cells[-1].merged = True
+        elif tag == W_TC:
+            cell = cells.pop()
+            text = '\n'.join(cell.lines)
+            node.clear()
+            if not cell.merged and not fallback_depth and text.strip():
+                yield text
+        elif tag == W_TR:
+            node.clear()
+        elif tag == MC_FALLBACK:
+            fallback_depth -= 1
+            node.clear()
+        if stack and stack[-1].tag == W_BODY:
+            # Top-level block done; drop it so the tree never holds more than one
+            stack[-1].remove(node)
+
+
+def iter_docx_text(source: Union[str, bytes]) -> Iterator[str]:
+    """Text blocks of a DOCX given as a path or bytes; ValueError if it is not a DOCX"""
+    # Imported on first use so importing the parser stays cheap
+    import zipfile
+
+    with bafiso.open_stream(source) as stream:
+        if stream.read(len(OLE2_MAGIC)) == OLE2_MAGIC:
+            raise ValueError(LEGACY_DOC_ERROR)
+        stream.seek(0)
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            raise ValueError(f"Not a DOCX file (not a zip archive): {bafiso.describe(source)}") from None
+        with archive:
+            part = _main_part(archive)
+            try:
+                document = archive.open(part)
+            except KeyError:
+                raise ValueError(f"DOCX file has no document part '{part}': {bafiso.describe(source)}") from None
+            with document:
+                yield from iter_blocks(document)
+
+
+def extract_docx_text(source: Union[str, bytes]) -> str:
+    return '\n'.join(iter_docx_text(source)).strip()
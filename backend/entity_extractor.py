@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.entity_extractor as baenex
+
+Optional spaCy entity pass for person names, organizations and dates. The
+default pipeline is a blank English model with an EntityRuler, so it works
+offline without a downloaded model. An installed package such as
+`en_core_web_sm` can be named instead; it is loaded with only the components
+its NER needs, and the ruler runs ahead of it. Pipelines are built once per
+process and shared by every extractor. Bulk callers should go through
+`extract_many`, which batches documents with `nlp.pipe`.
+"""
+
+import os
+import re
+import bisect
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import backend.section_index as basein
+
+logger = logging.getLogger(__name__)
+
+# Bump when the built-in patterns or the grouping rules change
+ENTITY_RULES_VERSION = "2"
+BLANK_MODEL = 'en'
+LABELS = ('PERSON', 'ORG', 'DATE')
+DEFAULT_BATCH_SIZE = 64
+# Components of packaged models that entity extraction does not use
+UNUSED_COMPONENTS = ('tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'morphologizer', 'senter', 'textcat')
+# A name is looked for in the first lines only, as in ResumeParser.extract_name
+NAME_LINES = 5
+NAME_EXCLUDE_WORDS = ('resume', 'cv', 'curriculum', 'vitae', 'contact', 'phone', 'email')
+# Sections the grouping rules read; other lines are not sent through the pipeline
+ENTITY_SECTIONS = ('experience', 'education')
+# Longer lines in a section are descriptions, not titles or degrees
+MAX_TITLE_WORDS = 8
+
+MONTHS = (
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+    'september', 'october', 'november', 'december',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+)
+PRESENT_WORDS = ('present', 'current', 'now', 'today', 'date')
+RANGE_WORDS = ('-', '–', '—', 'to', 'until', 'till')
+# Words that also start job titles ('Software', 'Systems') are left out
+ORG_SUFFIXES = (
+    'inc', 'inc.', 'llc', 'ltd', 'ltd.', 'limited', 'corp', 'corp.', 'corporation', 'co', 'co.', 'company',
+    'group', 'gmbh', 'plc', 'technologies', 'labs', 'bank', 'partners',
+    'university', 'college', 'institute', 'school', 'academy', 'polytechnic',
+)
+ORG_PREFIXES = ('university', 'college', 'institute', 'school', 'academy')
+
+YEAR = r'(?:19|20)\d{2}'
+YEAR_PATTERN = re.compile(YEAR)
+# Separators left between a title and the organization or dates removed from its line
+SEPARATOR_PATTERN = re.compile(r'\s+(?:at|@|[-–—|])\s+|\s*[|,;•·]\s*|\s+(?:at|@)\s*$', re.IGNORECASE)
+
+
+def _date_patterns() -> List[Dict[str, Any]]:
+    month_year = [{'LOWER': {'IN': list(MONTHS)}}, {'IS_PUNCT': True, 'OP': '?'}, {'TEXT': {'REGEX': f'^{YEAR}$'}}]
+    numeric = [{'TEXT': {'REGEX': rf'^(?:0?[1-9]|1[0-2])[/.]{YEAR}$'}}]
+    year = [{'TEXT': {'REGEX': f'^{YEAR}$'}}]
+    present = [{'LOWER': {'IN': list(PRESENT_WORDS)}}]
+    separator = [{'LOWER': {'IN': list(RANGE_WORDS)}}]
+    points = (month_year, numeric, year)
+    patterns = [
+        start + separator + end
+        for start in points
+        for end in points + (present,)
+    ]
+    # The tokenizer keeps '2019-2021' and '05/2019-06/2021' as one token
+    patterns.append([{'TEXT': {'REGEX': rf'^(?:\d{{1,2}}/)?{YEAR}[-–—](?:\d{{1,2}}/)?{YEAR}$'}}])
+    patterns.extend(points)
+    return [{'label': 'DATE', 'pattern': pattern} for pattern in patterns]
+
+
+def _org_patterns() -> List[Dict[str, Any]]:
+    # Capitalised words only, so a year after a name is not taken into it
+    word = {'TEXT': {'REGEX': r"^[A-Z][\w&'’.]*$"}}
+    connector = {'LOWER': {'IN': ['of', 'and', '&', 'for', 'de']}, 'OP': '?'}
+    return [
+        {'label': 'ORG', 'pattern': [word, {'OP': '*', **word}, {'LOWER': {'IN': list(ORG_SUFFIXES)}}]},
+        {'label': 'ORG', 'pattern': [
+            {'LOWER': {'IN': list(ORG_PREFIXES)}}, {'LOWER': 'of'}, word, connector, {'OP': '*', **word},
+        ]},
+    ]
+
+
+def _person_patterns() -> List[Dict[str, Any]]:
+    # Title-case or upper-case words that are not organization suffixes or months
+    word = {'TEXT': {'REGEX': r"^[A-Z][A-Za-z'’]+$"}, 'LOWER': {'NOT_IN': list(ORG_SUFFIXES + MONTHS)}}
+    initial = {'TEXT': {'REGEX': r'^[A-Z]\.?$'}}
+    return [
+        {'label': 'PERSON', 'pattern': pattern}
+        for pattern in ([word, word], [word, word, word], [word, word, word, word], [word, initial, word])
+    ]
+
+
+def ruler_patterns() -> List[Dict[str, Any]]:
+    """Built-in EntityRuler patterns for dates, organizations and person names"""
+    return _date_patterns() + _org_patterns() + _person_patterns()
+
+
+@lru_cache(maxsize=4)
+def _load(model: str, patterns: Optional[str], patterns_mtime_ns: int):
+    import spacy
+    import srsly
+
+    if spacy.util.is_package(model) or os.path.isdir(model):
+        nlp = spacy.load(model, exclude=list(UNUSED_COMPONENTS))
+    else:
+        nlp = spacy.blank(model)
+    # Rule matches are kept and the statistical NER, if any, labels the rest
+    ruler = nlp.add_pipe('entity_ruler', before='ner' if 'ner' in nlp.pipe_names else None)
+    ruler.add_patterns(ruler_patterns())
+    if patterns:
+        ruler.add_patterns(list(srsly.read_jsonl(patterns)))
+    logger.info(f"Loaded spaCy pipeline '{model}' with components {nlp.pipe_names}")
+    return nlp
+
+
+def load_pipeline(model: str = BLANK_MODEL, patterns: Optional[str] = None):
+    """
+    The spaCy pipeline for `model` (a language code for a blank model, or an
+    installed package or path) plus the entity ruler, with extra patterns from
+    a JSONL file. Cached per process and patterns file version.
+    """
+    if patterns:
+        patterns = os.path.abspath(patterns)
+        return _load(model, patterns, os.stat(patterns).st_mtime_ns)
+    return _load(model, None, 0)
+
+
+@dataclass
+class Entity:
+    """An entity and the index of the line it starts on"""
+    label: str
+    text: str
+    line: int
+
+
+@dataclass
+class DocumentEntities:
+    entities: List[Entity] = field(default_factory=list)
+
+    def by_line(self, label: str) -> Dict[int, List[Entity]]:
+        lines: Dict[int, List[Entity]] = {}
+        for entity in self.entities:
+            if entity.label == label:
+                lines.setdefault(entity.line, []).append(entity)
+        return lines
+
+
+def _line_starts(text: str) -> List[int]:
+    """Character offset of every line, split the same way as SectionIndex"""
+    starts = [0]
+    for match in re.finditer('\n', text):
+        starts.append(match.end())
+    return starts
+
+
+def focus_text(index: basein.SectionIndex) -> str:
+    """
+    The text with every line the rules do not read left empty, so line
+    numbers still match `index` while tokenizing and matching far less
+    """
+    keep = set(range(min(NAME_LINES, len(index.lines))))
+    for section in ENTITY_SECTIONS:
+        keep.update(i for i in index.section_lines(section) if not _is_description(index.lines[i]))
+    return '\n'.join(line if i in keep else '' for i, line in enumerate(index.lines))
+
+
+def document_entities(doc) -> DocumentEntities:
+    """Entities of a processed spaCy Doc, located by line"""
+    starts = _line_starts(doc.text)
+    return DocumentEntities([
+        Entity(ent.label_, ent.text.strip(), bisect.bisect_right(starts, ent.start_char) - 1)
+        for ent in doc.ents
+        if ent.label_ in LABELS and '\n' not in ent.text.strip()
+    ])
+
+
+class EntityExtractor:
+    """Finds names, organizations and dates with a shared spaCy pipeline, loaded on first use"""
+
+    def __init__(self, model: str = BLANK_MODEL, patterns: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1):
+        self.model = model
+        self.patterns = patterns
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    @property
+    def nlp(self):
+        return load_pipeline(self.model, self.patterns)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identify the model, built-in rules and extra patterns, for cache keys"""
+        digest = hashlib.sha256(f"{ENTITY_RULES_VERSION}:{self.model}".encode())
+        if self.patterns:
+            with open(self.patterns, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()[:16]
+
+    def _truncate(self, text: str) -> str:
+        # Entities of interest sit far before spaCy's length cap
+        return text[:self.nlp.max_length]
+
+    def extract(self, text: str) -> DocumentEntities:
+        return next(self.extract_many([text]))
+
+    def extract_many(self, texts: Iterable[Any], as_tuples: bool = False,
+                     batch_size: Optional[int] = None, n_process: Optional[int] = None) -> Iterator[Any]:
+        """
+        Entities of many texts through `nlp.pipe`, in input order. With
+        `as_tuples`, items are (text, context) pairs and (entities, context)
+        pairs come back. `n_process` > 1 forks spaCy workers, so it cannot be
+        used inside a daemonic pool worker.
+        """
+        if as_tuples:
+            items = ((self._truncate(text), context) for text, context in texts)
+        else:
+            items = (self._truncate(text) for text in texts)
+        docs = self.nlp.pipe(
+            items, as_tuples=as_tuples,
+            batch_size=batch_size or self.batch_size, n_process=n_process or self.n_process,
+        )
+        if as_tuples:
+            for doc, context in docs:
+                yield document_entities(doc), context
+        else:
+            for doc in docs:
+                yield document_entities(doc)
+
+
+def _first_text(entities: Dict[int, List[Entity]], line: int) -> Optional[str]:
+    found = entities.get(line)
+    return found[0].text if found else None
+
+
+def _leftover(line: str, entities: Sequence[Entity]) -> str:
+    """What remains of a line once its entities and the separators around them are removed"""
+    for entity in entities:
+        line = line.replace(entity.text, ' ', 1)
+    return ', '.join(part.strip() for part in SEPARATOR_PATTERN.split(line) if part and part.strip())
+
+
+def _is_description(line: str) -> bool:
+    return line[0] in basein.BULLET_CHARS or len(line.split()) > MAX_TITLE_WORDS
+
+
+def find_name(entities: DocumentEntities, index: basein.SectionIndex) -> Optional[str]:
+    """A PERSON entity that starts one of the first lines, outside section headers"""
+    for entity in entities.entities:
+        if entity.line >= NAME_LINES:
+            break
+        if entity.label != 'PERSON' or entity.line in index.headers:
+            continue
+        if not index.lines[entity.line].startswith(entity.text):
+            continue
+        if not any(word in entity.text.lower() for word in NAME_EXCLUDE_WORDS):
+            return entity.text
+    return None
+
+
+def group_experience(entities: DocumentEntities, index: basein.SectionIndex) -> Optional[List[Dict[str, str]]]:
+    """
+    Experience entries built from ORG (company) and DATE (duration) entities,
+    with the rest of a short line as the title; a field seen twice starts a new
+    entry. None when the section has no such entities.
+    """
+    lines = index.section_lines('experience')
+    orgs, dates = entities.by_line('ORG'), entities.by_line('DATE')
+    if not any(i in orgs or i in dates for i in lines):
+        return None
+    experience = []
+    current: Dict[str, str] = {}
+    for i in lines:
+        line = index.lines[i]
+        if _is_description(line):
+            continue
+        fields = {}
+        company, duration = _first_text(orgs, i), _first_text(dates, i)
+        title = _leftover(line, orgs.get(i, []) + dates.get(i, []))
+        if title and not company and not duration and 'title' in current and 'company' not in current:
+            # A plain line right after a title names an organization the rules do not know
+            fields['company'] = title
+        elif title:
+            fields['title'] = title
+        if company:
+            fields['company'] = company
+        if duration:
+            fields['duration'] = duration
+        if any(key in current for key in fields):
+            experience.append(current)
+            current = {}
+        current.update(fields)
+    if current:
+        experience.append(current)
+    return experience
+
+
+def group_education(entities: DocumentEntities, index: basein.SectionIndex,
+                    degree_keywords: Sequence[str]) -> Optional[List[Dict[str, str]]]:
+    """
+    Education entries from degree lines, ORG (institution) and DATE (last
+    year mentioned) entities. None when the section has no such entities.
+    """
+    lines = index.section_lines('education')
+    orgs, dates = entities.by_line('ORG'), entities.by_line('DATE')
+    if not any(i in orgs or i in dates for i in lines):
+        return None
+    education = []
+    current: Dict[str, str] = {}
+    for i in lines:
+        line = index.lines[i]
+        if _is_description(line):
+            continue
+        fields = {}
+        if any(degree in index.lower[i] for degree in degree_keywords):
+            fields['degree'] = _leftover(line, orgs.get(i, []) + dates.get(i, [])) or line
+        institution = _first_text(orgs, i)
+        if institution:
+            fields['institution'] = institution
+        years = [year for entity in dates.get(i, []) for year in YEAR_PATTERN.findall(entity.text)]
+        if years:
+            fields['year'] = years[-1]
+        if any(key in current for key in fields):
+            education.append(current)
+            current = {}
+        current.update(fields)
+    if current:
+        education.append(current)
+    return [entry for entry in education if 'degree' in entry or 'institution' in entry]
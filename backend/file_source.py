@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.file_source as bafiso
+"""
+
+import io
+import os
+from typing import BinaryIO, Union
+
+# A resume can be given as a path or as its raw bytes in any buffer form
+ResumeSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+MAGIC_BYTES = (
+    (b'%PDF-', '.pdf'),
+    (b'PK\x03\x04', '.docx'),  # Office Open XML is a zip archive
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', '.doc'),  # legacy OLE2 compound file
+)
+
+
+def normalize(source: ResumeSource) -> Union[str, bytes]:
+    """Reduce any accepted source to a path or an immutable bytes object"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    if hasattr(source, 'read'):
+        return source.read()
+    raise TypeError(f"Unsupported resume source type: {type(source).__name__}")
+
+
+def is_path(source: Union[str, bytes]) -> bool:
+    return isinstance(source, str)
+
+
+def detect_format(source: Union[str, bytes]) -> str:
+    """File extension for a source: from the name for paths, from magic bytes otherwise"""
+    if is_path(source):
+        return os.path.splitext(source)[1].lower()
+    for magic, ext in MAGIC_BYTES:
+        if source.startswith(magic):
+            return ext
+    return ''
+
+
+def open_stream(source: Union[str, bytes]) -> BinaryIO:
+    """Fresh binary stream over a source; BytesIO shares the bytes without copying"""
+    if is_path(source):
+        return open(source, 'rb')
+    return io.BytesIO(source)
+
+
+def describe(source: Union[str, bytes]) -> str:
+    """Short label for log and error messages"""
+    if is_path(source):
+        return source
+    return f"<{len(source)} bytes in memory>"
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.ingest as bainge
+
+Incremental ingestion of resume directories into a single SQLite store.
+
+The store holds a manifest of every file seen (path, mtime, size, content
+hash, parser fingerprint, status) and one parse result per distinct content
+hash. A run walks the roots and only parses files whose size or mtime
+changed and whose content hash is new, or that were last parsed by another
+parser version. Bytes already parsed under another path are linked, not
+parsed again. Results and manifest rows are committed together every
+`checkpoint_every` files, so a crashed or interrupted run resumes from the
+last checkpoint. Files that disappeared are dropped once a walk completes.
+
+Usage:
+
+python -m backend.ingest ROOT [ROOT ...] [--store resumes.sqlite] [--workers N]
+    [--pdf-engine auto] [--nlp-model en] [--timeout S] [--retry-failed] [--export resumes.jsonl]
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import argparse
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import backend.batch_parser as babapa
+import backend.resource_guard as baregu
+import backend.resume_cache as bareca
+import backend.resume_export as bareex
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+# Commit after this many finished files or seconds, whichever comes first
+CHECKPOINT_EVERY = 200
+CHECKPOINT_SECONDS = 10.0
+# Parser options that change results, and so the stored parser fingerprint
+FINGERPRINT_KWARGS = ('pdf_engine', 'skill_taxonomy', 'nlp_model', 'nlp_patterns')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS files ('
+    'path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, content_hash TEXT NOT NULL, '
+    'parser TEXT NOT NULL, status TEXT NOT NULL, error TEXT, seen INTEGER NOT NULL, updated REAL NOT NULL);'
+    'CREATE INDEX IF NOT EXISTS files_content_hash ON files (content_hash);'
+    'CREATE TABLE IF NOT EXISTS resumes ('
+    'content_hash TEXT PRIMARY KEY, parser TEXT NOT NULL, data BLOB NOT NULL);'
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'run INTEGER PRIMARY KEY, started REAL NOT NULL, finished REAL, roots TEXT NOT NULL, stats TEXT);'
+)
+
+
+@dataclass
+class IngestStats:
+    seen: int = 0
+    unchanged: int = 0  # same size and mtime, or same content hash
+    linked: int = 0  # new path for bytes already parsed
+    parsed: int = 0
+    failed: int = 0
+    removed: int = 0  # manifest entries for files that no longer exist
+    seconds: float = 0.0
+
+
+def walk(roots: Iterable[str], extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (absolute path, stat) for matching files under `roots`, lazily and in sorted order"""
+    stack = [os.path.abspath(root) for root in reversed(list(roots))]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+            continue
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                    yield entry.path, entry.stat()
+            except OSError as e:
+                logger.warning(f"Cannot stat {entry.path}: {e}")
+        stack.extend(reversed(subdirectories))
+
+
+class Ingestor:
+    """Runs incremental ingestion into the store at `store_path`"""
+
+    def __init__(
+        self,
+        store_path: str,
+        workers: Optional[int] = None,
+        parser_kwargs: Optional[Dict[str, Any]] = None,
+        retry_failed: bool = False,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+    ):
+        self.workers = workers
+        self.parser_kwargs = parser_kwargs or {}
+        self.retry_failed = retry_failed
+        self.checkpoint_every = checkpoint_every
+        # Workers build their own parsers; this one only identifies the parser version
+        self.fingerprint = barepa.ResumeParser(**{
+            key: value for key, value in self.parser_kwargs.items() if key in FINGERPRINT_KWARGS
+        }).fingerprint
+        os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+        self._db = sqlite3.connect(store_path)
+        self._db.executescript('PRAGMA journal_mode = WAL;' + SCHEMA)
+        self._seen: List[Tuple[int, str]] = []
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    # --- Manifest -----------------------------------------------------------
+
+    def _is_current(self, row: Optional[tuple]) -> bool:
+        """Whether a manifest row needs no work (apart from a changed stat)"""
+        if row is None or row[3] != self.fingerprint:
+            return False
+        return row[4] == 'done' or not self.retry_failed
+
+    def _record(self, path: str, stat: os.stat_result, content_hash: str, run: int,
+                status: str = 'done', error: Optional[str] = None):
+        self._db.execute(
+            'INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, parser, status, error, seen, updated) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path, stat.st_mtime_ns, stat.st_size, content_hash, self.fingerprint, status, error, run, time.time()),
+        )
+        self._uncommitted += 1
+
+    def _has_result(self, content_hash: str) -> bool:
+        return self._db.execute(
+            'SELECT 1 FROM resumes WHERE content_hash = ? AND parser = ?', (content_hash, self.fingerprint),
+        ).fetchone() is not None
+
+    def _checkpoint(self, stats: IngestStats, force: bool = False):
+        if not force and self._uncommitted < self.checkpoint_every and \
+                time.monotonic() - self._last_commit < CHECKPOINT_SECONDS:
+            return
+        self._db.executemany('UPDATE files SET seen = ? WHERE path = ?', self._seen)
+        self._db.commit()
+        self._seen = []
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        logger.info(f"Checkpoint: {stats.seen} seen, {stats.parsed} parsed, {stats.failed} failed")
+
+    # --- Run ----------------------------------------------------------------
+
+    def run(self, roots: List[str]) -> IngestStats:
+        """Ingest `roots`; interrupted runs keep everything up to the last checkpoint"""
+        start = time.perf_counter()
+        roots = [os.path.abspath(root) for root in roots]
+        run = self._db.execute(
+            'INSERT INTO runs (started, roots) VALUES (?, ?)', (time.time(), json.dumps(roots)),
+        ).lastrowid
+        self._db.commit()
+        stats = IngestStats()
+        # Stat and hash of each file being parsed, and other paths waiting on the same content
+        in_flight: Dict[str, Tuple[os.stat_result, str]] = {}
+        waiting: Dict[str, List[Tuple[str, os.stat_result]]] = {}
+
+        def changed_files() -> Iterator[str]:
+            for path, stat in walk(roots):
+                stats.seen += 1
+                self._checkpoint(stats)
+                row = self._db.execute(
+                    'SELECT mtime_ns, size, content_hash, parser, status, error FROM files WHERE path = ?', (path,),
+                ).fetchone()
+                if self._is_current(row) and (row[0], row[1]) == (stat.st_mtime_ns, stat.st_size):
+                    self._seen.append((run, path))
+                    self._uncommitted += 1
+                    stats.unchanged += 1
+                    continue
+                try:
+                    content_hash = bareca.hash_file(path)
+                except OSError as e:
+                    logger.warning(f"Cannot read {path}: {e}")
+                    continue
+                if self._is_current(row) and row[2] == content_hash:
+                    # Touched but not modified
+                    self._record(path, stat, content_hash, run, row[4], row[5])
+                    stats.unchanged += 1
+                elif content_hash in waiting:
+                    waiting[content_hash].append((path, stat))
+                elif self._has_result(content_hash):
+                    self._record(path, stat, content_hash, run)
+                    stats.linked += 1
+                else:
+                    in_flight[path] = (stat, content_hash)
+                    waiting[content_hash] = []
+                    yield path
+
+        try:
+            for result in babapa.parse_many(changed_files(), workers=self.workers, parser_kwargs=self.parser_kwargs):
+                stat, content_hash = in_flight.pop(result.path)
+                if result.ok:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO resumes (content_hash, parser, data) VALUES (?, ?, ?)',
+                        (content_hash, self.fingerprint, bareca.encode_resume(result.data)),
+                    )
+                    self._record(result.path, stat, content_hash, run)
+                    stats.parsed += 1
+                else:
+                    self._record(result.path, stat, content_hash, run, 'failed', result.error)
+                    stats.failed += 1
+                for path, other_stat in waiting.pop(content_hash):
+                    self._record(path, other_stat, content_hash, run, 'done' if result.ok else 'failed', result.error)
+                    if result.ok:
+                        stats.linked += 1
+                    else:
+                        stats.failed += 1
+                self._checkpoint(stats)
+        finally:
+            self._checkpoint(stats, force=True)
+
+        stats.removed = self._prune(roots, run)
+        stats.seconds = time.perf_counter() - start
+        self._db.execute(
+            'UPDATE runs SET finished = ?, stats = ? WHERE run = ?', (time.time(), json.dumps(asdict(stats)), run),
+        )
+        self._db.commit()
+        logger.info(f"Ingested {roots}: {asdict(stats)}")
+        return stats
+
+    def _prune(self, roots: List[str], run: int) -> int:
+        """Forget files under `roots` that a completed walk did not see, and results nothing points to"""
+        removed = 0
+        for root in roots:
+            prefix = root.rstrip(os.sep) + os.sep
+            removed += self._db.execute(
+                'DELETE FROM files WHERE seen < ? AND substr(path, 1, ?) = ?', (run, len(prefix), prefix),
+            ).rowcount
+        self._db.execute('DELETE FROM resumes WHERE content_hash NOT IN (SELECT content_hash FROM files)')
+        self._db.commit()
+        return removed
+
+    def close(self):
+        self._db.close()
+
+
+def iter_results(store_path: str) -> Iterator[barepa.ResumeData]:
+    """Every stored parse result, one per distinct file content"""
+    db = sqlite3.connect(store_path)
+    try:
+        for (blob,) in db.execute('SELECT data FROM resumes ORDER BY content_hash'):
+            yield bareca.decode_resume(blob)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally parse resume directories into a SQLite store')
+    parser.add_argument('roots', nargs='+', help='directories to walk')
+    parser.add_argument('--store', default='resumes.sqlite', help='manifest and results database')
+    parser.add_argument('--workers', type=int, default=None, help='parse processes (default: CPU count)')
+    parser.add_argument('--pdf-engine', default='auto')
+    parser.add_argument('--skill-taxonomy', default=None)
+    parser.add_argument('--nlp-model', default=None, help="spaCy entity pass: 'en' (blank + rules) or a model package")
+    parser.add_argument('--timeout', type=float, default=None, help='per-document extraction timeout in seconds')
+    parser.add_argument('--retry-failed', action='store_true', help='parse previously failed files again')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY)
+    parser.add_argument('--export', default=None, help='write all results to a .jsonl/.csv/.parquet file afterwards')
+    args = parser.parse_args()
+
+    parser_kwargs: Dict[str, Any] = {
+        'pdf_engine': args.pdf_engine, 'skill_taxonomy': args.skill_taxonomy, 'nlp_model': args.nlp_model,
+    }
+    if args.timeout:
+        parser_kwargs['limits'] = baregu.ResourceLimits(timeout=args.timeout)
+    ingestor = Ingestor(args.store, args.workers, parser_kwargs, args.retry_failed, args.checkpoint_every)
+    try:
+        stats = ingestor.run(args.roots)
+    finally:
+        ingestor.close()
+    print(json.dumps(asdict(stats), indent=2))
+    if args.export:
+        count = bareex.export_resumes(iter_results(args.store), args.export)
+        print(f"Exported {count} resumes to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
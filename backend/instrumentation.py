@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.instrumentation as bainst
+"""
+
+import time
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Shared, reusable no-op context manager, so disabled instrumentation costs one call
+_NULL_CONTEXT = nullcontext()
+
+METRIC_PREFIX = 'resume_parser'
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Instrumentation:
+    """
+    Hook for per-stage timing and counters in ResumeParser.
+
+    This base class records nothing and is the parser default. Subclasses
+    override `stage`, `count` and `parse` to collect metrics.
+    """
+
+    def parse(self):
+        """Context manager around one whole parse"""
+        return _NULL_CONTEXT
+
+    def stage(self, name: str):
+        """Context manager timing one stage of a parse"""
+        return _NULL_CONTEXT
+
+    def count(self, name: str, amount: float = 1, label: Optional[str] = None):
+        """Add `amount` to a counter, optionally split by `label` (e.g. engine name)"""
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(fraction * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _counter_key(name: str, label: Optional[str]) -> str:
+    return f"{name}:{label}" if label is not None else name
+
+
+class MetricsAggregator(Instrumentation):
+    """
+    In-process aggregator of stage timings and counters.
+
+    Keeps the most recent `max_samples` durations per stage for percentiles,
+    running totals for counters, and a per-thread record of the last parse
+    for debugging.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._stage_totals: Dict[str, Tuple[int, float]] = defaultdict(lambda: (0, 0.0))
+        self._counters: Dict[Tuple[str, Optional[str]], float] = defaultdict(float)
+        self._local = threading.local()
+        self.last_parse: Optional[Dict[str, Any]] = None
+
+    @contextmanager
+    def parse(self):
+        if getattr(self._local, 'record', None) is not None:
+            # Nested inside an outer parse (e.g. a cache lookup); record into that one
+            yield
+            return
+        record = {'stages': defaultdict(float), 'counters': defaultdict(float), 'ok': False}
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield
+            record['ok'] = True
+        finally:
+            self._local.record = None
+            self._add_sample('total', time.perf_counter() - start)
+            record['seconds'] = time.perf_counter() - start
+            record['stages'] = dict(record['stages'])
+            record['counters'] = dict(record['counters'])
+            self.last_parse = record
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._add_sample(name, elapsed)
+            record = getattr(self._local, 'record', None)
+            if record is not None:
+                record['stages'][name] += elapsed
+
+    def count(self, name: str, amount: float = 1, label: Optional[str] = None):
+        with self._lock:
+            self._counters[(name, label)] += amount
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record['counters'][_counter_key(name, label)] += amount
+
+    def _add_sample(self, name: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+            calls, total = self._stage_totals[name]
+            self._stage_totals[name] = (calls + 1, total + seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """Stage call counts, totals and percentiles (seconds), plus counter totals"""
+        with self._lock:
+            stages = {}
+            for name, samples in self._samples.items():
+                calls, total = self._stage_totals[name]
+                values = list(samples)
+                stages[name] = {
+                    'count': calls,
+                    'total': total,
+                    'mean': total / calls,
+                    **{f"p{int(q * 100)}": percentile(values, q) for q in QUANTILES},
+                }
+            counters = {_counter_key(name, label): value for (name, label), value in self._counters.items()}
+        return {'stages': stages, 'counters': counters}
+
+    def to_prometheus(self) -> str:
+        """Render the aggregate in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            stage_metric = f"{METRIC_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {stage_metric} Wall time per parse stage.")
+            lines.append(f"# TYPE {stage_metric} summary")
+            for name in sorted(self._samples):
+                values = list(self._samples[name])
+                calls, total = self._stage_totals[name]
+                for q in QUANTILES:
+                    lines.append(f'{stage_metric}{{stage="{name}",quantile="{q}"}} {percentile(values, q):.6f}')
+                lines.append(f'{stage_metric}_sum{{stage="{name}"}} {total:.6f}')
+                lines.append(f'{stage_metric}_count{{stage="{name}"}} {calls}')
+
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (counter, label), value in sorted(self._counters.items(), key=lambda item: str(item[0])):
+                    if counter != name:
+                        continue
+                    labels = f'{{type="{label}"}}' if label is not None else ''
+                    lines.append(f"{metric}{labels} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._stage_totals.clear()
+            self._counters.clear()
+            self.last_parse = None
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.near_duplicates as banedu
+
+Near-duplicate detection for resume text with MinHash and LSH. Text is cut
+into overlapping word shingles and summarized by a MinHash signature, whose
+agreement rate estimates the Jaccard similarity of two shingle sets. The
+signature is split into bands; documents sharing any whole band are
+candidates and are confirmed against the similarity threshold.
+
+DuplicateIndex keeps signatures and band buckets in SQLite, so it persists,
+grows one document at a time and answers a lookup with one indexed query.
+Each document is either a candidate of its own or linked to the candidate it
+duplicates.
+"""
+
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'\w+')
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+# Multiplier of the rolling shingle hash (odd, 64-bit)
+SHINGLE_BASE = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+
+@dataclass
+class Duplicate:
+    """An existing candidate and the estimated Jaccard similarity to it"""
+    candidate_id: str
+    similarity: float
+
+
+def shingle_hashes(text: str, size: int = DEFAULT_SHINGLE_SIZE):
+    """Sorted unique 32-bit hashes of the lowercased word `size`-grams of `text`"""
+    import numpy as np
+
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    tokens = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    size = min(size, len(tokens))
+    # Polynomial hash of each window: sum of token * base**offset, wrapping at 2**64
+    hashes = np.zeros(len(tokens) - size + 1, dtype=np.uint64)
+    factor = 1
+    with np.errstate(over='ignore'):
+        for offset in range(size):
+            hashes = hashes + tokens[offset:len(tokens) - size + 1 + offset] * np.uint64(factor)
+            factor = (factor * SHINGLE_BASE) & MASK_64
+    return np.unique(hashes >> np.uint64(32))
+
+
+class MinHasher:
+    """
+    MinHash signatures from `num_perm` multiply-shift hash functions. The same
+    seed and parameters always give the same signatures.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        import numpy as np
+
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str):
+        """uint32 vector of length `num_perm`; None if the text has no words"""
+        import numpy as np
+
+        shingles = shingle_hashes(text, self.shingle_size)
+        if not len(shingles):
+            return None
+        with np.errstate(over='ignore'):
+            hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(first, second) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float((first == second).mean())
+
+
+class DuplicateIndex:
+    """
+    Persistent MinHash LSH index of candidate documents.
+
+    `bands` bands of `num_perm // bands` rows each: documents with similarity
+    s share some band with probability 1 - (1 - s**rows)**bands, which for the
+    defaults (16 x 8) is 0.95 at s = 0.8 and over 0.99 at s = 0.9. Parameters
+    are stored with the index and must match when it is reopened.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        threshold: float = DEFAULT_THRESHOLD,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self._lock = threading.Lock()
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path or ':memory:', check_same_thread=False)
+        self._db.executescript(
+            'PRAGMA journal_mode = WAL;'
+            'PRAGMA synchronous = NORMAL;'
+            'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'doc INTEGER PRIMARY KEY, candidate_id TEXT NOT NULL UNIQUE, signature BLOB NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'band_key INTEGER NOT NULL, doc INTEGER NOT NULL, PRIMARY KEY (band_key, doc)) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS links (doc_id TEXT PRIMARY KEY, candidate_id TEXT NOT NULL);'
+        )
+        self._check_params({'num_perm': num_perm, 'bands': bands, 'shingle_size': shingle_size, 'seed': seed})
+
+    def _check_params(self, params: dict):
+        stored = dict(self._db.execute('SELECT key, value FROM meta'))
+        expected = {key: str(value) for key, value in params.items()}
+        if not stored:
+            self._db.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', expected.items())
+            self._db.commit()
+        elif stored != expected:
+            raise ValueError(f"Duplicate index was built with {stored}, not {expected}")
+
+    def __len__(self) -> int:
+        """Number of candidates"""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    # --- Signatures ---------------------------------------------------------
+
+    def _signature(self, text_or_signature: Union[str, Any]):
+        if isinstance(text_or_signature, str):
+            return self.hasher.signature(text_or_signature)
+        return text_or_signature
+
+    def _band_keys(self, signature) -> List[int]:
+        """One signed 64-bit key per band, mixing in the band number"""
+        data = signature.tobytes()
+        width = 4 * self.rows
+        return [
+            int.from_bytes(
+                hashlib.blake2b(
+                    data[band * width:(band + 1) * width], digest_size=8, person=band.to_bytes(2, 'little'),
+                ).digest(),
+                'little', signed=True,
+            )
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _decode(blob: bytes):
+        import numpy as np
+
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    # --- Lookup -------------------------------------------------------------
+
+    def query(self, text_or_signature: Union[str, Any], threshold: Optional[float] = None,
+              limit: int = 5) -> List[Duplicate]:
+        """Candidates at or above `threshold` similarity, most similar first"""
+        signature = self._signature(text_or_signature)
+        if signature is None:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        keys = self._band_keys(signature)
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT candidate_id, signature FROM documents WHERE doc IN '
+                f"(SELECT doc FROM buckets WHERE band_key IN ({','.join('?' * len(keys))}))",
+                keys,
+            ).fetchall()
+        matches = [Duplicate(candidate_id, similarity(signature, self._decode(blob))) for candidate_id, blob in rows]
+        matches = [match for match in matches if match.similarity >= threshold]
+        matches.sort(key=lambda match: (-match.similarity, match.candidate_id))
+        return matches[:limit]
+
+    def candidate_of(self, doc_id: str) -> Optional[str]:
+        """The candidate a document belongs to: itself, the one it was linked to, or None if unseen"""
+        with self._lock:
+            row = self._db.execute('SELECT candidate_id FROM links WHERE doc_id = ?', (doc_id,)).fetchone()
+            if row is None:
+                row = self._db.execute('SELECT candidate_id FROM documents WHERE candidate_id = ?', (doc_id,)).fetchone()
+        return row[0] if row else None
+
+    # --- Updates ------------------------------------------------------------
+
+    def add(self, candidate_id: str, text_or_signature: Union[str, Any]) -> bool:
+        """Insert or replace a candidate; False if the text has no words"""
+        return self.add_many([(candidate_id, text_or_signature)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[str, Union[str, Any]]], batch_size: int = 10000) -> int:
+        """Insert or replace many candidates, committing every `batch_size`; returns the number added"""
+        added = 0
+        batch = []
+        for candidate_id, text_or_signature in items:
+            signature = self._signature(text_or_signature)
+            if signature is not None:
+                batch.append((candidate_id, signature))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, batch: List[Tuple[str, Any]]) -> int:
+        with self._lock:
+            for candidate_id, _ in batch:
+                self._delete(candidate_id)
+            for candidate_id, signature in batch:
+                doc = self._db.execute(
+                    'INSERT INTO documents (candidate_id, signature) VALUES (?, ?)',
+                    (candidate_id, signature.astype('<u4').tobytes()),
+                ).lastrowid
+                self._db.executemany(
+                    'INSERT OR IGNORE INTO buckets (band_key, doc) VALUES (?, ?)',
+                    [(key, doc) for key in self._band_keys(signature)],
+                )
+            self._db.commit()
+        return len(batch)
+
+    def resolve(self, doc_id: str, text_or_signature: Union[str, Any]) -> Optional[Duplicate]:
+        """
+        Link a document to the candidate it duplicates, or register it as a
+        new candidate. Returns the match, or None for a new (or empty) document.
+        """
+        signature = self._signature(text_or_signature)
+        if signature is None:
+            return None
+        matches = [match for match in self.query(signature) if match.candidate_id != doc_id]
+        if not matches:
+            self.add(doc_id, signature)
+            return None
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO links (doc_id, candidate_id) VALUES (?, ?)', (doc_id, matches[0].candidate_id),
+            )
+            self._db.commit()
+        logger.info(f"{doc_id} is a near-duplicate of {matches[0].candidate_id} "
+                    f"(similarity {matches[0].similarity:.2f})")
+        return matches[0]
+
+    def remove(self, candidate_id: str) -> bool:
+        """Drop a candidate and the links to it"""
+        with self._lock:
+            removed = self._delete(candidate_id)
+            self._db.execute('DELETE FROM links WHERE candidate_id = ? OR doc_id = ?', (candidate_id, candidate_id))
+            self._db.commit()
+        return removed
+
+    def _delete(self, candidate_id: str) -> bool:
+        row = self._db.execute(
+            'SELECT doc, signature FROM documents WHERE candidate_id = ?', (candidate_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        doc, blob = row
+        self._db.executemany(
+            'DELETE FROM buckets WHERE band_key = ? AND doc = ?',
+            [(key, doc) for key in self._band_keys(self._decode(blob))],
+        )
+        self._db.execute('DELETE FROM documents WHERE doc = ?', (doc,))
+        return True
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.parse_service as bapase
+
+Asyncio HTTP service that parses resumes in a bounded process pool, so the
+Streamlit app and other clients can share one backend. It uses only the
+standard library (a minimal HTTP/1.1 server on asyncio streams).
+
+Endpoints:
+
+- POST /parse                 raw file bytes in the body -> parsed resume JSON
+- POST /parse?async=1         same, but returns 202 and a job id immediately
+- POST /batch                 {"documents": [{"name": ..., "content": base64}]} -> 202 and a job id
+- GET  /jobs/<id>             job status and per-document results
+- GET  /health                pool and queue status
+
+At most `max_pending` documents are queued or running; requests beyond that
+get 429 with Retry-After, and 503 is returned while the service shuts down or
+its pool is being restarted. Up to `max_jobs` jobs are kept; the oldest
+finished ones are forgotten first, and a new job gets 503 while all of them
+are still unfinished. Each document has a timeout (504 for /parse). With
+--isolate, each worker also kills extraction at that timeout, so a stuck
+document frees its slot instead of pinning a worker; this runs extraction in
+a child process per worker, doubling the process count. Documents over the
+page, character or memory limits fail fast with 422.
+Parse endpoints are stateless, so instances can run behind a load balancer;
+job status is kept in the memory of the instance that accepted the job.
+
+Usage:
+
+python -m backend.parse_service [--host 127.0.0.1] [--port 8080] [--workers N]
+    [--max-pending 64] [--timeout 60] [--isolate] [--max-pages N] [--max-chars N] [--max-memory-mb N]
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import asyncio
+import logging
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import backend.batch_parser as babapa
+import backend.resource_guard as baregu
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity', 429: 'Too Many Requests',
+    500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout',
+}
+# Time allowed for a client to send the request line and headers
+HEADER_TIMEOUT = 10.0
+MAX_HEADERS = 100
+
+
+class HttpError(Exception):
+    """Turned into a JSON error response with `status`"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b''
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get('connection', '').lower() != 'close'
+
+
+@dataclass
+class Job:
+    """An asynchronous parse of one or more documents"""
+    id: str
+    documents: List[Dict[str, Any]]
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        states = {document['status'] for document in self.documents}
+        if states <= {'done', 'failed'}:
+            return 'failed' if states == {'failed'} else 'done'
+        return 'running' if states - {'queued'} else 'queued'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id, 'status': self.status, 'created': self.created, 'finished': self.finished,
+            'documents': self.documents,
+        }
+
+
+def _parse_document(data: bytes) -> Dict[str, Any]:
+    """Runs in a pool worker, with the parser built once by the pool initializer"""
+    return asdict(babapa.worker_parser().parse_resume(data))
+
+
+async def _read_request(reader: asyncio.StreamReader, max_body_bytes: int) -> Optional[Request]:
+    """Read one HTTP/1.1 request; None when the client closed the connection"""
+    line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADERS + 1):
+        line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Too many headers")
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HttpError(411, "Chunked bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > max_body_bytes:
+        raise HttpError(413, f"Body exceeds {max_body_bytes} bytes")
+    body = await reader.readexactly(length) if length else b''
+
+    url = urllib.parse.urlsplit(target)
+    query = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+    return Request(method=method.upper(), path=url.path, query=query, headers=headers, body=body)
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any,
+                    headers: Optional[Dict[str, str]] = None, keep_alive: bool = True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    lines = [
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+        'Content-Type: application/json; charset=utf-8',
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+
+class ParseService:
+    """
+    Parse scheduler plus HTTP front end.
+
+    A document holds one of `max_pending` slots from admission until its worker
+    finishes, even if the request has timed out; admission therefore reflects
+    real pool load. With `isolate`, and unless `parser_kwargs` sets its own
+    `limits`, text extraction is killed after `timeout` seconds so a worker is
+    never held much longer than that. Each worker then keeps an extraction
+    child process, so the service runs twice `workers` processes.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: int = 64,
+        timeout: float = 60.0,
+        max_body_bytes: int = 20 * 1024 * 1024,
+        max_batch: int = 100,
+        max_jobs: int = 1000,
+        parser_kwargs: Optional[Dict[str, Any]] = None,
+        isolate: bool = False,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.max_batch = max_batch
+        self.max_jobs = max_jobs
+        self.parser_kwargs = dict(parser_kwargs or {})
+        if isolate:
+            self.parser_kwargs.setdefault('limits', baregu.ResourceLimits(timeout=timeout))
+        self.pending = 0
+        self.closing = False
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks = set()
+        self._executor = self._new_executor()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=babapa.init_worker, initargs=(self.parser_kwargs,),
+        )
+
+    # --- Scheduling --------------------------------------------------------
+
+    def _admit(self, count: int):
+        """Reserve `count` slots or refuse with 503/429"""
+        if self.closing:
+            raise HttpError(503, "Service is shutting down", {'Retry-After': '5'})
+        if self.pending + count > self.max_pending:
+            raise HttpError(
+                429, f"Parse queue is full ({self.pending}/{self.max_pending} documents pending)",
+                {'Retry-After': '1'},
+            )
+        self.pending += count
+
+    def _release(self, _future=None):
+        self.pending -= 1
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        if broken is not self._executor:
+            return  # another request already replaced it
+        logger.error("Parse worker pool is broken; starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+
+    async def parse(self, data: bytes, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Parse one admitted document, raising HttpError on failure or timeout"""
+        executor = self._executor
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, _parse_document, data)
+        except BaseException as e:
+            # Nothing was submitted, so no done-callback will free the admitted slot
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._restart_pool(executor)
+                raise HttpError(503, "Parse workers are restarting", {'Retry-After': '1'})
+            if isinstance(e, RuntimeError):
+                # 'cannot schedule new futures after shutdown' while closing or replacing the pool
+                raise HttpError(503, f"Parse workers are unavailable: {e}", {'Retry-After': '1'})
+            raise
+        # The slot is freed when the worker finishes, not when the request gives up
+        future.add_done_callback(self._release)
+        try:
+            # shield: a timed-out request must not hide that its worker is still busy
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(504, f"Parsing did not finish within {timeout or self.timeout:g} s")
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            raise HttpError(503, "A parse worker crashed; retry the request", {'Retry-After': '1'})
+        except baregu.ExtractionTimeoutError as e:
+            raise HttpError(504, str(e))
+        except Exception as e:
+            raise HttpError(422, f"{type(e).__name__}: {e}")
+
+    def _make_room_for_job(self):
+        """Forget the oldest finished jobs so one more fits, or refuse with 503 if none have finished"""
+        if len(self._jobs) < self.max_jobs:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished is not None]:
+            del self._jobs[job_id]
+            if len(self._jobs) < self.max_jobs:
+                return
+        raise HttpError(503, f"Too many unfinished jobs ({len(self._jobs)}); retry later", {'Retry-After': '5'})
+
+    def _create_job(self, documents: List[Tuple[str, bytes]], timeout: float) -> Job:
+        """Start a job; the caller has made room for it and admitted its documents"""
+        job = Job(id=uuid.uuid4().hex, documents=[
+            {'name': name, 'status': 'queued', 'result': None, 'error': None} for name, _ in documents
+        ])
+        self._jobs[job.id] = job
+        for entry, (_, data) in zip(job.documents, documents):
+            task = asyncio.ensure_future(self._run_job_document(job, entry, data, timeout))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run_job_document(self, job: Job, entry: Dict[str, Any], data: bytes, timeout: float):
+        entry['status'] = 'running'
+        try:
+            entry['result'] = await self.parse(data, timeout)
+            entry['status'] = 'done'
+        except HttpError as e:
+            entry['status'], entry['error'] = 'failed', str(e)
+        if job.status in ('done', 'failed'):
+            job.finished = time.time()
+
+    # --- HTTP --------------------------------------------------------------
+
+    def _timeout_for(self, request: Request) -> float:
+        try:
+            requested = float(request.query.get('timeout', self.timeout))
+        except ValueError:
+            raise HttpError(400, "timeout must be a number of seconds")
+        return max(0.1, min(requested, self.timeout))
+
+    async def handle(self, request: Request) -> Tuple[int, Any, Dict[str, str]]:
+        """Route one request; returns (status, JSON payload, extra headers)"""
+        if request.path == '/health':
+            return 200, {
+                'status': 'closing' if self.closing else 'ok', 'workers': self.workers,
+                'pending': self.pending, 'max_pending': self.max_pending, 'jobs': len(self._jobs),
+            }, {}
+
+        if request.path == '/parse':
+            if request.method != 'POST':
+                raise HttpError(405, "Use POST")
+            if not request.body:
+                raise HttpError(400, "Send the resume file as the request body")
+            timeout = self._timeout_for(request)
+            run_async = request.query.get('async', '').lower() in ('1', 'true', 'yes')
+            if run_async:
+                self._make_room_for_job()
+            self._admit(1)
+            if run_async:
+                job = self._create_job([(request.query.get('name', 'document'), request.body)], timeout)
+                return 202, {'job_id': job.id, 'status_url': f"/jobs/{job.id}"}, {}
+            return 200, await self.parse(request.body, timeout), {}
+
+        if request.path == '/batch':
+            if request.method != 'POST':
+                raise HttpError(405, "Use POST")
+            documents = self._batch_documents(request.body)
+            timeout = self._timeout_for(request)
+            self._make_room_for_job()
+            self._admit(len(documents))
+            job = self._create_job(documents, timeout)
+            return 202, {'job_id': job.id, 'status_url': f"/jobs/{job.id}", 'documents': len(documents)}, {}
+
+        if request.path.startswith('/jobs/'):
+            job = self._jobs.get(request.path[len('/jobs/'):])
+            if job is None:
+                raise HttpError(404, "Unknown or expired job")
+            return 200, job.to_dict(), {}
+
+        raise HttpError(404, f"No route for {request.path}")
+
+    def _batch_documents(self, body: bytes) -> List[Tuple[str, bytes]]:
+        try:
+            items = json.loads(body)['documents']
+            documents = [
+                (item.get('name') or f"document_{number}", base64.b64decode(item['content'], validate=True))
+                for number, item in enumerate(items)
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise HttpError(400, 'Expected {"documents": [{"name": ..., "content": <base64>}, ...]}')
+        if not documents:
+            raise HttpError(400, "No documents in batch")
+        if len(documents) > self.max_batch:
+            raise HttpError(413, f"At most {self.max_batch} documents per batch")
+        return documents
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = None
+                try:
+                    request = await _read_request(reader, self.max_body_bytes)
+                    if request is None:
+                        break
+                    status, payload, headers = await self.handle(request)
+                    keep_alive = request.keep_alive
+                except HttpError as e:
+                    status, payload, headers = e.status, {'error': str(e)}, e.headers
+                    # A request that failed while being read may have unread body bytes
+                    keep_alive = request is not None and request.keep_alive
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception as e:
+                    logger.exception(f"Unhandled error serving request: {e}")
+                    status, payload, headers, keep_alive = 500, {'error': 'Internal server error'}, {}, False
+                _write_response(writer, status, payload, headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        logger.info(f"Parse service listening on {', '.join(str(s.getsockname()) for s in self._server.sockets)}")
+        return self._server
+
+    async def close(self, drain_timeout: float = 30.0):
+        """Stop accepting work, let running jobs finish (up to `drain_timeout`), then stop the pool"""
+        self.closing = True
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=drain_timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ParseClient:
+    """Small blocking client for the service, for the Streamlit app and scripts"""
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None) -> Dict[str, Any]:
+        request = urllib.request.Request(f"{self.base_url}{path}", data=body, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get('error', e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"Parse service returned {e.code}: {message}") from None
+
+    def parse(self, data: bytes) -> barepa.ResumeData:
+        return barepa.ResumeData(**self._request('POST', '/parse', bytes(data)))
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        return self._request('GET', f"/jobs/{job_id}")
+
+
+async def _serve(args: argparse.Namespace):
+    service = ParseService(
+        workers=args.workers, max_pending=args.max_pending, timeout=args.timeout, isolate=args.isolate,
+        parser_kwargs={
+            'pdf_engine': args.pdf_engine,
+            'nlp_model': args.nlp_model,
+            'limits': baregu.ResourceLimits(
+                timeout=args.timeout if args.isolate else None, max_pages=args.max_pages, max_chars=args.max_chars,
+                max_memory_bytes=args.max_memory_mb * 1024 * 1024 if args.max_memory_mb else None,
+            ),
+        },
+    )
+    server = await service.start(args.host, args.port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve resume parsing over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help='parse processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, default=64, help='documents queued or running before 429')
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-document timeout in seconds')
+    parser.add_argument('--isolate', action='store_true',
+                        help='kill extraction at --timeout; adds one child process per worker')
+    parser.add_argument('--pdf-engine', default='auto')
+    parser.add_argument('--max-pages', type=int, default=None, help='reject PDFs with more pages')
+    parser.add_argument('--max-chars', type=int, default=None, help='reject documents with more extracted text')
+    parser.add_argument('--max-memory-mb', type=int, default=None,
+                        help='address-space cap for each extraction process; isolates extraction like --isolate')
+    parser.add_argument('--nlp-model', default=None, help="spaCy entity pass: 'en' (blank + rules) or a model package")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
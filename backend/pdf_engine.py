@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.pdf_engine as bapden
+"""
+
+import time
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import backend.file_source as bafiso
+
+logger = logging.getLogger(__name__)
+
+PDF_ENGINES = ('fast', 'accurate', 'auto')
+
+# Quality thresholds for the cheap PyPDF2 text in 'auto' mode
+MIN_PAGE_CHARS = 20
+MAX_SINGLE_CHAR_TOKEN_RATIO = 0.4
+MAX_AVG_TOKEN_LENGTH = 20
+MAX_GLYPH_ERROR_RATIO = 0.02
+MIN_COLUMN_SHARE = 0.25
+# Gap in points between words on one line that starts a new run of text
+MIN_RUN_GAP = 12.0
+
+# Documents shorter than this are not worth splitting across processes
+MIN_PARALLEL_PAGES = 16
+
+
+@dataclass
+class PageExtraction:
+    """Text and bookkeeping for one extracted PDF page"""
+    page: int
+    engine: str
+    seconds: float
+    chars: int = 0
+    reason: Optional[str] = None  # why 'auto' re-extracted the page, if it did
+    text: str = ""
+
+
+def check_page_quality(text: str, x_starts: Optional[List[float]] = None, page_width: float = 0.0) -> Optional[str]:
+    """Return why cheap page text looks unreliable, or None if it looks fine"""
+    stripped = text.strip()
+    if len(stripped) < MIN_PAGE_CHARS:
+        return 'empty'
+
+    tokens = stripped.split()
+    single = sum(1 for token in tokens if len(token) == 1 and token.isalpha())
+    if single / len(tokens) > MAX_SINGLE_CHAR_TOKEN_RATIO:
+        return 'garbled'
+    if len(stripped) / len(tokens) > MAX_AVG_TOKEN_LENGTH:
+        return 'garbled'
+    glyph_errors = stripped.count('�') + stripped.count('(cid:')
+    if glyph_errors / len(stripped) > MAX_GLYPH_ERROR_RATIO:
+        return 'garbled'
+
+    if x_starts and looks_multi_column(x_starts, page_width):
+        return 'multi_column'
+
+    return None
+
+
+def looks_multi_column(x_starts: Sequence[float], page_width: float) -> bool:
+    """
+    Two columns show up as many text runs starting near the left margin and
+    many starting around the middle of the page
+    """
+    if not x_starts or page_width <= 0:
+        return False
+    left = sum(1 for x in x_starts if x < 0.3 * page_width)
+    middle = sum(1 for x in x_starts if 0.3 * page_width <= x < 0.7 * page_width)
+    return left / len(x_starts) >= MIN_COLUMN_SHARE and middle / len(x_starts) >= MIN_COLUMN_SHARE
+
+
+def _pypdf2_page(page, record_layout: bool):
+    """Extract one PyPDF2 page, optionally collecting where text runs start"""
+    if not record_layout:
+        return page.extract_text() or "", None, 0.0
+
+    x_starts = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        if text.strip():
+            x_starts.append(cm[0] * tm[4] + cm[2] * tm[5] + cm[4])
+
+    text = page.extract_text(visitor_text=visitor) or ""
+    return text, x_starts, float(page.mediabox.width)
+
+
+def _extract_pypdf2(
+    source: Union[str, bytes], check_quality: bool = False, page_numbers: Optional[Sequence[int]] = None
+) -> List[PageExtraction]:
+    import PyPDF2
+
+    pages = []
+    with bafiso.open_stream(source) as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        numbers = page_numbers or range(1, len(pdf_reader.pages) + 1)
+        for number in numbers:
+            start = time.perf_counter()
+            text, x_starts, width = _pypdf2_page(pdf_reader.pages[number - 1], check_quality)
+            result = PageExtraction(page=number, engine='pypdf2', seconds=0.0, chars=len(text), text=text)
+            if check_quality:
+                result.reason = check_page_quality(text, x_starts, width)
+            result.seconds = time.perf_counter() - start
+            pages.append(result)
+    return pages
+
+
+def _column_split(page) -> Optional[float]:
+    """
+    x position of the gutter between two text columns: the centre of the
+    widest band in the middle of the page that the fewest characters cross
+    """
+    width = float(page.width)
+    first, last = int(0.3 * width), int(0.7 * width)
+    crossing = [0] * (last - first)
+    for char in page.chars:
+        for x in range(max(int(char['x0']), first), min(int(char['x1']) + 1, last)):
+            crossing[x - first] += 1
+    if not crossing or not page.chars:
+        return None
+    fewest = min(crossing)
+    # Widest run of bins at the minimum
+    best_start, best_length, start = 0, 0, None
+    for offset, count in enumerate(crossing + [fewest + 1]):
+        if count == fewest and start is None:
+            start = offset
+        elif count != fewest and start is not None:
+            if offset - start > best_length:
+                best_start, best_length = start, offset - start
+            start = None
+    return first + best_start + best_length / 2
+
+
+def _run_starts(page) -> List[float]:
+    """x positions where runs of text start: line starts and words after a gap wider than MIN_RUN_GAP"""
+    starts = []
+    last_top, last_x1 = None, 0.0
+    for word in sorted(page.extract_words(), key=lambda word: (round(word['top']), word['x0'])):
+        if round(word['top']) != last_top or word['x0'] - last_x1 > MIN_RUN_GAP:
+            starts.append(word['x0'])
+        last_top, last_x1 = round(word['top']), word['x1']
+    return starts
+
+
+def _pdfplumber_page_text(page, columns: Optional[bool] = None) -> str:
+    """
+    Page text; with `columns`, each column is read top to bottom in turn.
+    None detects columns from where the lines start.
+    """
+    if columns is None:
+        columns = looks_multi_column(_run_starts(page), float(page.width))
+    if columns:
+        split = _column_split(page)
+        if split is not None:
+            halves = (
+                page.within_bbox((0, 0, split, page.height)),
+                page.within_bbox((split, 0, page.width, page.height)),
+            )
+            return '\n'.join(text for text in (half.extract_text() or "" for half in halves) if text)
+    return page.extract_text() or ""
+
+
+def _extract_pdfplumber(source: Union[str, bytes], page_numbers: Optional[Sequence[int]] = None,
+                        column_pages: Optional[Sequence[int]] = None) -> List[PageExtraction]:
+    """pdfplumber text of the given pages; `column_pages` are read by column, or None to detect columns"""
+    # pdfplumber pulls in pdfminer and Pillow, so only load it when a page needs it
+    import pdfplumber
+
+    pages = []
+    with bafiso.open_stream(source) as stream, pdfplumber.open(stream) as pdf:
+        numbers = page_numbers or range(1, len(pdf.pages) + 1)
+        for number in numbers:
+            start = time.perf_counter()
+            columns = None if column_pages is None else number in column_pages
+            text = _pdfplumber_page_text(pdf.pages[number - 1], columns)
+            pages.append(PageExtraction(
+                page=number, engine='pdfplumber', seconds=time.perf_counter() - start,
+                chars=len(text), text=text,
+            ))
+    return pages
+
+
+def count_pages(source: Union[str, bytes]) -> int:
+    import PyPDF2
+
+    with bafiso.open_stream(source) as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+_pools: Dict[int, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _page_pool(workers: int):
+    """Process pool reused across documents so long PDFs do not pay for spawning"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pools():
+    """
+    Shut down the page-range pools and their worker processes, cancelling
+    queued work; later documents start new pools. Runs at interpreter exit.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def extract_pdf_pages(source: Union[str, bytes], mode: str = 'auto', workers: int = 1) -> List[PageExtraction]:
+    """
+    Extract every page of a PDF with the engine strategy selected by `mode`.
+
+    'accurate' uses pdfplumber for all pages, 'fast' uses PyPDF2 for all
+    pages, and 'auto' uses PyPDF2 first and re-extracts with pdfplumber only
+    the pages that fail `check_page_quality`. Either engine falls back to the
+    other if it cannot open the file at all.
+
+    With `workers` > 1, documents of at least MIN_PARALLEL_PAGES pages are
+    split into contiguous page ranges extracted in worker processes, and the
+    pages are returned in document order.
+    """
+    if mode not in PDF_ENGINES:
+        raise ValueError(f"Unknown PDF engine mode: {mode}. Supported modes: {PDF_ENGINES}")
+
+    if workers > 1:
+        try:
+            total = count_pages(source)
+        except Exception:
+            total = 0  # let the serial path report the failure
+        if total >= MIN_PARALLEL_PAGES:
+            size = -(-total // workers)
+            ranges = [list(range(first, min(first + size, total + 1))) for first in range(1, total + 1, size)]
+            pool = _page_pool(workers)
+            futures = [pool.submit(_extract_range, source, mode, numbers) for numbers in ranges]
+            pages = []
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+
+    return _extract_range(source, mode)
+
+
+def iter_pdf_pages(source: Union[str, bytes], mode: str = 'auto', chunk_pages: int = 4) -> Iterator[List[PageExtraction]]:
+    """
+    Yield extracted pages progressively: the first page on its own, then
+    chunks of `chunk_pages` pages, so callers can show header fields early.
+    """
+    if mode not in PDF_ENGINES:
+        raise ValueError(f"Unknown PDF engine mode: {mode}. Supported modes: {PDF_ENGINES}")
+    try:
+        total = count_pages(source)
+    except Exception:
+        # Unreadable by PyPDF2; the full extraction path handles fallback and errors
+        yield _extract_range(source, mode)
+        return
+
+    first = 1
+    while first <= total:
+        last = 1 if first == 1 else min(first + chunk_pages - 1, total)
+        yield _extract_range(source, mode, list(range(first, last + 1)))
+        first = last + 1
+
+
+def _is_better(cheap: PageExtraction, retried: PageExtraction) -> bool:
+    """Whether re-extracted page text should replace the cheap text"""
+    if not retried.text.strip():
+        return not cheap.text.strip()
+    if check_page_quality(retried.text) is not None:
+        # Still empty or garbled: only worth it if the cheap text had nothing
+        return len(cheap.text.strip()) < MIN_PAGE_CHARS <= len(retried.text.strip())
+    return True
+
+
+def _extract_range(source: Union[str, bytes], mode: str, page_numbers: Optional[Sequence[int]] = None) -> List[PageExtraction]:
+    """Extract the given pages (all pages if None) with the engine strategy for `mode`"""
+    if mode == 'accurate':
+        engines = [
+            ('pdfplumber', lambda: _extract_pdfplumber(source, page_numbers)),
+            ('PyPDF2', lambda: _extract_pypdf2(source, page_numbers=page_numbers)),
+        ]
+    else:
+        engines = [
+            ('PyPDF2', lambda: _extract_pypdf2(source, mode == 'auto', page_numbers)),
+            ('pdfplumber', lambda: _extract_pdfplumber(source, page_numbers)),
+        ]
+
+    try:
+        pages = engines[0][1]()
+    except Exception as e:
+        logger.warning(f"{engines[0][0]} failed: {e}")
+        try:
+            return engines[1][1]()
+        except Exception as e:
+            logger.error(f"Both PDF extraction methods failed: {e}")
+            raise Exception(f"Could not extract text from PDF: {bafiso.describe(source)}")
+
+    if mode != 'auto':
+        return pages
+
+    retry = {position: page for position, page in enumerate(pages) if page.reason}
+    if not retry:
+        return pages
+    try:
+        better_pages = _extract_pdfplumber(
+            source, [page.page for page in retry.values()],
+            column_pages=[page.page for page in retry.values() if page.reason == 'multi_column'],
+        )
+        for position, better in zip(retry, better_pages):
+            cheap = retry[position]
+            better.reason = cheap.reason
+            better.seconds += cheap.seconds
+            if _is_better(cheap, better):
+                pages[position] = better
+    except Exception as e:
+        logger.warning(f"pdfplumber retry failed, keeping PyPDF2 text: {e}")
+    return pages
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.resource_guard as baregu
+
+Per-document resource limits for resume parsing. Size, page and character
+caps are checked in the calling process; a wall-clock timeout or memory cap
+moves text extraction into a long-lived child process that is killed (with
+anything it started) when a document overruns, so one bad upload costs at
+most `timeout` seconds and fails with a typed error.
+"""
+
+import os
+import signal
+import importlib
+import logging
+import threading
+import multiprocessing
+import multiprocessing.util
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
+
+import backend.file_source as bafiso
+import backend.pdf_engine as bapden
+
+logger = logging.getLogger(__name__)
+
+# Extraction result: text, file type and per-page PDF details
+Extraction = Tuple[str, str, List[bapden.PageExtraction]]
+
+# Seconds to wait for a killed or crashed child to be reaped
+KILL_GRACE_SECONDS = 1.0
+# Seconds a new child may take to import its libraries, outside any document's deadline
+STARTUP_TIMEOUT = 60.0
+# Imported by the child before it reports ready
+PRELOAD_MODULES = ('PyPDF2', 'pdfplumber')
+
+
+class ResourceLimitError(ValueError):
+    """A document exceeded one of the configured limits; `limit` names which"""
+    limit = 'resource'
+
+
+class FileTooLargeError(ResourceLimitError):
+    limit = 'file_bytes'
+
+
+class TooManyPagesError(ResourceLimitError):
+    limit = 'pages'
+
+
+class TextTooLongError(ResourceLimitError):
+    limit = 'chars'
+
+
+class ExtractionTimeoutError(ResourceLimitError):
+    limit = 'timeout'
+
+
+class ExtractionMemoryError(ResourceLimitError):
+    limit = 'memory'
+
+
+class ExtractionCrashedError(RuntimeError):
+    """The extraction process died without reporting a result"""
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Per-document caps; None disables a limit"""
+    timeout: Optional[float] = None  # wall-clock seconds for text extraction
+    max_pages: Optional[int] = None
+    max_file_bytes: Optional[int] = None
+    max_chars: Optional[int] = None  # extracted characters
+    max_memory_bytes: Optional[int] = None  # address space of the extraction process (POSIX only)
+
+    @property
+    def isolated(self) -> bool:
+        """Whether extraction has to run in a killable child process"""
+        return self.timeout is not None or self.max_memory_bytes is not None
+
+
+NO_LIMITS = ResourceLimits()
+
+
+def source_size(source: Union[str, bytes]) -> int:
+    return os.path.getsize(source) if bafiso.is_path(source) else len(source)
+
+
+def check_file_size(source: Union[str, bytes], limits: ResourceLimits):
+    if limits.max_file_bytes is None:
+        return
+    size = source_size(source)
+    if size > limits.max_file_bytes:
+        raise FileTooLargeError(
+            f"{bafiso.describe(source)} is {size} bytes; the limit is {limits.max_file_bytes}"
+        )
+
+
+def check_page_count(source: Union[str, bytes], limits: ResourceLimits):
+    """Read only the PDF page tree, so oversized documents fail before extraction"""
+    if limits.max_pages is None or bafiso.detect_format(source) != '.pdf':
+        return
+    pages = bapden.count_pages(source)
+    if pages > limits.max_pages:
+        raise TooManyPagesError(f"Document has {pages} pages; the limit is {limits.max_pages}")
+
+
+def check_text_length(text: str, limits: ResourceLimits):
+    if limits.max_chars is not None and len(text) > limits.max_chars:
+        raise TextTooLongError(
+            f"Extracted text has {len(text)} characters; the limit is {limits.max_chars}"
+        )
+
+
+def extract_checked(extract: Callable[[Union[str, bytes]], Extraction], source: Union[str, bytes],
+                    limits: ResourceLimits) -> Extraction:
+    """Run `extract` in this process, enforcing the page and character caps"""
+    check_page_count(source, limits)
+    try:
+        extraction = extract(source)
+    except MemoryError:
+        raise ExtractionMemoryError(f"Ran out of memory extracting {bafiso.describe(source)}") from None
+    check_text_length(extraction[0], limits)
+    return extraction
+
+
+# --- Child process ---------------------------------------------------------
+
+def _set_memory_limit(max_memory_bytes: Optional[int]):
+    if max_memory_bytes is None:
+        return
+    try:
+        import resource
+    except ImportError:
+        logger.warning("Memory limits are not supported on this platform; extraction is unbounded")
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+
+
+def _serve(conn, parent_conn, parser_kwargs: dict, limits: ResourceLimits):
+    """Child loop: extract each received source and send back the result or the error"""
+    # Drop the inherited parent end, so the pipe reports EOF once the parent is gone
+    parent_conn.close()
+    if hasattr(os, 'setpgrp'):
+        # Own process group, so a kill also reaches page-extraction workers
+        os.setpgrp()
+    _set_memory_limit(limits.max_memory_bytes)
+    import backend.resume_parser as barepa
+
+    parser = barepa.ResumeParser(**parser_kwargs)
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    conn.send(('ready', None))
+    while True:
+        try:
+            source = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ('ok', extract_checked(parser._extract, source, limits))
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception:
+            if reply[0] == 'ok':
+                raise
+            # Unpicklable exceptions are reported by type and message
+            conn.send(('error', ExtractionCrashedError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+def _kill(process):
+    """Stop a child and its process group"""
+    if process is None or not process.is_alive():
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups here, or the child has not called setpgrp yet
+        process.kill()
+    process.join(KILL_GRACE_SECONDS)
+
+
+class GuardedExtractor:
+    """
+    Text extraction in a reusable child process with a per-document deadline.
+
+    The child is started on first use and replaced after a timeout or crash;
+    documents are extracted one at a time.
+    """
+
+    def __init__(self, parser_kwargs: dict, limits: ResourceLimits):
+        self.parser_kwargs = parser_kwargs
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._finalizer = None
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        # Not a daemon: daemonic processes cannot start page-extraction pools
+        process = multiprocessing.Process(
+            target=_serve, args=(child_conn, parent_conn, self.parser_kwargs, self.limits), name='resume-extractor',
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        # Runs on garbage collection and, unlike weakref.finalize, also when a pool
+        # worker process exits, before multiprocessing joins its children
+        self._finalizer = multiprocessing.util.Finalize(self, _kill, args=(process,), exitpriority=10)
+        try:
+            ready = parent_conn.poll(STARTUP_TIMEOUT) and parent_conn.recv()[0] == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            raise self._died("failed to start")
+
+    def _died(self, what: str) -> Exception:
+        """Reap a dead child; under a memory cap, dying is taken to mean running out of memory"""
+        self._process.join(KILL_GRACE_SECONDS)
+        message = f"Extraction process {what} (exit code {self._process.exitcode})"
+        self._stop()
+        if self.limits.max_memory_bytes is not None:
+            return ExtractionMemoryError(f"{message} under a {self.limits.max_memory_bytes}-byte memory limit")
+        return ExtractionCrashedError(message)
+
+    def _stop(self):
+        if self._finalizer is not None:
+            self._finalizer()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = self._conn = self._finalizer = None
+
+    def extract(self, source: Union[str, bytes]) -> Extraction:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._stop()
+                self._start()
+            try:
+                self._conn.send(source)
+                ready = self._conn.poll(self.limits.timeout)
+                status, payload = self._conn.recv() if ready else (None, None)
+            except (EOFError, OSError):
+                raise self._died("died") from None
+            if status is None:
+                logger.warning(f"Extraction of {bafiso.describe(source)} exceeded {self.limits.timeout:g} s; killing it")
+                self._stop()
+                raise ExtractionTimeoutError(f"Text extraction did not finish within {self.limits.timeout:g} s")
+        if status == 'error':
+            raise payload
+        return payload
+
+    def close(self):
+        with self._lock:
+            self._stop()
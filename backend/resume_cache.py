@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.resume_cache as bareca
+"""
+
+import os
+import json
+import zlib
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Iterator, Optional, Tuple, Union
+
+import backend.file_source as bafiso
+import backend.near_duplicates as banedu
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content hash used to key cached parse results"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_source(source: bafiso.ResumeSource) -> str:
+    """Content hash of a path or an in-memory resume"""
+    source = bafiso.normalize(source)
+    return hash_file(source) if bafiso.is_path(source) else hash_bytes(source)
+
+
+def encode_resume(resume_data: barepa.ResumeData) -> bytes:
+    """Compressed JSON of a parse result, as stored on disk"""
+    return zlib.compress(json.dumps(asdict(resume_data), ensure_ascii=False).encode('utf-8'))
+
+
+def decode_resume(blob: bytes) -> barepa.ResumeData:
+    return barepa.ResumeData(**json.loads(zlib.decompress(blob).decode('utf-8')))
+
+
+class ResumeCache:
+    """
+    Two-tier cache of parse results keyed on file content and parser version.
+
+    The memory tier is an LRU of at most `max_items` entries. The optional disk
+    tier is a SQLite file holding at most `max_disk_bytes` of compressed
+    results; least recently used rows are evicted first.
+
+    With a `duplicates` index, a miss extracts text first; a near-duplicate of
+    an earlier document (same resume, trivial edits) is linked to that
+    candidate and its own result records the link in `duplicate_of`.
+    Progressive parsing is then not available, so `iter_parse` yields one
+    final result.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_items: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        duplicates: Optional[banedu.DuplicateIndex] = None,
+    ):
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.duplicates = duplicates
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS parse_cache ('
+                'key TEXT PRIMARY KEY, data BLOB NOT NULL, '
+                'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS parse_cache_accessed ON parse_cache (accessed)')
+            self._db.commit()
+
+    @staticmethod
+    def make_key(content_hash: str, parser: barepa.ResumeParser) -> str:
+        return f"{parser.fingerprint}:{content_hash}"
+
+    def get(self, key: str) -> Optional[barepa.ResumeData]:
+        """Return the cached result for `key`, or None"""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute('SELECT data FROM parse_cache WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    blob = row[0]
+                    self._db.execute('UPDATE parse_cache SET accessed = ? WHERE key = ?', (time.time(), key))
+                    self._db.commit()
+                    self._remember(key, blob)
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return decode_resume(blob)
+
+    def put(self, key: str, resume_data: barepa.ResumeData):
+        """Store a result in both tiers"""
+        blob = encode_resume(resume_data)
+        with self._lock:
+            self._remember(key, blob)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO parse_cache (key, data, size, accessed) VALUES (?, ?, ?, ?)',
+                    (key, blob, len(blob), time.time()),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def parse(self, parser: barepa.ResumeParser, file_path: bafiso.ResumeSource) -> barepa.ResumeData:
+        """Parse a path or in-memory resume with `parser`, reusing a cached result when possible"""
+        with parser.instrumentation.parse():
+            file_path = bafiso.normalize(file_path)
+            cached, key, content_hash = self._lookup(parser, file_path)
+            if cached is not None:
+                return cached
+            if self.duplicates is not None:
+                resume_data = self._parse_deduplicated(parser, file_path, content_hash)
+            else:
+                resume_data = parser.parse_resume(file_path)
+            self.put(key, resume_data)
+            return resume_data
+
+    def iter_parse(self, parser: barepa.ResumeParser, file_path: bafiso.ResumeSource) -> Iterator[barepa.ResumeData]:
+        """Progressive variant of `parse`; a cache hit yields the full result at once"""
+        with parser.instrumentation.parse():
+            file_path = bafiso.normalize(file_path)
+            cached, key, content_hash = self._lookup(parser, file_path)
+            if cached is not None:
+                yield cached
+                return
+            if self.duplicates is not None:
+                resume_data = self._parse_deduplicated(parser, file_path, content_hash)
+                self.put(key, resume_data)
+                yield resume_data
+                return
+            resume_data = None
+            for resume_data in parser.iter_parse_resume(file_path):
+                yield resume_data
+            self.put(key, resume_data)
+
+    def _lookup(self, parser: barepa.ResumeParser,
+                source: Union[str, bytes]) -> Tuple[Optional[barepa.ResumeData], str, str]:
+        """Return (cached result or None, cache key, content hash), recording the hit or miss"""
+        with parser.instrumentation.stage('cache_lookup'):
+            content_hash = hash_source(source)
+            key = self.make_key(content_hash, parser)
+            cached = self.get(key)
+        parser.instrumentation.count('cache', label='miss' if cached is None else 'hit')
+        if cached is not None:
+            logger.info(f"Parse cache hit for {bafiso.describe(source)}")
+        return cached, key, content_hash
+
+    def _parse_deduplicated(self, parser: barepa.ResumeParser, source: Union[str, bytes],
+                            content_hash: str) -> barepa.ResumeData:
+        """Extract text, link it to the candidate it near-duplicates, if any, and parse it"""
+        text, file_type, pages = parser.extract_document(source)
+        with parser.instrumentation.stage('dedup'):
+            duplicate = self.duplicates.resolve(content_hash, text)
+        parser.instrumentation.count('duplicate', label='linked' if duplicate is not None else 'new')
+        # Always this document's own fields; a near-duplicate can still differ in contact details
+        resume_data = parser.parse_extracted(text, file_type, pages)
+        if duplicate is not None:
+            resume_data.duplicate_of = duplicate.candidate_id
+            resume_data.duplicate_similarity = duplicate.similarity
+        return resume_data
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM parse_cache')
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, blob: bytes):
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = self._db.execute('SELECT key, size FROM parse_cache ORDER BY accessed')
+        stale = []
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM parse_cache WHERE key = ?', stale)
+        logger.info(f"Evicted {len(stale)} entries from parse cache")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.resume_export as bareex
+"""
+
+import os
+import csv
+import json
+import logging
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List
+
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+SCALAR_COLUMNS = ['name', 'email', 'phone', 'address', 'linkedin', 'github', 'portfolio', 'file_type']
+LIST_COLUMNS = ['skills', 'certifications', 'languages']
+COUNT_COLUMNS = ['education_count', 'experience_count', 'project_count']
+EDUCATION_KEYS = ['degree', 'institution', 'year']
+EXPERIENCE_KEYS = ['title', 'company', 'duration']
+
+
+def flat_columns(max_entries: int = 3) -> List[str]:
+    """Column order of `flatten_resume` rows"""
+    columns = SCALAR_COLUMNS + LIST_COLUMNS + COUNT_COLUMNS
+    for i in range(1, max_entries + 1):
+        columns += [f"education_{i}_{key}" for key in EDUCATION_KEYS]
+    for i in range(1, max_entries + 1):
+        columns += [f"experience_{i}_{key}" for key in EXPERIENCE_KEYS]
+    return columns
+
+
+def flatten_resume(resume_data: barepa.ResumeData, max_entries: int = 3) -> Dict[str, Any]:
+    """
+    One flat row per resume: list fields joined with ', ', and the first
+    `max_entries` education and experience entries spread over numbered columns.
+    """
+    row: Dict[str, Any] = {column: getattr(resume_data, column) for column in SCALAR_COLUMNS}
+    for column in LIST_COLUMNS:
+        row[column] = ', '.join(getattr(resume_data, column) or [])
+    row['education_count'] = len(resume_data.education)
+    row['experience_count'] = len(resume_data.experience)
+    row['project_count'] = len(resume_data.projects)
+    for prefix, entries, keys in (
+        ('education', resume_data.education, EDUCATION_KEYS),
+        ('experience', resume_data.experience, EXPERIENCE_KEYS),
+    ):
+        for i in range(max_entries):
+            entry = entries[i] if i < len(entries) else {}
+            for key in keys:
+                row[f"{prefix}_{i + 1}_{key}"] = entry.get(key)
+    return row
+
+
+class ResumeWriter:
+    """Base class for streaming writers; use as a context manager"""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.rows = 0
+
+    def write(self, resume_data: barepa.ResumeData):
+        raise NotImplementedError
+
+    def write_all(self, resumes: Iterable[barepa.ResumeData]) -> int:
+        """Write every resume from a (possibly lazy) iterable; return the count written"""
+        for resume_data in resumes:
+            self.write(resume_data)
+        return self.rows
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        logger.info(f"Wrote {self.rows} resumes to: {self.output_path}")
+
+
+class JsonlWriter(ResumeWriter):
+    """Append-only JSON Lines, one full (nested) resume per line"""
+
+    def __init__(self, output_path: str, include_raw_text: bool = True):
+        super().__init__(output_path)
+        self.include_raw_text = include_raw_text
+        self._file = open(output_path, 'a', encoding='utf-8')
+
+    def write(self, resume_data: barepa.ResumeData):
+        record = asdict(resume_data)
+        if not self.include_raw_text:
+            record.pop('raw_text', None)
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter(ResumeWriter):
+    """Flattened CSV, appended to and flushed every `chunk_size` rows"""
+
+    def __init__(self, output_path: str, max_entries: int = 3, chunk_size: int = 1000):
+        super().__init__(output_path)
+        self.max_entries = max_entries
+        self.chunk_size = chunk_size
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, 'a', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=flat_columns(max_entries))
+        if is_new:
+            self._writer.writeheader()
+
+    def write(self, resume_data: barepa.ResumeData):
+        self._writer.writerow(flatten_resume(resume_data, self.max_entries))
+        self.rows += 1
+        if self.rows % self.chunk_size == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowWriter(ResumeWriter):
+    """
+    Flattened columnar output via pyarrow: Parquet, or Arrow IPC for '.arrow'
+    and '.feather' paths. Rows are buffered and written every `chunk_size`
+    rows as one row group / record batch, so memory stays bounded.
+    """
+
+    def __init__(self, output_path: str, max_entries: int = 3, chunk_size: int = 10000):
+        super().__init__(output_path)
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            # Also raised when pyarrow is installed but broken, e.g. built against another numpy
+            raise ImportError(f"Parquet/Arrow export requires pyarrow (pip install 'interview-agent[parquet]'): {e}") from e
+        self._pa = pa
+        self.max_entries = max_entries
+        self.chunk_size = chunk_size
+        self.columns = flat_columns(max_entries)
+        self.schema = pa.schema([
+            (column, pa.int32() if column in COUNT_COLUMNS else pa.string()) for column in self.columns
+        ])
+        self._buffer: List[Dict[str, Any]] = []
+        if os.path.splitext(output_path)[1].lower() in ('.arrow', '.feather'):
+            self._writer = pa.ipc.new_file(output_path, self.schema)
+        else:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(output_path, self.schema)
+
+    def write(self, resume_data: barepa.ResumeData):
+        self._buffer.append(flatten_resume(resume_data, self.max_entries))
+        self.rows += 1
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        arrays = [
+            self._pa.array([row[column] for row in self._buffer], type=field.type)
+            for column, field in zip(self.columns, self.schema)
+        ]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {
+    '.jsonl': JsonlWriter,
+    '.csv': CsvWriter,
+    '.parquet': ArrowWriter,
+    '.arrow': ArrowWriter,
+    '.feather': ArrowWriter,
+}
+
+
+def open_writer(output_path: str, **kwargs) -> ResumeWriter:
+    """Writer chosen by the output file extension"""
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unsupported export format: {ext}. Supported formats: {list(WRITERS)}")
+    return WRITERS[ext](output_path, **kwargs)
+
+
+def export_resumes(resumes: Iterable[barepa.ResumeData], output_path: str, **kwargs) -> int:
+    """Stream resumes into a single file; the format follows the extension"""
+    with open_writer(output_path, **kwargs) as writer:
+        return writer.write_all(resumes)
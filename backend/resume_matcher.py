@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.resume_matcher as barema
+
+Rank parsed resumes against job descriptions with sparse matrix products.
+
+Resume vectors (TF-IDF over raw text, binary canonical skills, and estimated
+years of experience) are built once in a ResumeIndex and reused for every job
+description, so ranking a JD is one sparse matrix-vector product per signal
+plus a partial sort for the top k.
+"""
+
+import re
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+import backend.resume_parser as barepa
+import backend.skill_taxonomy as baskta
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOP_WORDS = frozenset((
+    'a an and are as at be by for from has have in is it its of on or that the to was were will with '
+    'we you your our their they this these those i me my he she his her not but if then so than '
+    'into over under about across per via etc using used use work worked working experience years year'
+).split())
+YEAR_PATTERN = re.compile(r'\b(19[5-9]\d|20\d{2})\b')
+CURRENT_PATTERN = re.compile(r'\b(present|current|now|today)\b')
+REQUIRED_YEARS_PATTERN = re.compile(r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years|yrs)', re.IGNORECASE)
+# Years of experience at which the score saturates when the JD states no requirement
+EXPERIENCE_SATURATION_YEARS = 10.0
+DEFAULT_WEIGHTS = {'text': 0.5, 'skills': 0.35, 'experience': 0.15}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, keeping 'c++', 'c#' and 'node.js' whole"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_counts(text: str) -> Counter:
+    """Token counts of `text`, stop words removed"""
+    counts = Counter(TOKEN_PATTERN.findall(text.lower()))
+    for word in STOP_WORDS.intersection(counts):
+        del counts[word]
+    return counts
+
+
+def experience_years(experience: Iterable[Dict[str, str]], current_year: Optional[int] = None) -> float:
+    """Years covered by the union of the experience entries' date ranges"""
+    current_year = current_year or time.localtime().tm_year
+    spans = []
+    for entry in experience:
+        duration = (entry.get('duration') or '').lower()
+        years = [int(year) for year in YEAR_PATTERN.findall(duration)]
+        if CURRENT_PATTERN.search(duration):
+            years.append(current_year)
+        if years:
+            spans.append((min(years), max(years)))
+
+    total, covered_until = 0, None
+    for start, end in sorted(spans):
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            total += end - start
+            covered_until = end
+    return float(total)
+
+
+def required_years(job_description: str) -> Optional[float]:
+    """Smallest 'N years' / 'N+ yrs' requirement stated in a JD, if any"""
+    found = [int(years) for years in REQUIRED_YEARS_PATTERN.findall(job_description)]
+    found = [years for years in found if 0 < years <= 40]
+    return float(min(found)) if found else None
+
+
+@dataclass
+class Match:
+    """One ranked candidate; `index` is the resume's position in the ResumeIndex"""
+    index: int
+    score: float
+    text_score: float
+    skill_score: float
+    experience_score: float
+    matched_skills: List[str] = field(default_factory=list)
+
+
+class ResumeIndex:
+    """
+    Precomputed resume vectors for bulk scoring against job descriptions.
+
+    The vocabulary and IDF weights come from the resumes, so JD terms no
+    resume uses are ignored. CompactResume items are accepted as well as
+    ResumeData.
+    """
+
+    def __init__(
+        self,
+        resumes: Iterable[barepa.ResumeData],
+        skill_index: Optional[baskta.SkillIndex] = None,
+        min_df: int = 1,
+        current_year: Optional[int] = None,
+    ):
+        self.skill_index = skill_index or baskta.default_index()
+        self.current_year = current_year or time.localtime().tm_year
+        self.vocabulary: Dict[str, int] = {}
+        self.skills: Dict[str, int] = {}
+
+        term_rows: List[Counter] = []
+        skill_rows: List[List[str]] = []
+        years: List[float] = []
+        for resume in resumes:
+            if hasattr(resume, 'to_resume'):
+                resume = resume.to_resume()
+            term_rows.append(term_counts(resume.raw_text or ''))
+            skill_rows.append(resume.skills)
+            years.append(experience_years(resume.experience, self.current_year))
+
+        document_frequency: Counter = Counter()
+        for counts in term_rows:
+            document_frequency.update(counts.keys())
+        for term, df in document_frequency.items():
+            if df >= min_df:
+                self.vocabulary[term] = len(self.vocabulary)
+        n = len(term_rows)
+        self.idf = np.ones(len(self.vocabulary), dtype=np.float32)
+        for term, column in self.vocabulary.items():
+            # Smoothed IDF, as in scikit-learn
+            self.idf[column] = math.log((1 + n) / (1 + document_frequency[term])) + 1
+
+        self.text_matrix = self._tfidf_rows(term_rows)
+        self.skill_matrix = self._skill_rows(skill_rows)
+        self.skill_names = list(self.skills)
+        self.years = np.asarray(years, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.text_matrix.shape[0]
+
+    def save(self, path: str):
+        """Write the precomputed vectors to an .npz file for reuse in other processes"""
+        np.savez(
+            path,
+            text_data=self.text_matrix.data, text_indices=self.text_matrix.indices,
+            text_indptr=self.text_matrix.indptr, text_shape=np.asarray(self.text_matrix.shape),
+            skill_indices=self.skill_matrix.indices, skill_indptr=self.skill_matrix.indptr,
+            skill_shape=np.asarray(self.skill_matrix.shape),
+            vocabulary=np.asarray(list(self.vocabulary), dtype=str),
+            skill_names=np.asarray(self.skill_names, dtype=str),
+            idf=self.idf, years=self.years, current_year=np.asarray(self.current_year),
+        )
+
+    @classmethod
+    def load(cls, path: str, skill_index: Optional[baskta.SkillIndex] = None) -> 'ResumeIndex':
+        """Read vectors written by `save`; use the same skill taxonomy they were built with"""
+        with np.load(path, allow_pickle=False) as data:
+            index = cls.__new__(cls)
+            index.skill_index = skill_index or baskta.default_index()
+            index.current_year = int(data['current_year'])
+            index.vocabulary = {term: column for column, term in enumerate(data['vocabulary'].tolist())}
+            index.skill_names = data['skill_names'].tolist()
+            index.skills = {skill: column for column, skill in enumerate(index.skill_names)}
+            index.idf = data['idf']
+            index.years = data['years']
+            index.text_matrix = sp.csr_matrix(
+                (data['text_data'], data['text_indices'], data['text_indptr']), shape=tuple(data['text_shape']),
+            )
+            indices = data['skill_indices']
+            index.skill_matrix = sp.csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, data['skill_indptr']),
+                shape=tuple(data['skill_shape']),
+            )
+        return index
+
+    def _tfidf_rows(self, term_rows: Sequence[Counter]) -> sp.csr_matrix:
+        """L2-normalized sublinear TF-IDF rows over the fitted vocabulary"""
+        indptr, indices, data = [0], [], []
+        for counts in term_rows:
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append(1.0 + math.log(count))
+            indptr.append(len(indices))
+        matrix = sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(term_rows), len(self.vocabulary)),
+        )
+        matrix = matrix @ sp.diags(self.idf)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sp.csr_matrix(sp.diags(1 / norms) @ matrix, dtype=np.float32)
+
+    def _skill_rows(self, skill_rows: Sequence[List[str]]) -> sp.csr_matrix:
+        indptr, indices = [0], []
+        for skills in skill_rows:
+            for skill in set(skills):
+                column = self.skills.get(skill)
+                if column is None:
+                    column = self.skills[skill] = len(self.skills)
+                indices.append(column)
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(skill_rows), len(self.skills)),
+        )
+
+    def _matched_skills(self, row: int, columns: set) -> List[str]:
+        start, end = self.skill_matrix.indptr[row], self.skill_matrix.indptr[row + 1]
+        return sorted(self.skill_names[column] for column in self.skill_matrix.indices[start:end] if column in columns)
+
+    def score_all(
+        self,
+        job_descriptions: Sequence[str],
+        weights: Optional[Dict[str, float]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[List[str]]]:
+        """
+        Score every resume against every JD. Returns (total, text, skills,
+        experience) matrices of shape (resumes, JDs), plus each JD's skills.
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        queries = self._tfidf_rows([term_counts(jd) for jd in job_descriptions])
+        text = (self.text_matrix @ queries.T).toarray()
+
+        jd_skills = [self.skill_index.find_all(jd) for jd in job_descriptions]
+        indptr, indices = [0], []
+        for skills in jd_skills:
+            indices.extend(self.skills[skill] for skill in skills if skill in self.skills)
+            indptr.append(len(indices))
+        skill_queries = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(job_descriptions), len(self.skills)),
+        )
+        # Fraction of each JD's skills the resume has; JDs naming no skills score 0
+        wanted = np.array([max(len(skills), 1) for skills in jd_skills], dtype=np.float32)
+        overlap = (self.skill_matrix @ skill_queries.T).toarray() / wanted
+
+        targets = np.array(
+            [required_years(jd) or EXPERIENCE_SATURATION_YEARS for jd in job_descriptions], dtype=np.float32,
+        )
+        experience = np.minimum(self.years[:, None] / targets[None, :], 1.0)
+
+        total = weights['text'] * text + weights['skills'] * overlap + weights['experience'] * experience
+        return total, text, overlap, experience, jd_skills
+
+    def rank(
+        self,
+        job_description: str,
+        top_k: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> List[Match]:
+        """Top `top_k` resumes for one JD, best first"""
+        return self.rank_many([job_description], top_k, weights)[0]
+
+    def rank_many(
+        self,
+        job_descriptions: Sequence[str],
+        top_k: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> List[List[Match]]:
+        """Top `top_k` resumes for each JD, scored in one batch"""
+        if not len(self) or not job_descriptions:
+            return [[] for _ in job_descriptions]
+        total, text, overlap, experience, jd_skills = self.score_all(job_descriptions, weights)
+        k = min(top_k, len(self))
+        results = []
+        for column, wanted in enumerate(jd_skills):
+            scores = total[:, column]
+            top = np.argpartition(-scores, k - 1)[:k]
+            # Best first; ties keep index order so rankings are deterministic
+            top = top[np.lexsort((top, -scores[top]))]
+            wanted_columns = {self.skills[skill] for skill in wanted if skill in self.skills}
+            results.append([
+                Match(
+                    index=int(row),
+                    score=float(scores[row]),
+                    text_score=float(text[row, column]),
+                    skill_score=float(overlap[row, column]),
+                    experience_score=float(experience[row, column]),
+                    matched_skills=self._matched_skills(row, wanted_columns),
+                )
+                for row in top
+            ])
+        return results
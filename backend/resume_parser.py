@@ -7,31 +7,74 @@ import backend.resume_parser as barepa
 
 import re
 import os
+import contextlib
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
-import pandas as pd
-import pdfplumber
-import PyPDF2
-import nltk
-from dataclasses import dataclass, asdict
-# Add docx support
-from docx import Document
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict, replace
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+import backend.docx_stream as badost
+import backend.entity_extractor as baenex
+import backend.file_source as bafiso
+import backend.instrumentation as bainst
+import backend.pdf_engine as bapden
+import backend.resource_guard as baregu
+import backend.section_index as basein
+import backend.skill_taxonomy as baskta
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction logic changes in a way that alters parse results
+PARSER_VERSION = "8"
+
+# Contact patterns, compiled once. Phone patterns are tried in priority order.
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'),
+    re.compile(r'\b\d{10}\b'),
+    re.compile(r'\(\d{3}\)\s*\d{3}-\d{4}'),
+    re.compile(r'\d{3}-\d{3}-\d{4}'),
+]
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'github\.com/[\w-]+', re.IGNORECASE)
+PORTFOLIO_PATTERN = re.compile(r'https?://(?:www\.)?[\w.-]+\.[\w]{2,}')
+EXCLUDED_PORTFOLIO_DOMAINS = ['linkedin.com', 'github.com', 'facebook.com', 'twitter.com']
+
+# Contact details sit in the first lines of almost every resume; search there first
+CONTACT_HEADER_CHARS = 1000
+# Look this far past the header cut so a match starting in the header is seen whole
+CONTACT_HEADER_SLACK = 64
+
+
+def _contact_header_end(text: str) -> int:
+    """End of the header region, cut at a line break; the full length if there is none"""
+    if len(text) <= CONTACT_HEADER_CHARS:
+        return len(text)
+    cut = text.rfind('\n', 0, CONTACT_HEADER_CHARS)
+    return cut if cut > 0 else len(text)
+
+
+def _iter_contact_matches(pattern: re.Pattern, text: str, header_end: int) -> Iterator[re.Match]:
+    """
+    Yield matches in text order, scanning only the header window first.
+    
+    A header hit is only trusted if it starts before the cut and ends inside the
+    window, so results equal a full-text scan; the rest of the text is scanned
+    only when the header has nothing usable.
+    """
+    scanned_to = 0
+    if header_end < len(text):
+        window_end = header_end + CONTACT_HEADER_SLACK
+        for match in pattern.finditer(text, 0, window_end):
+            if match.start() >= header_end or match.end() >= window_end:
+                break
+            scanned_to = match.end()
+            yield match
+    for match in pattern.finditer(text, scanned_to):
+        yield match
+
 
 @dataclass
 class ResumeData:
@@ -51,6 +94,10 @@ class ResumeData:
     languages: List[str] = None
     raw_text: str = ""
     file_type: str = ""  # Add file type tracking
+    page_stats: List[Dict[str, Any]] = None  # Per-page PDF engine choice and timing
+    # Content hash of the earlier candidate this resume near-duplicates, and the estimated similarity
+    duplicate_of: Optional[str] = None
+    duplicate_similarity: Optional[float] = None
     
     def __post_init__(self):
         if self.skills is None:
@@ -65,111 +112,112 @@ class ResumeData:
             self.certifications = []
         if self.languages is None:
             self.languages = []
+        if self.page_stats is None:
+            self.page_stats = []
 
 
 class ResumeParser:
     """A comprehensive resume parser for PDF and DOCX files"""
     
-    def __init__(self):
-        self.supported_formats = ['.pdf', '.docx', '.doc']
-        self.skills_keywords = [
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php',
-            'swift', 'kotlin', 'go', 'rust', 'scala', 'r', 'matlab', 'sql',
-            
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django',
-            'flask', 'spring', 'laravel', 'bootstrap', 'jquery', 'webpack',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'cassandra',
-            'elasticsearch', 'dynamodb',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-            'gitlab', 'terraform', 'ansible', 'chef', 'puppet',
-            
-            # Data Science & ML
-            'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras',
-            'matplotlib', 'seaborn', 'plotly', 'jupyter', 'spark', 'hadoop',
-            
-            # Other Technologies
-            'linux', 'unix', 'windows', 'macos', 'api', 'rest', 'graphql', 'microservices',
-            'agile', 'scrum', 'kanban', 'jira', 'confluence'
-        ]
+    def __init__(
+        self,
+        pdf_engine: str = 'auto',
+        page_workers: int = 1,
+        instrumentation: Optional[bainst.Instrumentation] = None,
+        skill_taxonomy: Optional[str] = None,
+        limits: Optional[baregu.ResourceLimits] = None,
+        nlp_model: Optional[str] = None,
+        nlp_patterns: Optional[str] = None,
+    ):
+        if pdf_engine not in bapden.PDF_ENGINES:
+            raise ValueError(f"Unknown PDF engine mode: {pdf_engine}. Supported modes: {bapden.PDF_ENGINES}")
+        self.pdf_engine = pdf_engine
+        # Worker processes for splitting long PDFs into page ranges
+        self.page_workers = page_workers
+        # Per-stage timing and counters; the default records nothing
+        self.instrumentation = instrumentation or bainst.NULL_INSTRUMENTATION
+        self.supported_formats = ['.pdf', '.docx']
+        # Per-document caps; a timeout or memory cap runs extraction in a killable child process
+        self.limits = limits or baregu.NO_LIMITS
+        self._guard = (
+            baregu.GuardedExtractor({'pdf_engine': pdf_engine, 'page_workers': page_workers}, self.limits)
+            if self.limits.isolated else None
+        )
+        # Canonical skills and aliases, compiled once per process and shared by every parser
+        self.skill_index = (
+            baskta.load_index(skill_taxonomy) if skill_taxonomy else baskta.default_index()
+        )
+        # Optional spaCy pass for name, organizations and dates; the pipeline loads on first use
+        self.entities = baenex.EntityExtractor(nlp_model, nlp_patterns) if nlp_model else None
         
         self.degree_keywords = [
             'bachelor', 'master', 'phd', 'doctorate', 'associate', 'diploma',
             'b.s.', 'b.a.', 'm.s.', 'm.a.', 'b.tech', 'm.tech', 'mba', 'md'
         ]
     
-    def extract_text_from_docx(self, docx_path: str) -> str:
-        """Extract text from DOCX file"""
+    @property
+    def fingerprint(self) -> str:
+        """Identify the parser version, skill taxonomy and keyword lists, for cache keys"""
+        digest = hashlib.sha256(f"{PARSER_VERSION}:{self.pdf_engine}:{self.skill_index.digest}".encode())
+        for keyword in self.degree_keywords:
+            digest.update(b'\0' + keyword.encode())
+        if self.entities is not None:
+            digest.update(f"\0nlp:{self.entities.fingerprint}".encode())
+        return digest.hexdigest()[:16]
+    
+    def extract_text_from_docx(self, docx_path: bafiso.ResumeSource) -> str:
+        """Extract paragraph and table text from a DOCX file, in document order"""
+        docx_path = bafiso.normalize(docx_path)
         try:
-            doc = Document(docx_path)
-            text = []
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text.append(cell.text)
-            
-            full_text = '\n'.join(text)
-            logger.info(f"Successfully extracted text from DOCX: {docx_path}")
-            return full_text.strip()
+            full_text = badost.extract_docx_text(docx_path)
+            logger.info(f"Successfully extracted text from DOCX: {bafiso.describe(docx_path)}")
+            return full_text
             
+        except ValueError:
+            raise
         except Exception as e:
-            logger.error(f"Error extracting text from DOCX {docx_path}: {e}")
-            raise Exception(f"Could not extract text from DOCX: {docx_path}")
+            logger.error(f"Error extracting text from DOCX {bafiso.describe(docx_path)}: {e}")
+            raise Exception(f"Could not extract text from DOCX: {bafiso.describe(docx_path)}")
+    
+    def extract_pdf_pages(self, pdf_path: bafiso.ResumeSource) -> List[bapden.PageExtraction]:
+        """Extract PDF text page by page using the configured engine mode"""
+        pdf_path = bafiso.normalize(pdf_path)
+        pages = bapden.extract_pdf_pages(pdf_path, self.pdf_engine, self.page_workers)
+        engines = sorted({page.engine for page in pages})
+        logger.info(f"Successfully extracted text using {', '.join(engines) or 'no engine'} from {bafiso.describe(pdf_path)}")
+        return pages
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: bafiso.ResumeSource) -> str:
         """Extract text from PDF using multiple methods for better accuracy"""
-        text = ""
-        
-        # Method 1: Try pdfplumber first (better for complex layouts)
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            logger.info(f"Successfully extracted text using pdfplumber from {pdf_path}")
-        except Exception as e:
-            logger.warning(f"pdfplumber failed: {e}")
-            
-            # Method 2: Fallback to PyPDF2
-            try:
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                logger.info(f"Successfully extracted text using PyPDF2 from {pdf_path}")
-            except Exception as e:
-                logger.error(f"Both PDF extraction methods failed: {e}")
-                raise Exception(f"Could not extract text from PDF: {pdf_path}")
-        
-        return text.strip()
+        return self._join_pages(self.extract_pdf_pages(pdf_path))
+    
+    @staticmethod
+    def _join_pages(pages: List[bapden.PageExtraction]) -> str:
+        return '\n'.join(page.text for page in pages if page.text).strip()
     
-    def extract_text_from_file(self, file_path: str) -> tuple[str, str]:
-        """Extract text from supported file formats"""
-        file_ext = os.path.splitext(file_path)[1].lower()
+    def _extract(self, file_path: Union[str, bytes]) -> Tuple[str, str, List[bapden.PageExtraction]]:
+        """Extract text, file type and per-page PDF details"""
+        file_ext = bafiso.detect_format(file_path)
         
         if file_ext == '.pdf':
-            return self.extract_text_from_pdf(file_path), 'pdf'
-        elif file_ext in ['.docx', '.doc']:
-            return self.extract_text_from_docx(file_path), 'docx'
+            pages = self.extract_pdf_pages(file_path)
+            return self._join_pages(pages), 'pdf', pages
+        elif file_ext == '.docx':
+            return self.extract_text_from_docx(file_path), 'docx', []
         else:
             raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {self.supported_formats}")
     
+    def extract_text_from_file(self, file_path: bafiso.ResumeSource) -> tuple[str, str]:
+        """Extract text from supported file formats, given a path or the file's bytes"""
+        text, file_type, _ = self._extract(bafiso.normalize(file_path))
+        return text, file_type
+    
+    def _extract_limited(self, file_path: Union[str, bytes]) -> Tuple[str, str, List[bapden.PageExtraction]]:
+        """`_extract` under the configured limits, in the guard process if there is one"""
+        if self._guard is not None:
+            return self._guard.extract(file_path)
+        return baregu.extract_checked(self._extract, file_path, self.limits)
+    
     def extract_contact_info(self, text: str) -> Dict[str, Optional[str]]:
         """Extract contact information from text"""
         contact_info = {
@@ -179,212 +227,390 @@ class ResumeParser:
             'github': None,
             'portfolio': None
         }
+        header_end = _contact_header_end(text)
         
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
-        
-        # Phone number extraction
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
-            r'\b\d{10}\b',
-            r'\(\d{3}\)\s*\d{3}-\d{4}',
-            r'\d{3}-\d{3}-\d{4}'
-        ]
+        def first(pattern):
+            return next(_iter_contact_matches(pattern, text, header_end), None)
         
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                if isinstance(phones[0], tuple):
-                    contact_info['phone'] = ''.join(phones[0])
-                else:
-                    contact_info['phone'] = phones[0]
+        # Email extraction
+        match = first(EMAIL_PATTERN)
+        if match:
+            contact_info['email'] = match.group()
+        
+        # Phone number extraction: the first pattern with any hit wins
+        for pattern in PHONE_PATTERNS:
+            match = first(pattern)
+            if match:
+                contact_info['phone'] = ''.join(match.groups()) if pattern.groups else match.group()
                 break
         
         # LinkedIn extraction
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin_matches = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        if linkedin_matches:
-            contact_info['linkedin'] = linkedin_matches[0]
+        match = first(LINKEDIN_PATTERN)
+        if match:
+            contact_info['linkedin'] = match.group()
         
         # GitHub extraction
-        github_pattern = r'github\.com/[\w-]+'
-        github_matches = re.findall(github_pattern, text, re.IGNORECASE)
-        if github_matches:
-            contact_info['github'] = github_matches[0]
-        
-        # Portfolio/Website extraction
-        portfolio_pattern = r'https?://(?:www\.)?[\w.-]+\.[\w]{2,}'
-        portfolio_matches = re.findall(portfolio_pattern, text)
-        # Filter out common social media sites
-        excluded_domains = ['linkedin.com', 'github.com', 'facebook.com', 'twitter.com']
-        for match in portfolio_matches:
-            if not any(domain in match for domain in excluded_domains):
-                contact_info['portfolio'] = match
+        match = first(GITHUB_PATTERN)
+        if match:
+            contact_info['github'] = match.group()
+        
+        # Portfolio/Website extraction, skipping common social media sites
+        for match in _iter_contact_matches(PORTFOLIO_PATTERN, text, header_end):
+            url = match.group()
+            if not any(domain in url for domain in EXCLUDED_PORTFOLIO_DOMAINS):
+                contact_info['portfolio'] = url
                 break
         
         return contact_info
     
-    def extract_name(self, text: str) -> Optional[str]:
+    def extract_name(self, text: str, index: Optional[basein.SectionIndex] = None) -> Optional[str]:
         """Extract name from resume text"""
-        lines = text.split('\n')
+        index = index or basein.SectionIndex(text)
+        exclude_words = ['resume', 'cv', 'curriculum', 'vitae', 'contact', 'phone', 'email']
         
         # Try to get name from first few lines
-        for line in lines[:5]:
-            line = line.strip()
+        for line, line_lower in zip(index.lines[:5], index.lower[:5]):
             if len(line.split()) >= 2 and len(line.split()) <= 4:
                 # Check if line looks like a name (no numbers, not too long)
                 if not re.search(r'\d', line) and len(line) < 50:
                     # Exclude common header words
-                    exclude_words = ['resume', 'cv', 'curriculum', 'vitae', 'contact', 'phone', 'email']
-                    if not any(word.lower() in line.lower() for word in exclude_words):
-                        return line.strip()
+                    if not any(word in line_lower for word in exclude_words):
+                        return line
         
         return None
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skills_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill.title())
-        
-        # Remove duplicates and sort
-        return sorted(list(set(found_skills)))
+        # Single pass over the text, word-bounded; aliases map to canonical names
+        return sorted(self.skill_index.find_all(text))
     
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
+    def extract_education(self, text: str, index: Optional[basein.SectionIndex] = None) -> List[Dict[str, str]]:
         """Extract education information"""
+        index = index or basein.SectionIndex(text)
         education = []
-        lines = text.split('\n')
-        
-        education_section = False
         current_edu = {}
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if we're in education section
-            if any(keyword in line_lower for keyword in ['education', 'academic', 'qualification']):
-                education_section = True
-                continue
+        for i in index.section_lines('education'):
+            line, line_lower = index.lines[i], index.lower[i]
             
-            # Stop if we hit another section
-            if education_section and any(keyword in line_lower for keyword in ['experience', 'work', 'employment', 'project', 'skill']):
+            # Look for degree patterns
+            has_degree = any(degree in line_lower for degree in self.degree_keywords)
+            if has_degree:
                 if current_edu:
                     education.append(current_edu)
-                break
+                current_edu = {'degree': line}
             
-            if education_section and line.strip():
-                # Look for degree patterns
-                for degree in self.degree_keywords:
-                    if degree in line_lower:
-                        if current_edu:
-                            education.append(current_edu)
-                        current_edu = {'degree': line.strip()}
-                        break
-                
-                # Look for years
-                year_match = re.search(r'(19|20)\d{2}', line)
-                if year_match and 'degree' in current_edu:
-                    current_edu['year'] = year_match.group()
-                
-                # Look for institution names (lines that don't contain degree keywords)
-                if 'degree' in current_edu and 'institution' not in current_edu:
-                    if not any(degree in line_lower for degree in self.degree_keywords):
-                        if len(line.strip()) > 3:
-                            current_edu['institution'] = line.strip()
+            # Look for years
+            year_match = re.search(r'(19|20)\d{2}', line)
+            if year_match and 'degree' in current_edu:
+                current_edu['year'] = year_match.group()
+            
+            # Look for institution names (lines that don't contain degree keywords)
+            if 'degree' in current_edu and 'institution' not in current_edu:
+                if not has_degree and len(line) > 3:
+                    current_edu['institution'] = line
         
         if current_edu:
             education.append(current_edu)
         
         return education
     
-    def extract_experience(self, text: str) -> List[Dict[str, str]]:
+    def extract_experience(self, text: str, index: Optional[basein.SectionIndex] = None) -> List[Dict[str, str]]:
         """Extract work experience information"""
+        index = index or basein.SectionIndex(text)
         experience = []
-        lines = text.split('\n')
-        
-        experience_section = False
         current_exp = {}
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if we're in experience section
-            if any(keyword in line_lower for keyword in ['experience', 'work', 'employment', 'career']):
-                experience_section = True
-                continue
+        for i in index.section_lines('experience'):
+            line, line_lower = index.lines[i], index.lower[i]
             
-            # Stop if we hit another section
-            if experience_section and any(keyword in line_lower for keyword in ['education', 'project', 'skill', 'certification']):
-                if current_exp:
-                    experience.append(current_exp)
-                break
-            
-            if experience_section and line.strip():
-                # Look for job titles and companies
-                if len(line.strip()) > 3:
-                    if not current_exp:
-                        current_exp = {'title': line.strip()}
-                    elif 'title' in current_exp and 'company' not in current_exp:
-                        current_exp['company'] = line.strip()
-                    elif 'title' in current_exp and 'company' in current_exp:
-                        # Look for dates
-                        date_match = re.search(r'(19|20)\d{2}.*?(19|20)\d{2}|present', line_lower)
-                        if date_match:
-                            current_exp['duration'] = line.strip()
-                            experience.append(current_exp)
-                            current_exp = {}
+            # Look for job titles and companies
+            if len(line) > 3:
+                if not current_exp:
+                    current_exp = {'title': line}
+                elif 'title' in current_exp and 'company' not in current_exp:
+                    current_exp['company'] = line
+                elif 'title' in current_exp and 'company' in current_exp:
+                    # Look for dates
+                    date_match = re.search(r'(19|20)\d{2}.*?(19|20)\d{2}|present', line_lower)
+                    if date_match:
+                        current_exp['duration'] = line
+                        experience.append(current_exp)
+                        current_exp = {}
         
         if current_exp:
             experience.append(current_exp)
         
         return experience
     
-    def parse_resume(self, file_path: str) -> ResumeData:
-        """Main method to parse a resume file (PDF or DOCX)"""
-        if not os.path.exists(file_path):
+    def extract_projects(self, text: str, index: Optional[basein.SectionIndex] = None) -> List[Dict[str, str]]:
+        """Extract projects: a plain line starts a project, bullet lines describe it"""
+        index = index or basein.SectionIndex(text)
+        projects = []
+        
+        for i in index.section_lines('projects'):
+            line = index.lines[i]
+            is_bullet = line[0] in basein.BULLET_CHARS
+            if projects and is_bullet:
+                description = projects[-1].get('description')
+                item = basein.strip_bullet(line)
+                projects[-1]['description'] = f"{description} {item}" if description else item
+            else:
+                projects.append({'name': basein.strip_bullet(line)})
+        
+        return projects
+    
+    def extract_certifications(self, text: str, index: Optional[basein.SectionIndex] = None) -> List[str]:
+        """Extract certifications, one per line"""
+        index = index or basein.SectionIndex(text)
+        return [basein.strip_bullet(index.lines[i]) for i in index.section_lines('certifications')]
+    
+    def extract_languages(self, text: str, index: Optional[basein.SectionIndex] = None) -> List[str]:
+        """Extract spoken languages from the languages section"""
+        index = index or basein.SectionIndex(text)
+        return basein.split_items([index.lines[i] for i in index.section_lines('languages')])
+    
+    def _check_file(self, file_path: Union[str, bytes]) -> str:
+        """Validate the path (or in-memory bytes) and format, returning the file extension"""
+        if bafiso.is_path(file_path) and not os.path.exists(file_path):
             raise FileNotFoundError(f"Resume file not found: {file_path}")
         
-        # Check file format
-        file_ext = os.path.splitext(file_path)[1].lower()
+        # Check file format: extension for paths, magic bytes for in-memory data
+        file_ext = bafiso.detect_format(file_path)
+        if file_ext == '.doc':
+            # Word 97-2003 binaries are OLE2 files, not zip archives; fail before reading them
+            raise ValueError(badost.LEGACY_DOC_ERROR)
         if file_ext not in self.supported_formats:
-            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {self.supported_formats}")
+            raise ValueError(f"Unsupported file format: {file_ext or 'unknown'}. Supported formats: {self.supported_formats}")
+        baregu.check_file_size(file_path, self.limits)
         
-        logger.info(f"Starting to parse resume: {file_path} (Format: {file_ext})")
+        logger.info(f"Starting to parse resume: {bafiso.describe(file_path)} (Format: {file_ext})")
+        return file_ext
+    
+    def _apply_header(self, resume_data: ResumeData, index: basein.SectionIndex):
+        """Fill name and contact details, which live near the top of a resume"""
+        text = resume_data.raw_text
+        stage = self.instrumentation.stage
+        with stage('name'):
+            resume_data.name = self.extract_name(text, index)
+        
+        with stage('contact'):
+            contact_info = self.extract_contact_info(text)
+        resume_data.email = contact_info['email']
+        resume_data.phone = contact_info['phone']
+        resume_data.linkedin = contact_info['linkedin']
+        resume_data.github = contact_info['github']
+        resume_data.portfolio = contact_info['portfolio']
+    
+    def _apply_sections(self, resume_data: ResumeData, index: basein.SectionIndex, entities: bool = True):
+        """Fill skills and the section-based fields, and run the entity pass if `entities`"""
+        text = resume_data.raw_text
+        stage = self.instrumentation.stage
+        with stage('skills'):
+            resume_data.skills = self.extract_skills(text)
+        with stage('education'):
+            resume_data.education = self.extract_education(text, index)
+        with stage('experience'):
+            resume_data.experience = self.extract_experience(text, index)
+        with stage('projects'):
+            resume_data.projects = self.extract_projects(text, index)
+        with stage('certifications'):
+            resume_data.certifications = self.extract_certifications(text, index)
+        with stage('languages'):
+            resume_data.languages = self.extract_languages(text, index)
+        if entities and self.entities is not None:
+            with stage('entities'):
+                # Only the header, experience and education lines are read
+                entities = self.entities.extract(baenex.focus_text(index))
+            self._apply_entities(resume_data, entities, index)
+    
+    def _apply_entities(self, resume_data: ResumeData, entities: baenex.DocumentEntities,
+                        index: basein.SectionIndex):
+        """Prefer entity-based name, experience and education over the line heuristics"""
+        self.instrumentation.count('entities', len(entities.entities))
+        resume_data.name = baenex.find_name(entities, index) or resume_data.name
+        experience = baenex.group_experience(entities, index)
+        if experience is not None:
+            resume_data.experience = experience
+        education = baenex.group_education(entities, index, self.degree_keywords)
+        if education is not None:
+            resume_data.education = education
+    
+    def add_entities(self, resumes: Iterable[ResumeData], batch_size: Optional[int] = None,
+                     n_process: Optional[int] = None) -> Iterator[ResumeData]:
+        """
+        Apply the entity pass to resumes parsed without it, batching texts
+        through `nlp.pipe` across `n_process` processes. Resumes are updated in
+        place and yielded in input order.
+        """
+        if self.entities is None:
+            raise ValueError("add_entities needs a parser created with nlp_model")
+        def items():
+            for resume_data in resumes:
+                index = basein.SectionIndex(resume_data.raw_text)
+                yield baenex.focus_text(index), (resume_data, index)
+        
+        for entities, (resume_data, index) in self.entities.extract_many(
+            items(), as_tuples=True, batch_size=batch_size, n_process=n_process,
+        ):
+            self._apply_entities(resume_data, entities, index)
+            yield resume_data
+    
+    def _count_pages(self, pages: List[bapden.PageExtraction]):
+        """Record page, engine and fallback counters for extracted PDF pages"""
+        count = self.instrumentation.count
+        primary = 'pdfplumber' if self.pdf_engine == 'accurate' else 'pypdf2'
+        count('pages', len(pages))
+        for page in pages:
+            count('engine', label=page.engine)
+            if page.reason:
+                count('fallback', label=page.reason)
+            elif page.engine != primary:
+                count('fallback', label='engine_error')
+    
+    @staticmethod
+    def _page_stats(pages: List[bapden.PageExtraction]) -> List[Dict[str, Any]]:
+        return [{key: value for key, value in asdict(page).items() if key != 'text'} for page in pages]
+    
+    def parse_resume(self, file_path: bafiso.ResumeSource, entities: bool = True) -> ResumeData:
+        """
+        Main method to parse a resume file (PDF or DOCX), given a path or the file's bytes.
+        
+        With `entities` False the entity pass is skipped, so that bulk callers
+        can batch it with `add_entities`.
+        
+        Raises a `baregu.ResourceLimitError` subclass when the document breaks a configured limit.
+        """
+        with self.instrumentation.parse(), self._counting_limits():
+            return self._parse_resume(file_path, entities)
+    
+    @contextlib.contextmanager
+    def _counting_limits(self):
+        try:
+            yield
+        except baregu.ResourceLimitError as e:
+            self.instrumentation.count('limit_exceeded', label=e.limit)
+            raise
+    
+    def close(self):
+        """Stop the extraction process, if limits started one"""
+        if self._guard is not None:
+            self._guard.close()
+    
+    def extract_document(self, file_path: bafiso.ResumeSource) -> Tuple[str, str, List[bapden.PageExtraction]]:
+        """
+        Validate a source and extract its text, file type and PDF pages under the
+        configured limits, without parsing sections; see `parse_extracted`.
+        """
+        with self._counting_limits():
+            return self._extract_document(file_path)
+    
+    def _extract_document(self, file_path: bafiso.ResumeSource) -> Tuple[str, str, List[bapden.PageExtraction]]:
+        file_path = bafiso.normalize(file_path)
+        self._check_file(file_path)
         
         # Extract text from file
-        text, file_type = self.extract_text_from_file(file_path)
+        with self.instrumentation.stage('extract_text'):
+            text, file_type, pages = self._extract_limited(file_path)
+        self._count_pages(pages)
+        self.instrumentation.count('characters', len(text))
         
         if not text:
             raise ValueError(f"No text could be extracted from the {file_type.upper()} file")
-        
+        return text, file_type, pages
+    
+    def parse_extracted(self, text: str, file_type: str, pages: List[bapden.PageExtraction],
+                        entities: bool = True) -> ResumeData:
+        """Build the ResumeData for text returned by `extract_document`"""
         # Create resume data object
         resume_data = ResumeData()
         resume_data.raw_text = text
         resume_data.file_type = file_type
+        resume_data.page_stats = self._page_stats(pages)
         
-        # Extract various information
-        resume_data.name = self.extract_name(text)
-        
-        contact_info = self.extract_contact_info(text)
-        resume_data.email = contact_info['email']
-        resume_data.phone = contact_info['phone']
-        resume_data.linkedin = contact_info['linkedin']
-        resume_data.github = contact_info['github']
-        resume_data.portfolio = contact_info['portfolio']
+        # Segment once; the line-based extractors share the index
+        with self.instrumentation.stage('section_index'):
+            index = basein.SectionIndex(text)
         
-        resume_data.skills = self.extract_skills(text)
-        resume_data.education = self.extract_education(text)
-        resume_data.experience = self.extract_experience(text)
+        # Extract various information
+        self._apply_header(resume_data, index)
+        self._apply_sections(resume_data, index, entities)
         
         logger.info(f"Resume parsing completed successfully (Format: {file_type})")
         return resume_data
     
+    def _parse_resume(self, file_path: bafiso.ResumeSource, entities: bool = True) -> ResumeData:
+        return self.parse_extracted(*self._extract_document(file_path), entities=entities)
+    
+    def iter_parse_resume(self, file_path: bafiso.ResumeSource) -> Iterator[ResumeData]:
+        """
+        Parse a resume progressively, yielding partial ResumeData snapshots.
+        
+        The first snapshot carries name and contact details from the first
+        page; later snapshots add skills and sections as more pages are read.
+        The last snapshot matches what parse_resume returns.
+        """
+        with self.instrumentation.parse(), self._counting_limits():
+            yield from self._iter_parse_resume(file_path)
+    
+    def _iter_parse_resume(self, file_path: bafiso.ResumeSource) -> Iterator[ResumeData]:
+        file_path = bafiso.normalize(file_path)
+        file_ext = self._check_file(file_path)
+        stage = self.instrumentation.stage
+        
+        if self._guard is not None:
+            # Isolated extraction returns whole documents; header and sections arrive together
+            with stage('extract_text'):
+                text, file_type, pages = self._guard.extract(file_path)
+            if file_type != 'pdf':
+                pages = [bapden.PageExtraction(page=1, engine='docx', seconds=0.0, text=text)]
+            chunks = iter([pages])
+        elif file_ext == '.pdf':
+            file_type = 'pdf'
+            with stage('extract_text'):
+                baregu.check_page_count(file_path, self.limits)
+            chunks = bapden.iter_pdf_pages(file_path, self.pdf_engine)
+        else:
+            file_type = 'docx'
+            with stage('extract_text'):
+                docx_text = self.extract_text_from_docx(file_path)
+            chunks = iter([[bapden.PageExtraction(page=1, engine='docx', seconds=0.0, text=docx_text)]])
+        
+        resume_data = ResumeData(file_type=file_type)
+        pages: List[bapden.PageExtraction] = []
+        while True:
+            with stage('extract_text'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            pages.extend(chunk)
+            text = self._join_pages(pages)
+            # Stop reading as soon as the character cap is crossed
+            baregu.check_text_length(text, self.limits)
+            if not text:
+                continue
+            first_update = not resume_data.raw_text
+            resume_data.raw_text = text
+            if file_type == 'pdf':
+                resume_data.page_stats = self._page_stats(pages)
+            with stage('section_index'):
+                index = basein.SectionIndex(text)
+            
+            self._apply_header(resume_data, index)
+            if first_update:
+                # Show header fields before the slower section pass
+                yield replace(resume_data)
+            self._apply_sections(resume_data, index)
+            yield replace(resume_data)
+        
+        if file_type == 'pdf':
+            self._count_pages(pages)
+        self.instrumentation.count('characters', len(resume_data.raw_text))
+        if not resume_data.raw_text:
+            raise ValueError(f"No text could be extracted from the {file_type.upper()} file")
+        
+        logger.info(f"Resume parsing completed successfully (Format: {file_type})")
+    
     def save_to_json(self, resume_data: ResumeData, output_path: str):
         """Save parsed resume data to JSON file"""
         import json
@@ -398,6 +624,8 @@ class ResumeParser:
     
     def save_to_csv(self, resume_data: ResumeData, output_path: str):
         """Save parsed resume data to CSV file"""
+        import csv
+        
         # Flatten the data for CSV format
         flattened_data = {
             'name': resume_data.name,
@@ -412,8 +640,12 @@ class ResumeParser:
             'file_type': resume_data.file_type
         }
         
-        df = pd.DataFrame([flattened_data])
-        df.to_csv(output_path, index=False)
+        # A one-row DataFrame costs far more than the write itself; see
+        # backend.resume_export for bulk exports
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(flattened_data))
+            writer.writeheader()
+            writer.writerow(flattened_data)
         
         logger.info(f"Resume data saved to: {output_path}")
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.section_index as basein
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Checked in order, so 'Academic Projects' is a projects header and
+# 'Programming Languages' is a skills header
+SECTION_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('projects', ('project',)),
+    ('skills', ('skill', 'technologies', 'programming')),
+    ('experience', ('experience', 'work', 'employment', 'career')),
+    ('education', ('education', 'academic', 'qualification')),
+    ('certifications', ('certification', 'certificate', 'license', 'licence')),
+    ('languages', ('language',)),
+    ('summary', ('summary', 'objective', 'profile')),
+    # Sections the parser does not read; their headers end the section above
+    ('awards', ('award', 'honor', 'honour', 'achievement')),
+    ('interests', ('interest', 'hobby', 'hobbies')),
+    ('references', ('reference',)),
+    ('publications', ('publication',)),
+    ('volunteer', ('volunteer', 'volunteering')),
+    ('internships', ('internship',)),
+    ('competencies', ('competency', 'competencies', 'proficiency', 'proficiencies')),
+)
+
+# Headers are short lines; anything longer is body text that happens to
+# mention a section word
+MAX_HEADER_WORDS = 4
+MAX_HEADER_CHARS = 40
+# Words a header may carry besides section keywords ('Technical Skills',
+# 'Employment History'); any other word makes the line body text
+HEADER_WORDS = frozenset((
+    'and', '&', 'of', 'my', 'other', 'key', 'core', 'technical', 'professional', 'relevant',
+    'personal', 'selected', 'additional', 'history', 'background', 'details', 'information',
+    'spoken', 'training', 'overview', 'highlights', 'expertise', 'tools',
+))
+# A keyword matches a whole word, optionally pluralized
+KEYWORD_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (section, re.compile(rf"^(?:{'|'.join(map(re.escape, keywords))})(?:s|es)?$"))
+    for section, keywords in SECTION_KEYWORDS
+)
+HEADER_SEPARATORS = re.compile(r'[\s/,|:–—-]+')
+# A wide gap or tab inside a line separates text laid out side by side, such
+# as a header and the first line of the neighbouring column
+LAYOUT_GAP = re.compile(r'\s{3,}|\t')
+
+BULLET_CHARS = '•●▪◦‣-–—*·'
+
+
+def strip_bullet(line: str) -> str:
+    return line.lstrip(BULLET_CHARS).strip()
+
+
+class SectionIndex:
+    """
+    One-time segmentation of resume text into lines and sections.
+
+    Lines are split, stripped and lowercased once; `sections` maps each
+    section name to the (start, end) line ranges of its bodies, header
+    excluded. `offsets` holds the character offset of every line so callers
+    can map back into the raw text.
+    """
+
+    def __init__(self, text: str):
+        raw_lines = text.split('\n')
+        self.lines: List[str] = [line.strip() for line in raw_lines]
+        self.lower: List[str] = [line.lower() for line in self.lines]
+        self.offsets: List[int] = []
+        offset = 0
+        for line in raw_lines:
+            self.offsets.append(offset)
+            offset += len(line) + 1
+
+        self.headers: Dict[int, str] = {}
+        for i, line_lower in enumerate(self.lower):
+            section = self.classify_header(line_lower)
+            if section:
+                self.headers[i] = section
+
+        self.sections: Dict[str, List[Tuple[int, int]]] = {}
+        starts = sorted(self.headers)
+        for position, start in enumerate(starts):
+            end = starts[position + 1] if position + 1 < len(starts) else len(self.lines)
+            self.sections.setdefault(self.headers[start], []).append((start + 1, end))
+
+    @staticmethod
+    def classify_header(line_lower: str) -> Optional[str]:
+        """Return the section a line introduces, or None if it is not a header"""
+        if not line_lower:
+            return None
+        # Only the text before a layout gap has to look like a header
+        line_lower = LAYOUT_GAP.split(line_lower, 1)[0]
+        if len(line_lower) > MAX_HEADER_CHARS:
+            return None
+        words = [word for word in HEADER_SEPARATORS.split(strip_bullet(line_lower)) if word]
+        if not words or len(words) > MAX_HEADER_WORDS:
+            return None
+        # Position in SECTION_KEYWORDS of each section named; the earliest wins
+        matched = []
+        for word in words:
+            found = [position for position, (_, pattern) in enumerate(KEYWORD_PATTERNS) if pattern.match(word)]
+            if not found and word not in HEADER_WORDS:
+                return None
+            matched.extend(found)
+        return KEYWORD_PATTERNS[min(matched)][0] if matched else None
+
+    def section_lines(self, section: str) -> List[int]:
+        """Indices of the non-empty body lines of a section, in document order"""
+        return [
+            i
+            for start, end in self.sections.get(section, ())
+            for i in range(start, end)
+            if self.lines[i]
+        ]
+
+    def section_text(self, section: str) -> str:
+        return '\n'.join(self.lines[i] for i in self.section_lines(section))
+
+    def has_section(self, section: str) -> bool:
+        return section in self.sections
+
+
+def split_items(lines: List[str]) -> List[str]:
+    """Split list-style section lines ('English, Spanish | French') into items"""
+    items = []
+    for line in lines:
+        for item in re.split(r'[,;|•●▪]', line):
+            item = strip_bullet(item)
+            if item and item not in items:
+                items.append(item)
+    return items
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.skill_matcher as baskma
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton that finds every keyword in one pass over the text.
+
+    Matching is case-insensitive and only accepts hits on word boundaries, so
+    'r' does not match inside 'docker' and 'java' does not match inside
+    'javascript'. Cost is linear in the text length plus the number of hits,
+    independent of how many keywords are compiled in.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (keyword index, keyword length) for every keyword ending here
+        self._out: List[Tuple[Tuple[int, int], ...]] = [()]
+
+        seen = set()
+        terminal: Dict[int, List[Tuple[int, int]]] = {}
+        for keyword in keywords:
+            pattern = keyword.lower()
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            terminal.setdefault(state, []).append((len(self.keywords), len(pattern)))
+            self.keywords.append(keyword)
+
+        for state, hits in terminal.items():
+            self._out[state] = tuple(hits)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Fold the fallback's outputs in so matching never walks fail links for output
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def export(self) -> Tuple[List[Tuple[int, str, int]], List[int], List[Tuple[Tuple[int, int], ...]]]:
+        """Flat automaton: (state, char, next state) edges, failure links and per-state outputs"""
+        edges = [(state, ch, nxt) for state, goto in enumerate(self._goto) for ch, nxt in goto.items()]
+        return edges, list(self._fail), list(self._out)
+
+    def find_iter(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Yield (keyword index, start, end) for every word-bounded match"""
+        goto, fail, out = self._goto, self._fail, self._out
+        text = text.lower()
+        size = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < size and _is_word_char(text[end]):
+                continue
+            for index, length in out[state]:
+                start = end - length
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    yield index, start, end
+
+    def find_all(self, text: str) -> List[str]:
+        """Return the distinct keywords present in `text`, in first-seen order"""
+        found: Dict[int, None] = {}
+        for index, _, _ in self.find_iter(text):
+            found.setdefault(index)
+        return [self.keywords[index] for index in found]
+
+
+@lru_cache(maxsize=16)
+def compile_matcher(keywords: Tuple[str, ...]) -> SkillMatcher:
+    """Build a matcher, sharing it between parsers with the same keyword list"""
+    return SkillMatcher(keywords)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.skill_taxonomy as baskta
+
+Skill taxonomy: canonical skill names with aliases ("JS" -> JavaScript), compiled
+into a flat binary index that is memory-mapped at load time. Loading is a
+header parse plus a few memoryview casts, so it takes milliseconds for tens of
+thousands of skills, and every process mapping the same file shares its pages.
+
+A taxonomy file is either JSON, `{"JavaScript": ["js", "ecmascript"], ...}`,
+or CSV/TSV with the canonical name first and aliases after it on each row
+(`#` starts a comment line).
+
+Usage:
+
+python -m backend.skill_taxonomy SOURCE [--out INDEX]
+"""
+
+import os
+import csv
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import argparse
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import backend.skill_matcher as baskma
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'SKIDX001'
+INDEX_SUFFIX = '.skidx'
+# Edge keys pack (state, code point); code points fit in 21 bits
+_CHAR_BITS = 21
+# Bound on memoized transitions per index
+MAX_CACHED_STEPS = 1 << 20
+# (name, array typecode) of every section, in file order
+_SECTIONS = (
+    ('edge_keys', 'q'),   # sorted state << 21 | code point
+    ('edge_next', 'i'),   # target state per edge
+    ('fail', 'i'),        # failure link per state
+    ('out_start', 'i'),   # per state, start of its outputs in out_form (CSR, states + 1)
+    ('out_form', 'i'),    # surface form index of every output
+    ('form_len', 'i'),    # surface form length in characters
+    ('form_skill', 'i'),  # canonical skill ID of every surface form
+    ('name_start', 'i'),  # per skill, byte offset of its name in names (skills + 1)
+    ('names', 'B'),       # UTF-8 canonical names, concatenated
+)
+
+# Built-in taxonomy, used when the parser is given no taxonomy file
+DEFAULT_TAXONOMY: Dict[str, List[str]] = {
+    # Programming Languages
+    'Python': [], 'Java': [], 'JavaScript': ['js', 'ecmascript'], 'TypeScript': [],
+    'C++': ['cpp'], 'C#': ['csharp', 'c sharp'], 'Ruby': [], 'PHP': [], 'Swift': [], 'Kotlin': [],
+    'Go': ['golang'], 'Rust': [], 'Scala': [], 'R': [], 'MATLAB': [], 'SQL': [],
+
+    # Web Technologies
+    'HTML': ['html5'], 'CSS': ['css3'], 'React': ['react.js', 'reactjs'], 'Angular': ['angularjs'],
+    'Vue': ['vue.js', 'vuejs'], 'Node.js': ['nodejs', 'node js'], 'Express': ['express.js'],
+    'Django': [], 'Flask': [], 'Spring': ['spring boot'], 'Laravel': [], 'Bootstrap': [],
+    'jQuery': [], 'Webpack': [],
+
+    # Databases
+    'MySQL': [], 'PostgreSQL': ['postgres', 'psql'], 'MongoDB': ['mongo'], 'Redis': [], 'SQLite': [],
+    'Oracle': [], 'Cassandra': [], 'Elasticsearch': ['elastic search'], 'DynamoDB': [],
+
+    # Cloud & DevOps
+    'AWS': ['amazon web services'], 'Azure': ['microsoft azure'], 'GCP': ['google cloud platform', 'google cloud'],
+    'Docker': [], 'Kubernetes': ['k8s'], 'Jenkins': [], 'Git': [], 'GitHub': [], 'GitLab': [],
+    'Terraform': [], 'Ansible': [], 'Chef': [], 'Puppet': [],
+
+    # Data Science & ML
+    'pandas': [], 'NumPy': [], 'scikit-learn': ['sklearn', 'scikit learn'], 'TensorFlow': [],
+    'PyTorch': [], 'Keras': [], 'Matplotlib': [], 'Seaborn': [], 'Plotly': [], 'Jupyter': [],
+    'Spark': ['apache spark', 'pyspark'], 'Hadoop': [],
+
+    # Other Technologies
+    'Linux': [], 'Unix': [], 'Windows': [], 'macOS': [], 'API': ['apis'], 'REST': ['restful'],
+    'GraphQL': [], 'Microservices': ['microservice'], 'Agile': [], 'Scrum': [], 'Kanban': [],
+    'Jira': [], 'Confluence': [],
+}
+
+
+def read_taxonomy(path: str) -> Dict[str, List[str]]:
+    """Read a JSON or CSV/TSV taxonomy file into {canonical name: aliases}"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Taxonomy JSON must map canonical names to alias lists: {path}")
+        return {name: list(aliases or []) for name, aliases in data.items()}
+
+    taxonomy: Dict[str, List[str]] = {}
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.reader(f, delimiter='\t' if ext == '.tsv' else ','):
+            row = [cell.strip() for cell in row if cell.strip()]
+            if not row or row[0].startswith('#'):
+                continue
+            taxonomy.setdefault(row[0], []).extend(row[1:])
+    return taxonomy
+
+
+def compile_index(taxonomy: Dict[str, Iterable[str]]) -> bytes:
+    """Compile {canonical name: aliases} into the binary index format"""
+    from array import array
+
+    names: List[str] = []
+    forms: List[str] = []
+    form_skill: List[int] = []
+    seen: Dict[str, str] = {}
+    for name, aliases in taxonomy.items():
+        skill_id = len(names)
+        names.append(name)
+        for form in [name, *aliases]:
+            key = form.strip().lower()
+            if not key:
+                continue
+            if key in seen:
+                if seen[key] != name:
+                    logger.debug(f"Alias '{form}' of '{name}' already maps to '{seen[key]}'")
+                continue
+            seen[key] = name
+            forms.append(key)
+            form_skill.append(skill_id)
+
+    edges, fail, outputs = baskma.SkillMatcher(forms).export()
+    edges.sort(key=lambda edge: (edge[0] << _CHAR_BITS) | ord(edge[1]))
+    out_start, out_form = [0], []
+    for state_outputs in outputs:
+        out_form.extend(form for form, _ in state_outputs)
+        out_start.append(len(out_form))
+    encoded = [name.encode('utf-8') for name in names]
+    name_start = [0]
+    for blob in encoded:
+        name_start.append(name_start[-1] + len(blob))
+
+    values = {
+        'edge_keys': [(state << _CHAR_BITS) | ord(ch) for state, ch, _ in edges],
+        'edge_next': [nxt for _, _, nxt in edges],
+        'fail': fail,
+        'out_start': out_start,
+        'out_form': out_form,
+        'form_len': [len(form) for form in forms],
+        'form_skill': form_skill,
+        'name_start': name_start,
+        'names': b''.join(encoded),
+    }
+    digest = hashlib.sha256()
+    for name, form in zip(form_skill, forms):
+        digest.update(f"{names[name]}\0{form}\0".encode('utf-8'))
+
+    body = bytearray()
+    offsets = {}
+    for section, typecode in _SECTIONS:
+        # Align every section to 8 bytes so it can be cast in place
+        body += b'\0' * (-len(body) % 8)
+        data = array(typecode, values[section]).tobytes()
+        offsets[section] = [len(body), len(data)]
+        body += data
+    header = json.dumps({
+        'skills': len(names), 'forms': len(forms), 'states': len(fail),
+        'digest': digest.hexdigest()[:16], 'sections': offsets,
+    }).encode('utf-8')
+    prefix = INDEX_MAGIC + struct.pack('<I', len(header)) + header
+    prefix += b'\0' * (-len(prefix) % 8)
+    return bytes(prefix) + bytes(body)
+
+
+class SkillIndex:
+    """
+    Read-only compiled taxonomy. Matching is the same word-bounded,
+    case-insensitive Aho-Corasick scan as SkillMatcher, run directly over the
+    flat arrays, and reports canonical names.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], source: Optional[str] = None):
+        self.source = source
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if bytes(view[:len(INDEX_MAGIC)]) != INDEX_MAGIC:
+            raise ValueError(f"Not a skill index: {source or '<bytes>'}")
+        (header_size,) = struct.unpack_from('<I', view, len(INDEX_MAGIC))
+        start = len(INDEX_MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_size]))
+        base = start + header_size + (-(start + header_size) % 8)
+        self.digest: str = header['digest']
+        self.skill_count: int = header['skills']
+        for section, typecode in _SECTIONS:
+            offset, size = header['sections'][section]
+            setattr(self, f"_{section}", view[base + offset:base + offset + size].cast(typecode))
+        # Resolved transitions, filled as text is scanned; most of a scan stays near the root
+        self._steps: Dict[int, int] = {}
+        self._root = {}
+        for position in range(len(self._edge_keys)):
+            key = self._edge_keys[position]
+            if key >> _CHAR_BITS:
+                break
+            self._root[key] = self._edge_next[position]
+
+    @classmethod
+    def open(cls, path: str) -> 'SkillIndex':
+        """Memory-map a compiled index file"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, source=path)
+
+    def skill_name(self, skill_id: int) -> str:
+        return bytes(self._names[self._name_start[skill_id]:self._name_start[skill_id + 1]]).decode('utf-8')
+
+    def _step(self, state: int, code: int) -> int:
+        """Next state from `state` on `code`, following failure links"""
+        keys, next_state, fail = self._edge_keys, self._edge_next, self._fail
+        edges = len(keys)
+        while state:
+            key = (state << _CHAR_BITS) | code
+            position = bisect_left(keys, key)
+            if position < edges and keys[position] == key:
+                return next_state[position]
+            state = fail[state]
+        return self._root.get(code, 0)
+
+    def find_iter(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Yield (skill ID, start, end) for every word-bounded match of any surface form"""
+        out_start, out_form = self._out_start, self._out_form
+        form_len, form_skill = self._form_len, self._form_skill
+        root, step, steps = self._root, self._step, self._steps
+        if len(steps) > MAX_CACHED_STEPS:
+            steps.clear()
+        text = text.lower()
+        size = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            code = ord(ch)
+            if state:
+                key = (state << _CHAR_BITS) | code
+                nxt = steps.get(key)
+                if nxt is None:
+                    nxt = steps[key] = step(state, code)
+                state = nxt
+            else:
+                state = root.get(code, 0)
+            first, last = out_start[state], out_start[state + 1]
+            if first == last:
+                continue
+            end = i + 1
+            if end < size and text[end].isalnum():
+                continue
+            for position in range(first, last):
+                form = out_form[position]
+                start = end - form_len[form]
+                if start == 0 or not text[start - 1].isalnum():
+                    yield form_skill[form], start, end
+
+    def find_all(self, text: str) -> List[str]:
+        """Distinct canonical skills present in `text`, in first-seen order"""
+        found: Dict[int, None] = {}
+        for skill_id, _, _ in self.find_iter(text):
+            found.setdefault(skill_id)
+        return [self.skill_name(skill_id) for skill_id in found]
+
+
+def index_path_for(source_path: str) -> str:
+    return source_path + INDEX_SUFFIX
+
+
+def compile_file(source_path: str, index_path: Optional[str] = None) -> str:
+    """Compile a taxonomy file to an index file (atomically replaced); return its path"""
+    index_path = index_path or index_path_for(source_path)
+    data = compile_index(read_taxonomy(source_path))
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, index_path)
+    logger.info(f"Compiled skill index: {index_path} ({len(data)} bytes)")
+    return index_path
+
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int, size: int) -> SkillIndex:
+    if path.endswith(INDEX_SUFFIX):
+        return SkillIndex.open(path)
+    index_path = index_path_for(path)
+    try:
+        if os.stat(index_path).st_mtime_ns >= mtime_ns:
+            return SkillIndex.open(index_path)
+    except (OSError, ValueError):
+        pass
+    try:
+        return SkillIndex.open(compile_file(path, index_path))
+    except OSError:
+        # Read-only location: compile in memory instead of caching on disk
+        logger.warning(f"Could not write skill index next to {path}; compiling in memory")
+        return SkillIndex(compile_index(read_taxonomy(path)), source=path)
+
+
+def load_index(path: str) -> SkillIndex:
+    """
+    Load a compiled index, or a taxonomy file via its '.skidx' sidecar (compiled
+    when missing or older than the source). Cached per process and file version.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _load(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1)
+def default_index() -> SkillIndex:
+    """Index of the built-in taxonomy, compiled once per process"""
+    return SkillIndex(compile_index(DEFAULT_TAXONOMY), source='<builtin>')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a skill taxonomy into a memory-mappable index')
+    parser.add_argument('source', help='JSON or CSV/TSV taxonomy file')
+    parser.add_argument('--out', help=f"index path (default: SOURCE{INDEX_SUFFIX})")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    index = SkillIndex.open(compile_file(args.source, args.out))
+    print(f"{index.skill_count} skills, digest {index.digest}: {index.source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import backend.vector_index as bavein
+
+Local, persistent vector index for semantic resume search, with no network
+dependency. Vectors live in a memory-mapped float32 file that grows as rows
+are added; ids, metadata and tombstones are kept in a small JSON state file.
+Search is exact (brute force over the mapped matrix, in blocks) or
+approximate (IVF: k-means lists, probing the `nprobe` nearest).
+
+VectorStore is the interface; a remote store (e.g. Pinecone) can implement
+the same methods and be swapped in.
+"""
+
+import os
+import json
+import math
+import zlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+import backend.resume_matcher as barema
+import backend.resume_parser as barepa
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ('auto', 'brute', 'ivf')
+# 'auto' uses IVF once it is trained and the index has at least this many rows
+MIN_IVF_ROWS = 10000
+# Rows scored per block in brute-force search, bounding temporary memory
+BLOCK_ROWS = 65536
+INITIAL_CAPACITY = 1024
+
+
+@dataclass
+class Hit:
+    """One search result; `score` is the cosine similarity"""
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+# --- Embedding -------------------------------------------------------------
+
+class Embedder:
+    """Turns texts into L2-normalized float32 vectors of size `dim`"""
+
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing of unigrams and bigrams with sublinear term
+    frequency. Stateless and deterministic, so vectors stay comparable across
+    processes and restarts without a fitted vocabulary.
+    """
+
+    def __init__(self, dim: int = 512, bigrams: bool = True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> Dict[str, int]:
+        counts = barema.term_counts(text)
+        if self.bigrams:
+            tokens = barema.tokenize(text)
+            counts.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return counts
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                hashed = zlib.crc32(feature.encode('utf-8'))
+                sign = 1.0 if hashed & 0x80000000 else -1.0
+                vectors[row, hashed % self.dim] += sign * (1.0 + math.log(count))
+        return normalize(vectors)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def resume_text(resume_data: barepa.ResumeData) -> str:
+    """Text embedded for a resume: skills and titles up front, then the raw text"""
+    titles = ' '.join(entry.get('title', '') for entry in resume_data.experience)
+    return f"{' '.join(resume_data.skills)}\n{titles}\n{resume_data.raw_text or ''}"
+
+
+# --- Stores ----------------------------------------------------------------
+
+class VectorStore:
+    """Interface shared by the local index and any remote vector store"""
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray, metadata: Optional[Sequence[Dict[str, Any]]] = None):
+        """Insert or replace vectors by id"""
+        raise NotImplementedError
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Remove ids; return how many were present"""
+        raise NotImplementedError
+
+    def search(self, queries: np.ndarray, top_k: int = 10, mode: str = 'auto', nprobe: int = 8) -> List[List[Hit]]:
+        """Top `top_k` hits for each query row, best first"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class LocalVectorIndex(VectorStore):
+    """
+    Vector index stored in directory `path`:
+
+    - vectors.f32: memory-mapped rows, capacity doubled as needed
+    - state.json: dimension, row ids (None for deleted rows) and metadata
+    - ivf.npz: IVF centroids and row assignments, once `train_ivf` has run
+
+    Call `flush` (or `close`) to persist; deleted rows are reclaimed by `compact`.
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None):
+        self.path = path
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        state_path = os.path.join(path, 'state.json')
+        if os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            if dim is not None and dim != state['dim']:
+                raise ValueError(f"Index at {path} has dimension {state['dim']}, not {dim}")
+            self.dim = state['dim']
+            self._ids: List[Optional[str]] = state['ids']
+            self._metadata: Dict[str, Dict[str, Any]] = state['metadata']
+            capacity = state['capacity']
+        else:
+            if dim is None:
+                raise ValueError(f"No index at {path}; pass `dim` to create one")
+            self.dim = dim
+            self._ids, self._metadata = [], {}
+            capacity = INITIAL_CAPACITY
+        self._rows = {row_id: row for row, row_id in enumerate(self._ids) if row_id is not None}
+        self._vectors = self._map(capacity)
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        ivf_path = os.path.join(path, 'ivf.npz')
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                self._centroids, self._assign = ivf['centroids'], ivf['assign']
+
+    def _map(self, capacity: int) -> np.memmap:
+        vectors_path = os.path.join(self.path, 'vectors.f32')
+        size = capacity * self.dim * 4
+        with open(vectors_path, 'ab') as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, row_id: str) -> bool:
+        return row_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray, metadata: Optional[Sequence[Dict[str, Any]]] = None):
+        vectors = normalize(vectors).reshape(len(ids), self.dim)
+        # An id repeated within the batch keeps its last vector, like repeated adds
+        last = {row_id: offset for offset, row_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[offset] for offset in keep]
+            vectors = vectors[keep]
+            if metadata is not None:
+                metadata = [metadata[offset] for offset in keep]
+        with self._lock:
+            self.delete(ids)
+            start = len(self._ids)
+            end = start + len(ids)
+            capacity = self._vectors.shape[0]
+            if end > capacity:
+                while capacity < end:
+                    capacity *= 2
+                self._vectors.flush()
+                self._vectors = self._map(capacity)
+            self._vectors[start:end] = vectors
+            for offset, row_id in enumerate(ids):
+                self._ids.append(row_id)
+                self._rows[row_id] = start + offset
+                if metadata is not None:
+                    self._metadata[row_id] = metadata[offset]
+            if self.trained:
+                self._assign = np.concatenate([self._assign, self._nearest_centroids(vectors)])
+                self._lists = None
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for row_id in ids:
+                row = self._rows.pop(row_id, None)
+                if row is None:
+                    continue
+                self._ids[row] = None
+                self._metadata.pop(row_id, None)
+                self._vectors[row] = 0
+                removed += 1
+            if removed:
+                self._lists = None
+        return removed
+
+    def get(self, row_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(row_id)
+        return None if row is None else np.array(self._vectors[row])
+
+    def _live_rows(self) -> np.ndarray:
+        return np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+
+    # --- IVF ---------------------------------------------------------------
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 10, sample: int = 50000, seed: int = 0):
+        """Spherical k-means over (a sample of) live rows, then assign every row to a list"""
+        with self._lock:
+            live = self._live_rows()
+            if not len(live):
+                raise ValueError("Cannot train IVF on an empty index")
+            nlist = min(nlist or max(1, int(np.sqrt(len(live)))), len(live))
+            rng = np.random.default_rng(seed)
+            training = self._vectors[np.sort(rng.choice(live, min(sample, len(live)), replace=False))]
+            centroids = training[rng.choice(len(training), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assign = np.argmax(training @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assign, training)
+                empty = np.bincount(assign, minlength=nlist) == 0
+                # Re-seed empty lists from random training rows
+                sums[empty] = training[rng.choice(len(training), int(empty.sum()))]
+                centroids = normalize(sums)
+            self._centroids = centroids
+            self._assign = np.zeros(len(self._ids), dtype=np.int32)
+            for start in range(0, len(self._ids), BLOCK_ROWS):
+                block = self._vectors[start:min(start + BLOCK_ROWS, len(self._ids))]
+                self._assign[start:start + len(block)] = self._nearest_centroids(block)
+            self._lists = None
+            logger.info(f"Trained IVF with {nlist} lists over {len(training)} vectors")
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            alive = np.array([row_id is not None for row_id in self._ids], dtype=bool)
+            rows = np.flatnonzero(alive)
+            order = np.argsort(self._assign[rows], kind='stable')
+            bounds = np.searchsorted(self._assign[rows][order], np.arange(len(self._centroids) + 1))
+            self._lists = [rows[order[bounds[i]:bounds[i + 1]]] for i in range(len(self._centroids))]
+        return self._lists
+
+    # --- Search ------------------------------------------------------------
+
+    def search(self, queries: np.ndarray, top_k: int = 10, mode: str = 'auto', nprobe: int = 8) -> List[List[Hit]]:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}. Supported modes: {SEARCH_MODES}")
+        queries = normalize(np.atleast_2d(queries))
+        with self._lock:
+            if not self._rows:
+                return [[] for _ in queries]
+            if mode == 'auto':
+                mode = 'ivf' if self.trained and len(self) >= MIN_IVF_ROWS else 'brute'
+            if mode == 'ivf':
+                if not self.trained:
+                    raise ValueError("IVF search needs train_ivf() first")
+                return self._search_ivf(queries, top_k, nprobe)
+            return self._search_brute(queries, top_k)
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray) -> List[Hit]:
+        return [
+            Hit(id=self._ids[row], score=float(score), metadata=self._metadata.get(self._ids[row], {}))
+            for row, score in zip(rows, scores)
+        ]
+
+    def _search_brute(self, queries: np.ndarray, top_k: int) -> List[List[Hit]]:
+        used = len(self._ids)
+        alive = np.array([row_id is not None for row_id in self._ids], dtype=bool)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, used, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, used)
+            scores = queries @ self._vectors[start:end].T
+            scores[:, ~alive[start:end]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, end), scores.shape)
+            # Keep a running top-k per query across blocks
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            if best_scores.shape[1] > top_k:
+                keep = np.argpartition(-best_scores, top_k - 1, axis=1)[:, :top_k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        results = []
+        for rows, scores in zip(best_rows, best_scores):
+            order = np.argsort(-scores, kind='stable')
+            order = order[np.isfinite(scores[order])]
+            results.append(self._hits(rows[order], scores[order]))
+        return results
+
+    def _search_ivf(self, queries: np.ndarray, top_k: int, nprobe: int) -> List[List[Hit]]:
+        lists = self._inverted_lists()
+        probes = np.argsort(-(queries @ self._centroids.T), axis=1)[:, :nprobe]
+        results = []
+        for query, probe in zip(queries, probes):
+            rows = np.concatenate([lists[i] for i in probe])
+            if not len(rows):
+                results.append([])
+                continue
+            scores = self._vectors[rows] @ query
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            results.append(self._hits(rows[top], scores[top]))
+        return results
+
+    # --- Persistence -------------------------------------------------------
+
+    def compact(self):
+        """Drop deleted rows, rewriting the vector file in place"""
+        with self._lock:
+            live = np.sort(self._live_rows())
+            for new, old in enumerate(live):
+                if new != old:
+                    self._vectors[new] = self._vectors[old]
+            self._vectors[len(live):len(self._ids)] = 0
+            if self.trained:
+                self._assign = self._assign[live]
+            self._ids = [self._ids[row] for row in live]
+            self._rows = {row_id: row for row, row_id in enumerate(self._ids)}
+            self._lists = None
+
+    def flush(self):
+        with self._lock:
+            self._vectors.flush()
+            state = {
+                'dim': self.dim, 'capacity': self._vectors.shape[0],
+                'ids': self._ids, 'metadata': self._metadata,
+            }
+            state_path = os.path.join(self.path, 'state.json')
+            with open(f"{state_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(f"{state_path}.tmp", state_path)
+            if self.trained:
+                ivf_path = os.path.join(self.path, 'ivf.npz')
+                with open(f"{ivf_path}.tmp", 'wb') as f:
+                    np.savez(f, centroids=self._centroids, assign=self._assign)
+                os.replace(f"{ivf_path}.tmp", ivf_path)
+
+
+# --- Resumes ---------------------------------------------------------------
+
+def add_resumes(
+    store: VectorStore,
+    embedder: Embedder,
+    ids: Sequence[str],
+    resumes: Sequence[barepa.ResumeData],
+    batch_size: int = 256,
+):
+    """Embed and upsert resumes, with name, email and skills as metadata"""
+    for start in range(0, len(resumes), batch_size):
+        batch = resumes[start:start + batch_size]
+        store.add(
+            ids[start:start + batch_size],
+            embedder.embed([resume_text(resume) for resume in batch]),
+            [{'name': resume.name, 'email': resume.email, 'skills': resume.skills} for resume in batch],
+        )
+
+
+def search_text(store: VectorStore, embedder: Embedder, texts: Sequence[str], top_k: int = 10, **kwargs) -> List[List[Hit]]:
+    """Batched semantic search with free-text queries, e.g. job descriptions"""
+    return store.search(embedder.embed(texts), top_k=top_k, **kwargs)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Memory footprint of a large candidate pool: ResumeData vs CompactResume.
+
+The corpus is parsed once, then each parsed resume is copied (through its
+JSON form, so no strings are shared) until the pool holds `--pool` candidates.
+Sizes are traced allocations of the pool alone.
+
+Usage:
+
+python -m benchmarks.bench_memory [--corpus DIR] [--count 50] [--seed 0] [--pool 20000]
+"""
+
+import os
+import gc
+import json
+import argparse
+import tempfile
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List
+
+import benchmarks.corpus as becorp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _traced_mb(build: Callable[[], Any]) -> float:
+    """Traced memory retained by the object `build` returns"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / (1024 * 1024)
+
+
+def run(corpus_dir: str, pool_size: int) -> Dict[str, Any]:
+    import logging
+    import backend.compact_resume as bacore
+    import backend.resume_parser as barepa
+
+    logging.disable(logging.INFO)
+    parser = barepa.ResumeParser()
+    parsed = [json.dumps(asdict(parser.parse_resume(item.path))) for item in becorp.load_corpus(corpus_dir)]
+    records: List[str] = [parsed[i % len(parsed)] for i in range(pool_size)]
+
+    def resume_pool():
+        return [barepa.ResumeData(**json.loads(record)) for record in records]
+
+    def compact_pool():
+        pool = bacore.CandidatePool()
+        for record in records:
+            pool.add_dict(json.loads(record))
+        return pool
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def compact_pool_on_disk():
+            pool = bacore.CandidatePool(texts=bacore.FileTextStore(os.path.join(tmp_dir, 'raw_text.bin')))
+            for record in records:
+                pool.add_dict(json.loads(record))
+            return pool
+
+        results = {
+            'pool': pool_size,
+            'resume_data_mb': _traced_mb(resume_pool),
+            'compact_mb': _traced_mb(compact_pool),
+            'compact_text_on_disk_mb': _traced_mb(compact_pool_on_disk),
+        }
+    for key in ('compact_mb', 'compact_text_on_disk_mb'):
+        results[key.replace('_mb', '_ratio')] = results[key] / results['resume_data_mb']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare in-memory size of ResumeData and CompactResume pools')
+    parser.add_argument('--corpus', default=os.path.join(REPO_ROOT, '.bench_corpus'),
+                        help='corpus directory; generated if it has no manifest')
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pool', type=int, default=20000)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        becorp.generate_corpus(args.corpus, args.count, args.seed)
+
+    results = run(args.corpus, args.pool)
+    print(f"{results['pool']} candidates")
+    print(f"ResumeData                  {results['resume_data_mb']:8.1f} MB")
+    print(f"CompactResume               {results['compact_mb']:8.1f} MB  "
+          f"({results['compact_ratio']:.0%})")
+    print(f"CompactResume, text on disk {results['compact_text_on_disk_mb']:8.1f} MB  "
+          f"({results['compact_text_on_disk_ratio']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
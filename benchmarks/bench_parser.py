@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Per-stage ResumeParser benchmark over a synthetic corpus.
+
+Each stage runs in a fresh worker process, so its peak RSS is not polluted by
+earlier stages. Results are written as JSON; pass `--compare` with an earlier
+result file to print the change per stage.
+
+Usage:
+
+python -m benchmarks.bench_parser [--corpus DIR] [--count 50] [--seed 0]
+    [--repeat 3] [--pdf-engine auto] [--out bench_results.json] [--compare OLD.json]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import benchmarks.corpus as becorp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process"""
+    # VmHWM is reset on exec; ru_maxrss on Linux keeps the forking parent's peak
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_stage(stage: str, inputs: List[Any], repeat: int, parser_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Time one stage over all inputs, inside a worker process"""
+    import logging
+    import backend.resume_parser as barepa
+
+    logging.disable(logging.INFO)
+    parser = barepa.ResumeParser(**parser_kwargs)
+    method: Callable = getattr(parser, stage)
+    method(inputs[0])  # warm up lazy imports and compiled matchers
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            method(item)
+            latencies.append(time.perf_counter() - start)
+    total = time.perf_counter() - started
+
+    return {
+        'items': len(inputs),
+        'runs': len(latencies),
+        'mean_ms': 1000 * total / len(latencies),
+        'p50_ms': 1000 * percentile(latencies, 50),
+        'p95_ms': 1000 * percentile(latencies, 95),
+        'max_ms': 1000 * max(latencies),
+        'throughput_per_sec': len(latencies) / total,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_stage(stage: str, inputs: List[Any], repeat: int, parser_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_run_stage, stage, inputs, repeat, parser_kwargs).result()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_benchmarks(corpus_dir: str, repeat: int, parser_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    import logging
+    import backend.resume_parser as barepa
+
+    logging.disable(logging.INFO)
+    items = becorp.load_corpus(corpus_dir)
+    pdfs = [item.path for item in items if item.file_type == 'pdf']
+    docxs = [item.path for item in items if item.file_type == 'docx']
+    parser = barepa.ResumeParser(**parser_kwargs)
+    texts = [parser.extract_text_from_file(item.path)[0] for item in items]
+
+    stage_inputs = {
+        'extract_text_from_pdf': pdfs,
+        'extract_text_from_docx': docxs,
+        'extract_skills': texts,
+        'extract_education': texts,
+        'extract_experience': texts,
+        'parse_resume': [item.path for item in items],
+    }
+    stages = {}
+    for stage, inputs in stage_inputs.items():
+        if not inputs:
+            continue
+        stages[stage] = run_stage(stage, inputs, repeat, parser_kwargs)
+        print(f"{stage:24s} p50 {stages[stage]['p50_ms']:8.2f} ms  "
+              f"p95 {stages[stage]['p95_ms']:8.2f} ms  "
+              f"{stages[stage]['throughput_per_sec']:9.1f}/s  "
+              f"rss {stages[stage]['peak_rss_mb']:7.1f} MB")
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parser_kwargs': parser_kwargs,
+            'parser_fingerprint': parser.fingerprint,
+            'repeat': repeat,
+        },
+        'corpus': {
+            'dir': corpus_dir,
+            'documents': len(items),
+            'pdf': len(pdfs),
+            'docx': len(docxs),
+            'pages': sum(item.pages for item in items),
+            'characters': sum(len(text) for text in texts),
+        },
+        'stages': stages,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print per-stage p50 and throughput change against a baseline result"""
+    print(f"\nChange vs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for stage, now in current['stages'].items():
+        before = baseline['stages'].get(stage)
+        if not before:
+            continue
+        p50 = (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+        throughput = (now['throughput_per_sec'] - before['throughput_per_sec']) / before['throughput_per_sec'] * 100
+        print(f"{stage:24s} p50 {p50:+7.1f}%  throughput {throughput:+7.1f}%  "
+              f"rss {now['peak_rss_mb'] - before['peak_rss_mb']:+7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ResumeParser stages on a synthetic corpus')
+    parser.add_argument('--corpus', default=os.path.join(REPO_ROOT, '.bench_corpus'),
+                        help='corpus directory; generated if it has no manifest')
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pdf-engine', default='auto')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', help='earlier result JSON to compare against')
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        becorp.generate_corpus(args.corpus, args.count, args.seed)
+
+    results = run_benchmarks(args.corpus, args.repeat, {'pdf_engine': args.pdf_engine})
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Offline throughput and cache benchmark of the question pipeline.
+
+Every corpus resume is paired with every job description, and each pair is
+submitted twice at once (as double-clicks and retries would), against the
+deterministic FakeProvider with a fixed latency. A second, identical pass
+measures the warm cache.
+
+Usage:
+
+python -m benchmarks.bench_questions [--corpus DIR] [--latency 0.2]
+    [--concurrency 1 8 32] [--jds 3]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List, Tuple
+
+import backend.agent_builder as baagbu
+import benchmarks.corpus as becorp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_DESCRIPTIONS = [
+    "Senior backend engineer: Python, Django, PostgreSQL, Docker and AWS; 5+ years building APIs.",
+    "Data scientist: pandas, NumPy, scikit-learn and PyTorch; experience shipping models to production.",
+    "DevOps engineer: Kubernetes, Terraform, Jenkins and Linux; on-call for high-traffic services.",
+    "Frontend developer: React, TypeScript and CSS; design systems and accessibility.",
+]
+
+
+async def _timed_pass(generator: baagbu.QuestionGenerator, requests: List[Tuple[Any, str]]) -> Dict[str, Any]:
+    before = dict(generator.stats)
+    start = time.perf_counter()
+    results = await generator.generate_many(requests)
+    seconds = time.perf_counter() - start
+    delta = {key: generator.stats[key] - before[key] for key in before}
+    return {
+        'seconds': seconds,
+        'questions': sum(len(questions) for questions in results),
+        'prompts_per_sec': delta['requests'] / seconds,
+        'cache_hit_rate': delta['cache_hits'] / max(delta['requests'], 1),
+        **delta,
+    }
+
+
+def run(corpus_dir: str, latency: float, concurrency: List[int], jds: int) -> Dict[int, Dict[str, Any]]:
+    import logging
+    import backend.resume_parser as barepa
+
+    logging.disable(logging.INFO)
+    parser = barepa.ResumeParser()
+    resumes = [parser.parse_resume(item.path) for item in becorp.load_corpus(corpus_dir)]
+    pairs = [(resume, jd) for resume in resumes for jd in JOB_DESCRIPTIONS[:jds]]
+    requests = [pair for pair in pairs for _ in range(2)]
+
+    results = {}
+    for limit in concurrency:
+        generator = baagbu.QuestionGenerator(baagbu.FakeProvider(latency), max_concurrency=limit)
+        cold = asyncio.run(_timed_pass(generator, requests))
+        warm = asyncio.run(_timed_pass(generator, requests))
+        results[limit] = {'cold': cold, 'warm': warm}
+        print(f"concurrency {limit:3d}: cold {cold['seconds']:7.2f} s  {cold['prompts_per_sec']:8.1f} prompts/s  "
+              f"calls {cold['provider_calls']:4d}  coalesced {cold['coalesced']:4d}  |  "
+              f"warm {warm['seconds'] * 1000:7.1f} ms  hit rate {warm['cache_hit_rate']:.0%}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark question generation against the fake provider')
+    parser.add_argument('--corpus', default=os.path.join(REPO_ROOT, '.bench_corpus'),
+                        help='corpus directory; generated if it has no manifest')
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.2, help='fake provider latency in seconds')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--jds', type=int, default=3, help=f"job descriptions per resume (max {len(JOB_DESCRIPTIONS)})")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        becorp.generate_corpus(args.corpus, args.count, args.seed)
+    run(args.corpus, args.latency, args.concurrency, args.jds)
+
+
+if __name__ == "__main__":
+    main()
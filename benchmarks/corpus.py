@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Import as:
+
+import benchmarks.corpus as becorp
+
+Synthetic resume corpus for benchmarks. Every document is generated from a
+seed, so the same arguments always produce the same corpus. PDFs are written
+directly (no PDF library needed) and DOCX files with python-docx.
+
+Usage:
+
+python -m benchmarks.corpus OUT_DIR [--count 50] [--seed 0]
+"""
+
+import os
+import json
+import random
+import argparse
+from dataclasses import dataclass, asdict
+from typing import List, Tuple
+
+FIRST_NAMES = ['Jane', 'John', 'Priya', 'Wei', 'Carlos', 'Amara', 'Olga', 'Kenji', 'Fatima', 'Liam']
+LAST_NAMES = ['Doe', 'Smith', 'Sharma', 'Zhang', 'Garcia', 'Okafor', 'Ivanova', 'Tanaka', 'Khan', 'Murphy']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'DevOps Engineer',
+          'Backend Developer', 'Machine Learning Engineer', 'Engineering Manager', 'QA Analyst']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Tech']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'B.Tech in Information Technology', 'MBA', 'PhD in Physics', 'Associate Degree in Networking']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'National University']
+SKILLS = ['Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'Go', 'Rust', 'SQL', 'React', 'Django',
+          'Flask', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Terraform', 'Pandas', 'NumPy',
+          'TensorFlow', 'PyTorch', 'Spark', 'Linux', 'Git', 'Jenkins', 'PostgreSQL', 'MongoDB', 'Redis']
+CERTIFICATIONS = ['AWS Certified Solutions Architect', 'Certified Kubernetes Administrator',
+                  'Google Professional Data Engineer', 'PMP', 'Scrum Master Certification']
+LANGUAGES = ['English', 'Spanish', 'Hindi', 'Mandarin', 'French', 'German', 'Japanese']
+FILLER = ('designed built shipped maintained scalable reliable services pipelines dashboards for '
+          'customers teams reducing latency cost errors by improving throughput and observability '
+          'across platforms with automated testing deployment monitoring').split()
+
+LAYOUTS = ('single', 'two_column', 'table')
+
+
+@dataclass
+class CorpusItem:
+    """One generated document and how it was built"""
+    path: str
+    file_type: str
+    layout: str
+    pages: int
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(FILLER) for _ in range(words)).capitalize() + '.'
+
+
+def resume_sections(rng: random.Random, pages: int) -> List[Tuple[str, List[str]]]:
+    """Generate (header, lines) sections sized to fill roughly `pages` pages"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    header = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | ({rng.randint(200, 999)}) "
+        f"{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{first.lower()}{last.lower()} | github.com/{first.lower()}{rng.randint(1, 99)}",
+    ]
+    sections = [('', header), ('Summary', [_sentence(rng, 18)])]
+
+    experience = []
+    year = 2024
+    # About 45 lines fit on a page; most of a long CV is experience
+    for _ in range(max(2, pages * 5)):
+        start = year - rng.randint(1, 4)
+        experience.append(rng.choice(TITLES))
+        experience.append(rng.choice(COMPANIES))
+        experience.append(f"{start} - {year if year < 2024 else 'Present'}")
+        experience.extend(f"- {_sentence(rng, rng.randint(8, 16))}" for _ in range(rng.randint(2, 5)))
+        year = start
+    sections.append(('Experience', experience))
+
+    education = []
+    for _ in range(rng.randint(1, 3)):
+        education.extend([rng.choice(DEGREES), rng.choice(SCHOOLS), str(rng.randint(1995, 2022))])
+    sections.append(('Education', education))
+
+    projects = []
+    for _ in range(rng.randint(1, 4)):
+        projects.append(f"{rng.choice(FILLER).capitalize()} {rng.choice(['Platform', 'Toolkit', 'Service'])}")
+        projects.append(f"- {_sentence(rng, 12)}")
+    sections.append(('Projects', projects))
+    sections.append(('Skills', [', '.join(rng.sample(SKILLS, rng.randint(5, 15)))]))
+    sections.append(('Certifications', rng.sample(CERTIFICATIONS, rng.randint(0, 3))))
+    sections.append(('Languages', [', '.join(rng.sample(LANGUAGES, rng.randint(1, 3)))]))
+    return sections
+
+
+# --- PDF -------------------------------------------------------------------
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN, LEADING, FONT_SIZE = 48, 13, 10
+CHARS_PER_LINE = 95
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _wrap(line: str, width: int) -> List[str]:
+    words, rows, current = line.split(), [], ''
+    for word in words:
+        if current and len(current) + len(word) + 1 > width:
+            rows.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    return rows + [current] if current else rows or ['']
+
+
+def _pdf_pages(lines: List[str], layout: str) -> List[bytes]:
+    """Lay out lines into page content streams for the given layout"""
+    columns = 2 if layout == 'two_column' else 1
+    width = CHARS_PER_LINE // columns
+    rows = [row for line in lines for row in _wrap(line, width)]
+    per_column = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+    per_page = per_column * columns
+    column_width = (PAGE_WIDTH - 2 * MARGIN) / columns
+
+    streams = []
+    for first in range(0, max(len(rows), 1), per_page):
+        ops = []
+        page_rows = rows[first:first + per_page]
+        for column in range(columns):
+            chunk = page_rows[column * per_column:(column + 1) * per_column]
+            if not chunk:
+                continue
+            x = MARGIN + column * column_width
+            ops.append(f"BT /F1 {FONT_SIZE} Tf {x:.0f} {PAGE_HEIGHT - MARGIN} Td {LEADING} TL")
+            ops.extend(f"({_pdf_escape(row)}) '" for row in chunk)
+            ops.append('ET')
+        if layout == 'table':
+            # Ruled grid behind the text, like a table-based resume template
+            for row in range(len(page_rows) + 1):
+                y = PAGE_HEIGHT - MARGIN - row * LEADING + 3
+                ops.append(f"{MARGIN - 4} {y} m {PAGE_WIDTH - MARGIN} {y} l S")
+            ops.append(f"{PAGE_WIDTH / 3:.0f} {PAGE_HEIGHT - MARGIN + 3} m "
+                       f"{PAGE_WIDTH / 3:.0f} {PAGE_HEIGHT - MARGIN - len(page_rows) * LEADING + 3} l S")
+        streams.append('\n'.join(ops).encode('latin-1', 'replace'))
+    return streams
+
+
+def write_pdf(path: str, lines: List[str], layout: str) -> int:
+    """Write a text PDF with the standard Helvetica font; return the page count"""
+    streams = _pdf_pages(lines, layout)
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', b'', b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for stream in streams:
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R '
+            b'/Resources << /Font << /F1 3 0 R >> >> >>' % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+    return len(streams)
+
+
+# --- DOCX ------------------------------------------------------------------
+
+def write_docx(path: str, sections: List[Tuple[str, List[str]]], layout: str):
+    """Write a DOCX; 'table' puts sections in a two-column table, 'two_column' sets page columns"""
+    from docx import Document
+    from docx.oxml.ns import qn
+
+    doc = Document()
+    if layout == 'two_column':
+        cols = doc.sections[0]._sectPr.xpath('./w:cols')
+        if cols:
+            cols[0].set(qn('w:num'), '2')
+
+    table = doc.add_table(rows=0, cols=2) if layout == 'table' else None
+    for title, lines in sections:
+        if table is not None and title:
+            cells = table.add_row().cells
+            cells[0].text = title
+            cells[1].text = '\n'.join(lines)
+            continue
+        if title:
+            doc.add_heading(title, level=2)
+        for line in lines:
+            doc.add_paragraph(line)
+    doc.save(path)
+
+
+def generate_corpus(out_dir: str, count: int = 50, seed: int = 0, max_pages: int = 30) -> List[CorpusItem]:
+    """Write `count` documents to `out_dir` plus a manifest.json describing them"""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    items = []
+    for number in range(count):
+        file_type = 'pdf' if number % 3 != 2 else 'docx'
+        layout = rng.choice(LAYOUTS)
+        # Mostly one or two pages, with a tail of long CVs
+        pages = rng.choice([1, 1, 1, 2, 2, 3]) if rng.random() < 0.9 else rng.randint(5, max_pages)
+        sections = resume_sections(rng, pages)
+        path = os.path.join(out_dir, f"resume_{number:04d}_{layout}.{file_type}")
+        if file_type == 'pdf':
+            lines = [line for title, body in sections for line in ([title] if title else []) + body]
+            pages = write_pdf(path, lines, layout)
+        else:
+            write_docx(path, sections, layout)
+        items.append(CorpusItem(path=path, file_type=file_type, layout=layout, pages=pages))
+
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'count': count, 'seed': seed, 'items': [asdict(item) for item in items]}, f, indent=2)
+    return items
+
+
+def load_corpus(out_dir: str) -> List[CorpusItem]:
+    with open(os.path.join(out_dir, 'manifest.json'), encoding='utf-8') as f:
+        return [CorpusItem(**item) for item in json.load(f)['items']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic resume corpus')
+    parser.add_argument('out_dir')
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-pages', type=int, default=30)
+    args = parser.parse_args()
+    items = generate_corpus(args.out_dir, args.count, args.seed, args.max_pages)
+    print(f"Wrote {len(items)} documents to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the backend modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime`.
+The check fails if the median cumulative import time is over budget, or if a
+heavy dependency is loaded eagerly at import.
+
+Usage:
+
+python benchmarks/import_time.py [--budget-ms 200] [--repeat 5] [module ...]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ['backend.resume_parser', 'backend.resume_cache', 'backend.batch_parser']
+DEFAULT_BUDGET_MS = 200.0
+
+# Document engines, export libraries and NLP toolkits must load on first use only
+LAZY_MODULES = ['pandas', 'pdfplumber', 'PyPDF2', 'docx', 'nltk', 'numpy', 'scipy', 'spacy', 'pyarrow']
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, float]]:
+    """Import `module` in a fresh interpreter; return its cumulative ms and every module loaded"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    loaded = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded[name.strip()] = int(cumulative) / 1000
+    return loaded[module], loaded
+
+
+def loaded_lazy_modules(module: str) -> List[str]:
+    """LAZY_MODULES found in `sys.modules` after importing `module` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', f'import sys, {module}; print(" ".join(sorted(sys.modules)))'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    loaded = set(result.stdout.split())
+    return [name for name in LAZY_MODULES if name in loaded]
+
+
+def check_module(module: str, budget_ms: float, repeat: int) -> List[str]:
+    """Return a list of budget violations for one module"""
+    timings = []
+    loaded = {}
+    for _ in range(repeat):
+        elapsed, loaded = measure_import(module)
+        timings.append(elapsed)
+    median = statistics.median(timings)
+    print(f"{module}: median {median:.1f} ms over {repeat} runs (budget {budget_ms:.0f} ms)")
+
+    problems = []
+    if median > budget_ms:
+        problems.append(f"{module} took {median:.1f} ms to import, budget is {budget_ms:.0f} ms")
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        problems.append(f"{module} eagerly imports {', '.join(eager)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    problems = []
+    for module in args.modules:
+        problems.extend(check_module(module, args.budget_ms, args.repeat))
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
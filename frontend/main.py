@@ -1,25 +1,69 @@
 import streamlit as st
-import os, tempfile
+import os
 
+import backend.agent_builder as baagbu
+import backend.instrumentation as bainst
+import backend.parse_service as bapase
+import backend.resume_cache as bareca
+import backend.resume_matcher as barema
 import backend.resume_parser as barepa
 import utils.theme as theme_utils
 
 IS_DISABLED = True
+PARSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "interview_agent", "parse_cache.sqlite")
+QUESTION_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "interview_agent", "question_cache.sqlite")
+# When set (e.g. http://127.0.0.1:8080), parsing runs in the shared backend.parse_service
+PARSE_SERVICE_URL = os.getenv("PARSE_SERVICE_URL")
+# One resume is no corpus to fit IDF on, so text similarity is left out; skills and experience keep their ratio
+MATCH_WEIGHTS = {'text': 0.0, 'skills': 0.7, 'experience': 0.3}
 
 
-def save_uploaded_to_temp(uploaded_file) -> str:
-    # Preserve the extension so downstream libs behave (e.g., .pdf, .docx)
-    ext = os.path.splitext(uploaded_file.name)[1]
-    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-        tmp.write(uploaded_file.getbuffer())
-        return tmp.name
+@st.cache_resource
+def get_resume_cache():
+    # Shared across reruns and sessions so duplicate uploads skip re-parsing
+    return bareca.ResumeCache(db_path=PARSE_CACHE_PATH)
+
+
+@st.cache_resource
+def get_resume_parser():
+    # Built once per process and shared by every rerun and session; parsing holds no per-call state
+    return barepa.ResumeParser(instrumentation=get_parse_metrics())
+
+
+@st.cache_resource
+def get_question_generator():
+    # One provider and response cache for the app, so repeated clicks reuse answers
+    return baagbu.QuestionGenerator(baagbu.default_provider(), cache=baagbu.ResponseCache(QUESTION_CACHE_PATH))
+
+
+@st.cache_resource
+def get_parse_metrics():
+    # Aggregates stage timings and counters across parses for the debug panel
+    return bainst.MetricsAggregator()
+
 
 def resume_parser():
+    placeholder = st.empty()
     with st.spinner("Parsing resume..."):
-        resume_parser = barepa.ResumeParser()
-        path = save_uploaded_to_temp(uploaded_file)
-        file_content = resume_parser.parse_resume(path)
-        st.write(file_content)
+        resume_parser = get_resume_parser()
+        if PARSE_SERVICE_URL:
+            file_content = bapase.ParseClient(PARSE_SERVICE_URL).parse(uploaded_file.getbuffer())
+            placeholder.write(file_content)
+        else:
+            # Parse straight from the upload buffer; the format comes from its magic bytes, and
+            # results are cached by content hash, so re-clicking Start or re-uploading skips parsing
+            for file_content in get_resume_cache().iter_parse(resume_parser, uploaded_file.getbuffer()):
+                placeholder.write(file_content)
+        match = barema.ResumeIndex([file_content], skill_index=resume_parser.skill_index).rank(
+            job_description, top_k=1, weights=MATCH_WEIGHTS,
+        )[0]
+    st.metric("Job description match", f"{match.score:.0%}", help="Share of the JD's skills and of its required years")
+    if match.matched_skills:
+        st.write("Matching skills: " + ", ".join(match.matched_skills))
+    with st.spinner("Generating questions..."):
+        questions = baagbu.generate_questions(file_content, job_description, instructions, get_question_generator())
+    for question in questions:
+        st.write(f"- **{question.topic.replace('_', ' ').title()}**: {question.text}")
     st.success("Questions generated successfully!")
     
     
@@ -48,7 +92,11 @@ is_clicked = st.button(
     on_click=resume_parser
    )
 
-
-    
-
-
+if st.sidebar.checkbox("Show parse metrics", help="Debug timings and counters for the last parse"):
+    metrics = get_parse_metrics()
+    with st.expander("Parse metrics", expanded=True):
+        if metrics.last_parse:
+            st.json(metrics.last_parse)
+        else:
+            st.write("No resume parsed yet.")
+        st.code(metrics.to_prometheus(), language="text")
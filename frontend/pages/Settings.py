@@ -6,11 +6,13 @@ import os, tempfile
 import utils.theme as theme_utils
 
 def settings_page():
-    theme_utils.apply_theme(st.session_state.get('theme', 'Light'))
     st.title("Settings")
     st.write("Adjust your application settings here.")
     st.write("## Theme")
-    theme = st.selectbox("Select Theme", ["Light", "Dark"])
+    themes = list(theme_utils.THEMES)
+    current = st.session_state.get('theme', 'Light')
+    theme = st.selectbox("Select Theme", themes, index=themes.index(current) if current in themes else 0)
+    # Emit the CSS once per run, for the selected theme
     theme_utils.apply_theme(theme)
     st.write(f"Current theme: {theme}")
     st.write("## API Keys")
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+import backend.agent_builder as baagbu
+import backend.resume_parser as barepa
+
+RESUME = barepa.ResumeData(
+    name='Jane Doe', skills=['Python', 'SQL'],
+    experience=[{'title': 'Engineer', 'company': 'Acme Corp'}], projects=[{'name': 'Pipeline'}],
+)
+
+
+def test_shared_generator_across_threads():
+    generator = baagbu.QuestionGenerator(baagbu.FakeProvider(latency=0.05), max_concurrency=2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            baagbu.generate_questions(RESUME, 'Backend engineer', generator=generator)))
+        for _ in range(2)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        generator.close()
+    assert len(results) == 2 and results[0] and results[0] == results[1]
+    topics = len(baagbu.QUESTION_TOPICS)
+    # The second session coalesces with the first or hits the cache
+    assert generator.stats['provider_calls'] == topics
+    assert generator.stats['requests'] == 2 * topics
+    assert generator.stats['errors'] == 0
+
+
+def test_generator_reused_across_event_loops():
+    generator = baagbu.QuestionGenerator(baagbu.FakeProvider(latency=0.01), cache=baagbu.ResponseCache(max_items=0))
+    first = asyncio.run(generator.generate(RESUME, 'Backend engineer'))
+    second = asyncio.run(generator.generate(RESUME, 'Backend engineer'))
+    assert first and first == second
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip('spacy')
+
+import backend.resume_parser as barepa
+
+
+def test_year_range_is_not_part_of_institution():
+    parser = barepa.ResumeParser(nlp_model='en')
+    text = (
+        "Jane Doe\njane.doe@example.com\n"
+        "Education\nBachelor of Science in Computer Science\nUniversity of Texas 2015 - 2019\n"
+    )
+    resume = parser.parse_extracted(text, 'pdf', [])
+    assert resume.education == [{
+        'degree': 'Bachelor of Science in Computer Science',
+        'institution': 'University of Texas',
+        'year': '2019',
+    }]
+
+
+def test_batched_entity_pass_matches_single_parse():
+    parser = barepa.ResumeParser(nlp_model='en')
+    texts = [
+        "Jane Doe\nExperience\nSoftware Engineer\nAcme Corp\n2019 - 2021\n",
+        "John Smith\nEducation\nMBA\nState University 2018\n",
+    ]
+    single = [parser.parse_extracted(text, 'pdf', []) for text in texts]
+    batched = list(parser.add_entities(parser.parse_extracted(text, 'pdf', [], entities=False) for text in texts))
+    assert batched == single
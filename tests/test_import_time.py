@@ -0,0 +1,13 @@
+import pytest
+
+import benchmarks.import_time as import_time
+
+
+@pytest.mark.parametrize('module', import_time.DEFAULT_MODULES)
+def test_import_within_budget(module):
+    assert import_time.check_module(module, import_time.DEFAULT_BUDGET_MS, repeat=3) == []
+
+
+@pytest.mark.parametrize('module', import_time.DEFAULT_MODULES)
+def test_heavy_modules_load_lazily(module):
+    assert import_time.loaded_lazy_modules(module) == []
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+import backend.parse_service as bapase
+
+
+def test_failed_submission_releases_its_slot():
+    async def run():
+        service = bapase.ParseService(workers=1, max_pending=2)
+        # A pool that refuses work, as during a reload or shutdown
+        service._executor.shutdown()
+        try:
+            for _ in range(5):
+                service._admit(1)
+                with pytest.raises(bapase.HttpError) as error:
+                    await service.parse(b'%PDF-1.4')
+                assert error.value.status == 503
+            return service.pending
+        finally:
+            await service.close()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_parse_runs_in_pool_worker(tmp_path):
+    import benchmarks.corpus as corpus
+
+    path = tmp_path / 'resume.pdf'
+    corpus.write_pdf(str(path), ['Jane Doe', 'jane.doe@example.com', 'Skills', 'Python, SQL'], 'single')
+
+    async def run():
+        service = bapase.ParseService(workers=1)
+        try:
+            service._admit(1)
+            return await service.parse(path.read_bytes())
+        finally:
+            await service.close()
+
+    result = asyncio.run(run())
+    assert result['email'] == 'jane.doe@example.com'
+    assert 'Python' in result['skills']
+
+
+def test_only_finished_jobs_are_evicted():
+    async def run():
+        service = bapase.ParseService(workers=1, max_jobs=2)
+        try:
+            done = bapase.Job(id='done', documents=[{'status': 'done'}], finished=1.0)
+            running = bapase.Job(id='running', documents=[{'status': 'running'}])
+            service._jobs.update(done=done, running=running)
+            service._make_room_for_job()
+            assert list(service._jobs) == ['running']
+            service._jobs['other'] = bapase.Job(id='other', documents=[{'status': 'queued'}])
+            with pytest.raises(bapase.HttpError) as error:
+                service._make_room_for_job()
+            assert error.value.status == 503
+            assert list(service._jobs) == ['running', 'other']
+        finally:
+            await service.close()
+
+    asyncio.run(run())
+
+
+def test_extraction_is_isolated_only_on_request():
+    def isolated(service):
+        limits = service.parser_kwargs.get('limits')
+        return limits is not None and limits.isolated
+
+    async def run():
+        services = [bapase.ParseService(workers=1), bapase.ParseService(workers=1, isolate=True, timeout=5)]
+        try:
+            return [isolated(service) for service in services]
+        finally:
+            for service in services:
+                await service.close()
+
+    assert asyncio.run(run()) == [False, True]
@@ -0,0 +1,33 @@
+import random
+
+import benchmarks.corpus as corpus
+import backend.pdf_engine as bapden
+import backend.resume_parser as barepa
+
+
+def _two_column_pdf(path, seed=0):
+    sections = corpus.resume_sections(random.Random(seed), pages=1)
+    lines = [line for title, body in sections for line in ([title] if title else []) + body]
+    corpus.write_pdf(str(path), lines, 'two_column')
+    return str(path)
+
+
+def test_auto_mode_reads_two_columns_in_order(tmp_path):
+    path = _two_column_pdf(tmp_path / 'two_column.pdf')
+    pages = bapden.extract_pdf_pages(path, 'auto')
+    assert [page.reason for page in pages] == ['multi_column']
+    assert pages[0].text.split() == bapden.extract_pdf_pages(path, 'fast')[0].text.split()
+
+
+def test_auto_mode_keeps_two_column_experience(tmp_path):
+    path = _two_column_pdf(tmp_path / 'two_column.pdf')
+    auto = barepa.ResumeParser(pdf_engine='auto').parse_resume(path)
+    fast = barepa.ResumeParser(pdf_engine='fast').parse_resume(path)
+    assert auto.experience and auto.experience == fast.experience
+    assert auto.name == fast.name
+
+
+def test_accurate_mode_reads_two_columns_in_order(tmp_path):
+    path = _two_column_pdf(tmp_path / 'two_column.pdf')
+    accurate = bapden.extract_pdf_pages(path, 'accurate')
+    assert accurate[0].text.split() == bapden.extract_pdf_pages(path, 'fast')[0].text.split()
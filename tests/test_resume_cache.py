@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import benchmarks.corpus as corpus
+import backend.near_duplicates as banedu
+import backend.resume_cache as bareca
+import backend.resume_parser as barepa
+
+
+def _pdf(path, lines):
+    corpus.write_pdf(str(path), lines, 'single')
+    return str(path)
+
+
+def test_near_duplicate_keeps_its_own_fields(tmp_path):
+    sections = corpus.resume_sections(random.Random(0), pages=1)
+    lines = [line for title, body in sections for line in ([title] if title else []) + body]
+    original = _pdf(tmp_path / 'original.pdf', lines)
+    # Same resume with a new email address
+    edited = _pdf(tmp_path / 'edited.pdf', [lines[0], 'new.address@example.com'] + lines[2:])
+
+    cache = bareca.ResumeCache(duplicates=banedu.DuplicateIndex(str(tmp_path / 'dups.sqlite')))
+    parser = barepa.ResumeParser()
+    first = cache.parse(parser, original)
+    second = cache.parse(parser, edited)
+
+    assert first.duplicate_of is None
+    assert second.duplicate_of == bareca.hash_file(original)
+    assert second.duplicate_similarity >= banedu.DEFAULT_THRESHOLD
+    assert second.email == 'new.address@example.com' != first.email
+    # The cached entries are each document's own
+    assert cache.get(cache.make_key(bareca.hash_file(edited), parser)).email == second.email
+    assert cache.get(cache.make_key(bareca.hash_file(original), parser)).email == first.email
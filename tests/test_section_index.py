@@ -0,0 +1,67 @@
+import pytest
+
+import backend.section_index as basein
+
+
+@pytest.mark.parametrize('line, section', [
+    ('Experience', 'experience'),
+    ('WORK EXPERIENCE:', 'experience'),
+    ('Employment History', 'experience'),
+    ('Academic Projects', 'projects'),
+    ('Programming Languages', 'skills'),
+    ('Technical Skills', 'skills'),
+    ('Licenses & Certifications', 'certifications'),
+    ('• Education', 'education'),
+])
+def test_headers(line, section):
+    assert basein.SectionIndex.classify_header(line.lower()) == section
+
+
+@pytest.mark.parametrize('line', [
+    # 'Networking' contains 'work'
+    'Associate Degree in Networking',
+    'Scrum Master Certification',
+    'Experience - 5 years',
+    'Summary Globex',
+])
+def test_body_lines_are_not_headers(line):
+    assert basein.SectionIndex.classify_header(line.lower()) is None
+
+
+def test_sections_keep_keyword_body_lines():
+    index = basein.SectionIndex(
+        "Education\nAssociate Degree in Networking\nState University 2020\n"
+        "Certifications\nScrum Master Certification\nAWS Certified Solutions Architect\n"
+    )
+    assert index.section_text('education') == 'Associate Degree in Networking\nState University 2020'
+    assert index.section_text('certifications') == 'Scrum Master Certification\nAWS Certified Solutions Architect'
+    assert not index.has_section('experience')
+
+
+@pytest.mark.parametrize('line, section', [
+    ('Interests', 'interests'),
+    ('Hobbies', 'interests'),
+    ('Honors and Awards', 'awards'),
+    ('References', 'references'),
+    ('Publications', 'publications'),
+    ('Internships', 'internships'),
+    ('Core Competencies', 'competencies'),
+    ('Technical Proficiencies', 'competencies'),
+])
+def test_unread_section_headers(line, section):
+    assert basein.SectionIndex.classify_header(line.lower()) == section
+
+
+def test_unread_sections_end_the_section_above():
+    index = basein.SectionIndex(
+        "Languages\nEnglish, Spanish\nInterests\nChess, hiking\n"
+        "Certifications\nPMP\nReferences\nAvailable on request\nAwards\nDean's list\n"
+    )
+    assert index.section_text('languages') == 'English, Spanish'
+    assert index.section_text('certifications') == 'PMP'
+
+
+def test_header_merged_with_other_column():
+    # Cheap extraction can put a header and the other column's text on one line
+    assert basein.SectionIndex.classify_header('experience      senior software engineer') == 'experience'
+    assert basein.SectionIndex.classify_header('education\tacme corp') == 'education'
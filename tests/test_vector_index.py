@@ -0,0 +1,17 @@
+import numpy as np
+
+import backend.vector_index as bavein
+
+
+def test_duplicate_ids_in_one_batch_keep_the_last(tmp_path):
+    rng = np.random.default_rng(0)
+    index = bavein.LocalVectorIndex(str(tmp_path / 'index'), dim=8)
+    index.add([str(i) for i in range(20)], rng.normal(size=(20, 8)).astype(np.float32))
+    vectors = rng.normal(size=(2, 8)).astype(np.float32)
+    index.add(['5', '5'], vectors, metadata=[{'v': 1}, {'v': 2}])
+
+    assert len(index) == 20
+    assert np.allclose(index.get('5'), bavein.normalize(vectors[1:])[0])
+    hits = index.search(vectors[1:], top_k=20, mode='brute')[0]
+    assert [hit.id for hit in hits].count('5') == 1
+    assert len(hits) == 20
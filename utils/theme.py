@@ -7,7 +7,8 @@ THEMES ={
         "text": "#0E1117",
         "primary": "#4B8AFF",
         "muted": "#6B7280",
-        "card_shadow": "0 10px 30px rgba(0,0,0,.06)",
+        "shadow": "0 10px 30px rgba(0,0,0,.06)",
+        "border": "1px solid #E5E7EB",
     },
     "Dark": {
         "bg": "#0E1117",
@@ -15,15 +16,13 @@ THEMES ={
         "text": "#FFFFFF",
         "primary": "#4B8AFF",
         "muted": "#9CA3AF",
-        "card_shadow": "0 10px 30px rgba(0,0,0,.3)",
+        "shadow": "0 10px 30px rgba(0,0,0,.3)",
+        "border": "1px solid #2D3139",
     }
 }
 
-def apply_theme(theme_name: str):
-    theme = THEMES.get(theme_name, THEMES["Light"])
-    st.session_state['theme'] = theme_name
-    st.markdown(
-        f"""
+def _render_css(theme: dict) -> str:
+    return f"""
         <style>
         :root {{
           --app-bg: {theme['bg']};
@@ -147,6 +146,15 @@ def apply_theme(theme_name: str):
         }}
         ::-webkit-scrollbar-track {{ background: transparent; }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
\ No newline at end of file
+        """
+
+
+# Rendered once per process; every rerun and page reuses the same string
+THEME_CSS = {name: _render_css(theme) for name, theme in THEMES.items()}
+
+
+def apply_theme(theme_name: str):
+    if theme_name not in THEME_CSS:
+        theme_name = "Light"
+    st.session_state['theme'] = theme_name
+    st.markdown(THEME_CSS[theme_name], unsafe_allow_html=True)